@@ -1,3 +1,6 @@
+from src.expression import evaluate_expression
+from src.operations import OPERATIONS
+
 class Calculator:
     """
     A simple calculator class that supports basic arithmetic operations.
@@ -106,21 +109,46 @@ class Calculator:
             self.error_state = True
             return "Error"
 
+    def evaluate(self, expression: str) -> str:
+        """
+        Evaluates a whole expression, such as "12*(3+4)/7", and makes its result the current value.
+
+        Args:
+            expression (str): The expression, made of numbers, "+", "-", "*", "/" and parentheses.
+
+        Returns:
+            str: The formatted result, or an error message.
+        """
+        self.reset()
+        try:
+            self.current_value = evaluate_expression(expression)
+        except ZeroDivisionError:
+            self.error_state = True
+            return "Error: Division by zero"
+        except Exception as e:
+            self.error_state = True
+            return "Error"
+        return self._format_number(self.current_value)
+
     def _calculate(self) -> float:
-        if self.pending_operation == '+':
-            return self.previous_value + self.current_value
-        elif self.pending_operation == '-':
-            return self.previous_value - self.current_value
-        elif self.pending_operation == '*':
-            return self.previous_value * self.current_value
-        elif self.pending_operation == '/':
-            if self.current_value == 0:
-                raise ZeroDivisionError
-            return self.previous_value / self.current_value
+        if self.pending_operation in OPERATIONS:
+            return OPERATIONS[self.pending_operation](self.previous_value, self.current_value)
         return self.current_value
 
     def _format_number(self, number: float) -> str:
-        str_num = str(number)
-        if '.' in str_num:
-            str_num = str_num.rstrip('0').rstrip('.')
-        return str_num
\ No newline at end of file
+        return format_number(number)
+
+def format_number(number: float) -> str:
+    """
+    Formats a number for the display, dropping trailing zeros after the decimal point.
+
+    Args:
+        number (float): The number to format.
+
+    Returns:
+        str: The formatted number.
+    """
+    str_num = str(number)
+    if '.' in str_num:
+        str_num = str_num.rstrip('0').rstrip('.')
+    return str_num
\ No newline at end of file
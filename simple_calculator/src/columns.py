@@ -0,0 +1,131 @@
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.calculator import format_number
+from src.operations import OPERATIONS
+
+DIVISION_BY_ZERO = "Error: Division by zero"
+
+_UFUNCS = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.true_divide}
+
+Operand = Union[float, np.ndarray]
+Chain = Sequence[Tuple[str, Operand]]
+
+class ColumnResult:
+    """
+    The results of an operation chain applied to a column of starting values.
+
+    Display strings are only built for the rows asked for, so a large column
+    costs nothing to format until it is printed.
+
+    Attributes:
+        values (np.ndarray): The result of each row, NaN where the row divided by zero.
+            Integer results too large for NumPy are held as Python integers.
+        errors (np.ndarray): True for each row that divided by zero.
+    """
+
+    def __init__(self, values: np.ndarray, errors: np.ndarray):
+        self.values = values
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def display(self, row: int) -> str:
+        """
+        Formats one row as the calculator would display it.
+
+        Args:
+            row (int): The index of the row.
+
+        Returns:
+            str: The formatted result, or an error message.
+        """
+        if self.errors[row]:
+            return DIVISION_BY_ZERO
+        value = self.values[row]
+        return format_number(value.item() if isinstance(value, np.generic) else value)
+
+    def displays(self, rows: Optional[Iterable[int]] = None) -> List[str]:
+        """
+        Formats several rows as the calculator would display them.
+
+        Args:
+            rows (Optional[Iterable[int]]): The indices of the rows. Defaults to every row.
+
+        Returns:
+            List[str]: The formatted results, in the order of the rows.
+        """
+        if rows is None:
+            rows = range(len(self.values))
+        return [self.display(row) for row in rows]
+
+def apply_chain(operands: np.ndarray, chain: Chain) -> ColumnResult:
+    """
+    Applies a chain of operations to every value of a column at once.
+
+    Each row behaves like a calculator that starts from its value and is then
+    given each operation of the chain, in order and without precedence, before
+    "=". A row that divides by zero is flagged as an error for good, where the
+    calculator would show "Error" and start over. Integer columns stay integers
+    until a division. A step whose results could overflow the column's type moves
+    the column to Python integers, which are exact but much slower.
+
+    Args:
+        operands (np.ndarray): The starting values, one per row.
+        chain (Chain): The (operation, operand) pairs, with each operation one of
+            "+", "-", "*" and "/", and each operand a number or an array with a
+            value per row.
+
+    Returns:
+        ColumnResult: The result and division by zero flag of each row.
+
+    Raises:
+        ValueError: If the chain holds an operation the calculator does not have.
+    """
+    values = np.asarray(operands)
+    errors = np.zeros(values.shape, dtype=bool)
+    owned = False
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for operation, operand in chain:
+            if operation not in OPERATIONS:
+                raise ValueError(f"Unknown operation {operation!r} in chain")
+            operand = np.asarray(operand)
+            if operation == "/":
+                errors |= operand == 0
+                if values.dtype == object:
+                    # Python integers raise on division by zero, so those rows divide by one.
+                    values = (values / np.where(operand == 0, 1, operand)).astype(np.float64)
+                    owned = True
+                    continue
+            elif np.result_type(values, operand).kind in "iu" and _overflows(operation, values, operand):
+                values, owned = values.astype(object), True
+            # Once the column is a copy, steps that keep its type and shape reuse it.
+            result = None
+            if (owned and np.broadcast_shapes(values.shape, operand.shape) == values.shape
+                    and np.result_type(values, operand) == values.dtype
+                    and (operation != "/" or values.dtype.kind == "f")):
+                result = values
+            values = _UFUNCS[operation](values, operand, out=result)
+            owned = True
+    if errors.any():
+        # Only a division can fail, and it leaves the column floating point.
+        values[errors] = np.nan
+    return ColumnResult(values, errors)
+
+def _overflows(operation: str, values: np.ndarray, operand: np.ndarray) -> bool:
+    # Every result lies between the results for the extremes of both sides,
+    # which Python's integers compute exactly.
+    if not values.size or not operand.size:
+        return False
+    info = np.iinfo(np.result_type(values, operand))
+    low, high = int(values.min()), int(values.max())
+    operand_low, operand_high = int(operand.min()), int(operand.max())
+    if operation == "+":
+        bounds = (low + operand_low, high + operand_high)
+    elif operation == "-":
+        bounds = (low - operand_high, high - operand_low)
+    else:
+        bounds = tuple(side * other for side in (low, high) for other in (operand_low, operand_high))
+    return min(bounds) < info.min or max(bounds) > info.max
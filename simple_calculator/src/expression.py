@@ -0,0 +1,265 @@
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Union
+import re
+
+from src.operations import OPERATIONS
+
+TOKENS = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|(.))")
+
+class Number(NamedTuple):
+    value: float
+
+class Negation(NamedTuple):
+    operand: "Node"
+
+class BinaryOperation(NamedTuple):
+    operator: str
+    left: "Node"
+    right: "Node"
+
+Node = Union[Number, Negation, BinaryOperation]
+
+# Marks where a negation is applied while `evaluate` walks a tree.
+_NEGATE = "negate"
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits an expression into numbers, operators and parentheses.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        List[str]: The tokens, without whitespace.
+
+    Raises:
+        ValueError: If the expression holds a character that is not part of a token.
+    """
+    tokens = []
+    for number, symbol in TOKENS.findall(text.rstrip()):
+        if symbol and symbol not in "+-*/()":
+            raise ValueError(f"Unexpected character {symbol!r} in expression")
+        tokens.append(number or symbol)
+    return tokens
+
+class _Parser:
+    # expression := term (("+" | "-") term)*
+    # term       := factor (("*" | "/") factor)*
+    # factor     := ("+" | "-")* (number | "(" expression ")")
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+
+    def parse(self) -> Node:
+        node = self.expression()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.position]!r} in expression")
+        return node
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def expression(self) -> Node:
+        node = self.term()
+        while self.peek() in ("+", "-"):
+            operator = self.take()
+            node = combine(operator, node, self.term())
+        return node
+
+    def term(self) -> Node:
+        node = self.factor()
+        while self.peek() in ("*", "/"):
+            operator = self.take()
+            node = combine(operator, node, self.factor())
+        return node
+
+    def factor(self) -> Node:
+        negative = False
+        token = self.take()
+        while token in ("+", "-"):
+            negative ^= token == "-"
+            token = self.take()
+        if token == "(":
+            node = self.expression()
+            if self.take() != ")":
+                raise ValueError("Expected ')' in expression")
+        elif token[0].isdigit() or token[0] == ".":
+            node = Number(float(token) if "." in token else int(token))
+        else:
+            raise ValueError(f"Unexpected {token!r} in expression")
+        return negate(node) if negative else node
+
+def parse(text: str) -> Node:
+    """
+    Parses an expression, with "*" and "/" binding tighter than "+" and "-".
+
+    Constants are folded as the tree is built, so an expression that cannot fail
+    comes back as a single Number however long it is.
+
+    Args:
+        text (str): The expression, such as "12*(3+4)/7".
+
+    Returns:
+        Node: The root of the expression's tree.
+
+    Raises:
+        ValueError: If the expression is not well formed or its parentheses are nested too deeply.
+    """
+    try:
+        return _Parser(tokenize(text)).parse()
+    except RecursionError:
+        raise ValueError("Parentheses are nested too deeply") from None
+
+def combine(operator: str, left: Node, right: Node) -> Node:
+    """
+    Builds a binary operation, folding it into a Number when both sides are numbers.
+
+    An operation that fails, such as a division by zero, is kept as it is, so
+    that the error is raised each time the tree is evaluated.
+
+    Args:
+        operator (str): One of "+", "-", "*" and "/".
+        left (Node): The left operand.
+        right (Node): The right operand.
+
+    Returns:
+        Node: The operation, or its value.
+    """
+    if isinstance(left, Number) and isinstance(right, Number):
+        try:
+            return Number(OPERATIONS[operator](left.value, right.value))
+        except ArithmeticError:
+            pass
+    return BinaryOperation(operator, left, right)
+
+def negate(operand: Node) -> Node:
+    """
+    Builds a negation, folding it into a Number when the operand is a number.
+
+    Args:
+        operand (Node): The operand.
+
+    Returns:
+        Node: The negation, or its value.
+    """
+    return Number(-operand.value) if isinstance(operand, Number) else Negation(operand)
+
+def evaluate(node: Node) -> float:
+    """
+    Computes the value of a tree, with the calculator's operations.
+
+    The tree is walked with an explicit stack, so long chains that could not be
+    folded do not run into the recursion limit.
+
+    Args:
+        node (Node): The root of the tree.
+
+    Returns:
+        float: The value.
+
+    Raises:
+        ZeroDivisionError: If the tree divides by zero.
+    """
+    values: List[float] = []
+    pending: List[Union[Node, str]] = [node]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, Number):
+            values.append(item.value)
+        elif isinstance(item, Negation):
+            pending += (_NEGATE, item.operand)
+        elif isinstance(item, BinaryOperation):
+            pending += (item.operator, item.right, item.left)
+        elif item == _NEGATE:
+            values.append(-values.pop())
+        else:
+            right = values.pop()
+            values.append(OPERATIONS[item](values.pop(), right))
+    return values[0]
+
+class ExpressionCache:
+    """
+    Parses expressions, keeping the most recently used trees so that
+    repeated expressions skip parsing.
+
+    Attributes:
+        maxsize (int): The most trees kept.
+        hits (int): The number of expressions whose tree was cached.
+        misses (int): The number of expressions that had to be parsed.
+        evictions (int): The number of trees dropped to make room.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._trees: OrderedDict[str, Node] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def compile(self, text: str) -> Node:
+        """
+        Returns the folded tree of an expression, parsing it unless it is cached.
+
+        Args:
+            text (str): The expression.
+
+        Returns:
+            Node: The folded tree.
+
+        Raises:
+            ValueError: If the expression is not well formed.
+        """
+        tree = self._trees.get(text)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(text)
+            return tree
+        self.misses += 1
+        tree = parse(text)
+        if self.maxsize:
+            self._trees[text] = tree
+            if len(self._trees) > self.maxsize:
+                self._trees.popitem(last=False)
+                self.evictions += 1
+        return tree
+
+    def evaluate(self, text: str) -> float:
+        """
+        Computes the value of an expression through its cached tree.
+
+        Args:
+            text (str): The expression.
+
+        Returns:
+            float: The value.
+        """
+        return evaluate(self.compile(text))
+
+_cache = ExpressionCache()
+
+def evaluate_expression(text: str, cache: Optional[ExpressionCache] = None) -> float:
+    """
+    Computes the value of an expression such as "12*(3+4)/7".
+
+    Args:
+        text (str): The expression.
+        cache (Optional[ExpressionCache]): The cache to compile through. Defaults to
+            one shared by the module.
+
+    Returns:
+        float: The value.
+
+    Raises:
+        ValueError: If the expression is not well formed.
+        ZeroDivisionError: If the expression divides by zero.
+    """
+    return (_cache if cache is None else cache).evaluate(text)
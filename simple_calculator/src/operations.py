@@ -0,0 +1,27 @@
+from typing import Callable, Dict
+import operator
+
+def divide(previous: float, current: float) -> float:
+    """
+    Divides two numbers as the calculator does.
+
+    Args:
+        previous (float): The dividend.
+        current (float): The divisor.
+
+    Returns:
+        float: The quotient.
+
+    Raises:
+        ZeroDivisionError: If the divisor is zero.
+    """
+    if current == 0:
+        raise ZeroDivisionError
+    return previous / current
+
+OPERATIONS: Dict[str, Callable[[float, float], float]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": divide
+}
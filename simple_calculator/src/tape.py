@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+import re
+
+from src.calculator import format_number
+from src.operations import OPERATIONS
+
+MAX_DIGITS = 10
+
+NUMBER = 0
+OPERATION = 1
+EQUALS = 2
+
+Instruction = Tuple[int, Any, Any, str]
+Program = Tuple[Instruction, ...]
+
+KEYS = re.compile(r"[0-9]+|[-+*/=C]")
+
+_KEY_REMOVER = str.maketrans("", "", "0123456789+-*/=C")
+
+def compile_tape(tape: str) -> Program:
+    """
+    Compiles a keystroke tape into a program for `execute`.
+
+    Each run of digits becomes one NUMBER instruction carrying the value it
+    enters as a new positive or negative number, each operator an OPERATION
+    instruction carrying its function, and "=" an EQUALS instruction. Since "C"
+    returns the calculator to its initial state, only the keys after the last
+    "C" are compiled.
+
+    Args:
+        tape (str): The keys, in the order they were pressed.
+
+    Returns:
+        Program: The program, a tuple of (opcode, operand, operand, key) instructions.
+
+    Raises:
+        ValueError: If the tape holds a key the calculator does not have.
+    """
+    unknown = tape.translate(_KEY_REMOVER)
+    if unknown:
+        raise ValueError(f"Unknown key {unknown[0]!r} in tape")
+    instructions = _INSTRUCTIONS
+    return tuple([instructions.get(key) or _number_instruction(key)
+                  for key in KEYS.findall(tape, tape.rfind("C") + 1)])
+
+def _number_instruction(key: str) -> Instruction:
+    # A leading zero is entered before the sign is applied, so it drops the sign.
+    if key[0] == "0":
+        positive = negative = int(key.lstrip("0")[:MAX_DIGITS] or "0")
+    else:
+        positive = int(key[:MAX_DIGITS])
+        negative = -positive if len(key) < MAX_DIGITS else -int(key[:MAX_DIGITS - 1])
+    return (NUMBER, positive, negative, key)
+
+# Operators and short numbers are compiled once, up front.
+_INSTRUCTIONS: Dict[str, Instruction] = {key: (OPERATION, function, None, key) for key, function in OPERATIONS.items()}
+_INSTRUCTIONS["="] = (EQUALS, None, None, "=")
+_INSTRUCTIONS.update((key, _number_instruction(key))
+                     for number in range(100) for key in (str(number), f"{number:02}"))
+
+def execute(program: Program) -> str:
+    """
+    Runs a program compiled by `compile_tape` on a fresh calculator.
+
+    Args:
+        program (Program): The program.
+
+    Returns:
+        str: The display after the last key, or "0" for an empty program.
+    """
+    current = 0
+    previous = None
+    pending = None
+    new_number = True
+    error = False
+    negative_first = False
+    display = None
+
+    for code, first, second, key in program:
+        if error:
+            current, previous, pending, new_number, error, negative_first = 0, None, None, True, False, False
+            if code == EQUALS:
+                display = "0"
+                continue
+
+        if code == NUMBER:
+            # A sign can only be waiting while a new number is expected.
+            if new_number:
+                current = second if negative_first else first
+                new_number = negative_first = False
+            else:
+                text = str(current)
+                text = key.lstrip("0")[:MAX_DIGITS] or "0" if text == "0" else (text + key)[:MAX_DIGITS]
+                current = int(text)
+            display = None
+        elif code == EQUALS:
+            if pending is None or new_number:
+                display = None
+                continue
+            try:
+                current = pending(previous, current)
+                pending = None
+                new_number = True
+                display = None
+            except ZeroDivisionError:
+                error = True
+                display = "Error: Division by zero"
+            except Exception:
+                error = True
+                display = "Error"
+        elif key == "-" and new_number:
+            negative_first = True
+            display = "-"
+        else:
+            if pending is not None:
+                try:
+                    current = pending(previous, current)
+                except Exception:
+                    error = True
+                    display = "Error"
+                    continue
+            previous = current
+            pending = first
+            new_number = True
+            display = None
+
+    return format_number(current) if display is None else display
+
+def run_tape(tape: str) -> str:
+    """
+    Replays a keystroke tape and returns what the calculator would display after it.
+
+    A tape is a string of keys: digits, "+", "-", "*", "/", "=" and "C". Keys
+    behave exactly as the buttons of `CalculatorWindow`, including the limit on
+    the number of digits, a leading "-" making the next number negative, and
+    any key after an error starting over.
+
+    Args:
+        tape (str): The keys, in the order they were pressed.
+
+    Returns:
+        str: The display after the last key, or "0" for an empty tape.
+
+    Raises:
+        ValueError: If the tape holds a key the calculator does not have.
+    """
+    return execute(compile_tape(tape))
+
+class TapeCompiler:
+    """
+    Compiles tapes into programs, keeping the most recently used programs so
+    that repeated tapes skip compiling.
+
+    Attributes:
+        maxsize (int): The most programs kept.
+        hits (int): The number of tapes whose program was cached.
+        misses (int): The number of tapes that had to be compiled.
+        evictions (int): The number of programs dropped to make room.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._programs: OrderedDict[str, Program] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    def compile(self, tape: str) -> Program:
+        """
+        Returns the program of a tape, compiling it unless it is cached.
+
+        Args:
+            tape (str): The keys, in the order they were pressed.
+
+        Returns:
+            Program: The program.
+        """
+        program = self._programs.get(tape)
+        if program is not None:
+            self.hits += 1
+            self._programs.move_to_end(tape)
+            return program
+        self.misses += 1
+        program = compile_tape(tape)
+        if self.maxsize:
+            self._programs[tape] = program
+            if len(self._programs) > self.maxsize:
+                self._programs.popitem(last=False)
+                self.evictions += 1
+        return program
+
+    def run(self, tape: str) -> str:
+        """
+        Replays a tape through its cached program.
+
+        Args:
+            tape (str): The keys, in the order they were pressed.
+
+        Returns:
+            str: The display after the last key.
+        """
+        return execute(self.compile(tape))
+
+_worker_compiler: Optional[TapeCompiler] = None
+
+def _initialize_worker(cache_size: int) -> None:
+    global _worker_compiler
+    _worker_compiler = TapeCompiler(cache_size)
+
+def _run_cached(tape: str) -> str:
+    return _worker_compiler.run(tape)
+
+def run_tapes(tapes: Iterable[str], workers: int = 1, chunksize: int = 4096,
+              cache_size: int = 4096) -> Iterator[str]:
+    """
+    Replays many keystroke tapes, yielding each display as soon as its tape is done.
+
+    Args:
+        tapes (Iterable[str]): The tapes, each replayed on a fresh calculator.
+        workers (int): The number of processes to spread the tapes over. With one,
+            the tapes are replayed in this process.
+        chunksize (int): The number of tapes handed to a process at a time.
+        cache_size (int): The number of compiled programs each process keeps for
+            repeated tapes, or 0 to compile every tape.
+
+    Yields:
+        str: The display after each tape, in the order of the tapes.
+    """
+    if workers == 1:
+        run = TapeCompiler(cache_size).run if cache_size else run_tape
+        for tape in tapes:
+            yield run(tape)
+        return
+    if not cache_size:
+        with Pool(workers) as pool:
+            yield from pool.imap(run_tape, tapes, chunksize)
+        return
+    with Pool(workers, _initialize_worker, (cache_size,)) as pool:
+        yield from pool.imap(_run_cached, tapes, chunksize)
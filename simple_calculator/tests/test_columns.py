@@ -0,0 +1,84 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.calculator import Calculator
+from src.columns import apply_chain
+
+def calculate(start, chain):
+    calculator = Calculator()
+    calculator.current_value = start
+    calculator.new_number = False
+    for operation, operand in chain:
+        if calculator.handle_operation(operation) == "Error":
+            return "Error: Division by zero"
+        calculator.current_value = operand
+        calculator.new_number = False
+    return calculator.calculate_result()
+
+class TestColumns(unittest.TestCase):
+
+    def test_chain_is_applied_in_order(self):
+        result = apply_chain(np.array([1, 2, 3]), [("+", 1), ("*", 3), ("-", 2)])
+
+        self.assertEqual(result.values.tolist(), [4, 7, 10])
+        self.assertFalse(result.errors.any())
+        self.assertEqual(result.displays(), ["4", "7", "10"])
+
+    def test_division(self):
+        result = apply_chain(np.array([5, 6]), [("/", 2)])
+
+        self.assertEqual(result.values.dtype, np.float64)
+        self.assertEqual(result.displays(), ["2.5", "3"])
+
+    def test_division_by_zero_mask(self):
+        divisors = np.array([1, 0, 2, 0])
+
+        result = apply_chain(np.array([4, 4, 4, 4]), [("/", divisors), ("+", 1)])
+
+        self.assertEqual(result.errors.tolist(), [False, True, False, True])
+        self.assertTrue(np.isnan(result.values[1]))
+        self.assertEqual(result.displays([0, 1]), ["5", "Error: Division by zero"])
+        self.assertEqual(result.display(2), "3")
+
+    def test_integers_do_not_overflow(self):
+        limit = np.iinfo(np.int64).max
+        chain = [("+", 2), ("*", 3), ("-", limit), ("/", 7)]
+
+        starts = (limit - 1, limit - 10, 5, -limit)
+
+        result = apply_chain(np.array(starts), chain[:3])
+
+        self.assertEqual(result.values.tolist(), [(start + 2) * 3 - limit for start in starts])
+        self.assertEqual(result.display(0), str((limit + 1) * 3 - limit))
+        self.assertEqual(apply_chain(np.array([limit - 1]), chain).displays(),
+                         [calculate(limit - 1, chain)])
+        self.assertEqual(apply_chain(np.array([limit, -limit]), [("*", 1)]).values.dtype, np.int64)
+
+    def test_operands_are_not_modified(self):
+        operands = np.array([1.0, 2.0])
+
+        apply_chain(operands, [("*", 2.0), ("+", 1.0), ("/", 2.0)])
+
+        self.assertEqual(operands.tolist(), [1.0, 2.0])
+
+    def test_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            apply_chain(np.array([1]), [("%", 2)])
+
+    def test_matches_calculator(self):
+        rng = random.Random(5)
+        starts = [rng.randint(-999, 999) for _ in range(200)]
+        chains = [[(rng.choice("+-*/"), rng.randint(-3, 9)) for _ in range(length)] for length in range(6)]
+        chains += [[("*", 2), ("/", 0)], [("/", 0), ("+", 1)], [("-", 1), ("/", np.array(starts) % 3)]]
+
+        for chain in chains:
+            with self.subTest(chain=chain):
+                result = apply_chain(np.array(starts), chain)
+                rows = [[(operation, np.broadcast_to(operand, len(starts))[row].item()) for operation, operand in chain]
+                        for row in range(len(starts))]
+                self.assertEqual(result.displays(), [calculate(start, row) for start, row in zip(starts, rows)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+
+from src.calculator import Calculator
+from src.expression import (BinaryOperation, ExpressionCache, Negation, Number, evaluate, evaluate_expression,
+                            parse)
+
+class TestExpression(unittest.TestCase):
+
+    def test_precedence(self):
+        self.assertEqual(evaluate_expression("2+3*4"), 14)
+        self.assertEqual(evaluate_expression("(2+3)*4"), 20)
+        self.assertEqual(evaluate_expression("12*(3+4)/7"), 12)
+        self.assertEqual(evaluate_expression("8-3-2"), 3)
+        self.assertEqual(evaluate_expression("16/4/2"), 2)
+
+    def test_unary_signs_and_decimals(self):
+        self.assertEqual(evaluate_expression("-3*-2"), 6)
+        self.assertEqual(evaluate_expression("-(1+2)"), -3)
+        self.assertEqual(evaluate_expression("+4"), 4)
+        self.assertEqual(evaluate_expression(" 1.5 * .5 "), 0.75)
+
+    def test_syntax_errors(self):
+        for text in ("", "1+", "(1+2", "1+2)", "1 2", "2^3", "*3"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                evaluate_expression(text)
+
+    def test_division_by_zero(self):
+        with self.assertRaises(ZeroDivisionError):
+            evaluate_expression("1/(2-2)")
+
+    def test_parse_folds_constants(self):
+        self.assertEqual(parse("12*(3+4)/7"), Number(12))
+        self.assertEqual(parse("-(2*3)"), Number(-6))
+
+    def test_parse_keeps_failing_operations(self):
+        self.assertEqual(parse("1+4/(1-1)"),
+                         BinaryOperation("+", Number(1), BinaryOperation("/", Number(4), Number(0))))
+        self.assertEqual(parse("-(1/0)"), Negation(BinaryOperation("/", Number(1), Number(0))))
+
+    def test_long_chains(self):
+        self.assertEqual(evaluate_expression("+".join(["1"] * 5000)), 5000)
+        self.assertEqual(evaluate_expression("-" * 5001 + "2"), -2)
+        self.assertEqual(Calculator().evaluate("+".join(["1"] * 1000)), "1000")
+
+        tree = parse("1/0" + "+1" * 5000)
+        with self.assertRaises(ZeroDivisionError):
+            evaluate(tree)
+
+    def test_deep_parentheses(self):
+        with self.assertRaises(ValueError):
+            parse("(" * 5000 + "1" + ")" * 5000)
+
+class TestExpressionCache(unittest.TestCase):
+
+    def test_repeated_expressions_hit(self):
+        cache = ExpressionCache()
+
+        self.assertEqual(cache.evaluate("1+2"), 3)
+        self.assertEqual(cache.evaluate("1+2"), 3)
+        self.assertEqual(cache.evaluate("2*3"), 6)
+
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+
+    def test_failing_expressions_raise_every_time(self):
+        cache = ExpressionCache()
+
+        for _ in range(2):
+            with self.assertRaises(ZeroDivisionError):
+                cache.evaluate("5/0")
+        self.assertEqual(cache.hits, 1)
+
+    def test_memory_is_bounded(self):
+        cache = ExpressionCache(maxsize=3)
+
+        for number in range(10):
+            cache.evaluate(f"{number}+1")
+        cache.evaluate("9+1")
+
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.evictions, 7)
+        self.assertEqual(cache.hits, 1)
+
+    def test_uncached(self):
+        cache = ExpressionCache(maxsize=0)
+
+        self.assertEqual(evaluate_expression("2*2", cache), 4)
+        self.assertEqual(len(cache), 0)
+
+class TestCalculatorEvaluate(unittest.TestCase):
+
+    def setUp(self):
+        self.calculator = Calculator()
+
+    def test_formats_like_keys(self):
+        self.assertEqual(self.calculator.evaluate("12*(3+4)/7"), "12")
+        self.assertEqual(self.calculator.evaluate("5/2"), "2.5")
+        self.assertEqual(self.calculator.evaluate("1/3"), self.calculator._format_number(1 / 3))
+
+    def test_result_is_current_value(self):
+        self.calculator.evaluate("2*(3+4)")
+        self.calculator.handle_operation("+")
+        self.calculator.handle_number("1")
+
+        self.assertEqual(self.calculator.calculate_result(), "15")
+
+    def test_errors(self):
+        self.assertEqual(self.calculator.evaluate("5/(3-3)"), "Error: Division by zero")
+        self.assertTrue(self.calculator.error_state)
+        self.assertEqual(self.calculator.handle_number("7"), "7")
+        self.assertEqual(self.calculator.evaluate("5+"), "Error")
+
+if __name__ == '__main__':
+    unittest.main()
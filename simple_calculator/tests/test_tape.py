@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from src.calculator import Calculator
+from src.tape import EQUALS, NUMBER, OPERATION, TapeCompiler, compile_tape, execute, run_tape, run_tapes
+
+class TestTape(unittest.TestCase):
+
+    def test_empty_tape(self):
+        self.assertEqual(run_tape(""), "0")
+
+    def test_arithmetic(self):
+        self.assertEqual(run_tape("5+3="), "8")
+        self.assertEqual(run_tape("5+3*2="), "16")
+        self.assertEqual(run_tape("5/2="), "2.5")
+        self.assertEqual(run_tape("10/2="), "5")
+
+    def test_displays_last_key(self):
+        self.assertEqual(run_tape("12+"), "12")
+        self.assertEqual(run_tape("12+-"), "-")
+        self.assertEqual(run_tape("12+34"), "34")
+        self.assertEqual(run_tape("12+34C"), "0")
+
+    def test_digit_limit(self):
+        self.assertEqual(run_tape("123456789012"), "1234567890")
+        self.assertEqual(run_tape("-123456789012"), "-123456789")
+
+    def test_negative_first(self):
+        self.assertEqual(run_tape("-5="), "-5")
+        self.assertEqual(run_tape("-5+3="), "-2")
+        self.assertEqual(run_tape("-05"), "5")
+        self.assertEqual(run_tape("0005"), "5")
+
+    def test_errors_reset(self):
+        self.assertEqual(run_tape("5/0="), "Error: Division by zero")
+        self.assertEqual(run_tape("5/0+"), "Error")
+        self.assertEqual(run_tape("5/0=="), "0")
+        self.assertEqual(run_tape("5/0=7"), "7")
+        self.assertEqual(run_tape("5/0=7+1="), "8")
+
+    def test_unknown_key(self):
+        with self.assertRaises(ValueError):
+            run_tape("1+x")
+
+    def test_matches_calculator(self):
+        rng = random.Random(0)
+        for alphabet in ("0123456789+-*/=C", "0019+-*/=", "99999*=", "10/-="):
+            for _ in range(500):
+                tape = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 30)))
+                self.assertEqual(run_tape(tape), self._replay(tape), tape)
+
+    def test_run_tapes_keeps_order(self):
+        tapes = [f"{number}*2=" for number in range(50)]
+        expected = [str(number * 2) for number in range(50)]
+
+        self.assertEqual(list(run_tapes(tapes)), expected)
+        self.assertEqual(list(run_tapes(tapes, workers=2, chunksize=8)), expected)
+
+    def test_run_tapes_without_cache(self):
+        tapes = ["1+1=", "2*3=", "1+1="]
+
+        self.assertEqual(list(run_tapes(tapes, cache_size=0)), ["2", "6", "2"])
+        self.assertEqual(list(run_tapes(tapes, workers=2, chunksize=1)), ["2", "6", "2"])
+
+    def _replay(self, tape):
+        calculator = Calculator()
+        display = "0"
+        for key in tape:
+            if key.isdigit():
+                display = calculator.handle_number(key)
+            elif key == "=":
+                display = calculator.calculate_result()
+            elif key == "C":
+                calculator.reset()
+                display = "0"
+            else:
+                display = calculator.handle_operation(key)
+        return display
+
+class TestCompiler(unittest.TestCase):
+
+    def test_compile(self):
+        program = compile_tape("12+-05=")
+
+        self.assertEqual([instruction[0] for instruction in program], [NUMBER, OPERATION, OPERATION, NUMBER, EQUALS])
+        self.assertEqual(program[0][1:], (12, -12, "12"))
+        self.assertEqual(program[3][1:], (5, 5, "05"))
+        self.assertEqual(execute(program), "17")
+
+    def test_compile_skips_keys_before_clear(self):
+        self.assertEqual(compile_tape("5/0=C7+1="), compile_tape("7+1="))
+        self.assertEqual(compile_tape("12+C"), ())
+        self.assertEqual(execute(()), "0")
+
+    def test_compile_long_numbers(self):
+        program = compile_tape("123456789012")
+
+        self.assertEqual(program[0][1:3], (1234567890, -123456789))
+
+    def test_cache_hits_and_evictions(self):
+        compiler = TapeCompiler(maxsize=2)
+        for tape in ("1+1=", "2+2=", "1+1=", "3+3=", "2+2="):
+            compiler.run(tape)
+
+        self.assertEqual((compiler.hits, compiler.misses, compiler.evictions), (1, 4, 2))
+        self.assertEqual(len(compiler), 2)
+        self.assertIs(compiler.compile("2+2="), compiler.compile("2+2="))
+
+    def test_uncached(self):
+        compiler = TapeCompiler(maxsize=0)
+        for tape in ("1+1=", "1+1="):
+            self.assertEqual(compiler.run(tape), "2")
+
+        self.assertEqual((compiler.hits, compiler.misses, compiler.evictions), (0, 2, 0))
+        self.assertEqual(len(compiler), 0)
+
+    def test_unknown_key(self):
+        with self.assertRaises(ValueError):
+            TapeCompiler().run("1?")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+from multiprocessing import Pool
+from typing import Dict, Iterable, Optional, Tuple, Union
+import os
+
+import numpy as np
+
+from .replay import ReplayReader, TickChunk
+
+WALL = 0
+SELF = 1
+DEATH_CAUSES = ("WALL", "SELF")
+
+class ReplayStats:
+    """
+    Aggregates recorded games into per-cell counts and per-tick score totals, in constant memory.
+
+    Games are read with `ReplayReader.history` one chunk of ticks at a time, and
+    each chunk is folded into NumPy counters at once, so memory depends on the
+    board and on the longest game, never on how many games were added. Partial
+    results, for example from different processes, combine with `merge`.
+
+    A game over is blamed on a wall when the head did not move on the last tick,
+    since a move into a wall leaves the snake where it was, and on the snake's
+    own body otherwise.
+
+    Attributes:
+        cols (Optional[int]): The number of columns of the boards, set by the first game added.
+        rows (Optional[int]): The number of rows of the boards, set by the first game added.
+        games (int): The number of games added.
+        outcomes (Dict[str, int]): How many games ended in each state.
+        visits (np.ndarray): How many ticks the head spent on each cell.
+        dot_spawns (np.ndarray): How many dots appeared on each cell.
+        deaths (np.ndarray): How many snakes died on each cell, one row per entry of DEATH_CAUSES.
+        score_totals (np.ndarray): The sum over all games of the score at each tick,
+            padded with zeros past the longest game.
+        games_at_tick (np.ndarray): The number of games that lasted to each tick,
+            padded with zeros past the longest game.
+    """
+
+    def __init__(self) -> None:
+        self.cols: Optional[int] = None
+        self.rows: Optional[int] = None
+        self.games = 0
+        self.outcomes: Dict[str, int] = {}
+        self.visits = np.zeros(0, dtype=np.int64)
+        self.dot_spawns = np.zeros(0, dtype=np.int64)
+        self.deaths = np.zeros((len(DEATH_CAUSES), 0), dtype=np.int64)
+        self.score_totals = np.zeros(0, dtype=np.int64)
+        self.games_at_tick = np.zeros(0, dtype=np.int64)
+
+    def add_replay(self, path: Union[str, os.PathLike], chunk_size: int = 4096) -> None:
+        """
+        Adds every game of a replay file.
+
+        Args:
+            path (Union[str, os.PathLike]): The replay file.
+            chunk_size (int): The number of ticks read at a time.
+        """
+        with ReplayReader(path) as reader:
+            for index, recorded in enumerate(reader.games):
+                self.add_history(reader.history(index, chunk_size), recorded.width // recorded.cell_size,
+                                 recorded.height // recorded.cell_size)
+
+    def add_history(self, chunks: Iterable[TickChunk], cols: int, rows: int) -> None:
+        """
+        Adds one game, given as the chunks of its ticks in order.
+
+        Args:
+            chunks (Iterable[TickChunk]): The game's ticks, for example from `ReplayReader.history`.
+            cols (int): The number of columns of the game's board.
+            rows (int): The number of rows of the game's board.
+
+        Raises:
+            ValueError: If the board is not the size of the games added before.
+        """
+        self._set_board(cols, rows)
+        previous_head = last_head = last_dot = -1
+        state = "RUNNING"
+        for chunk in chunks:
+            self.visits += np.bincount(chunk.heads, minlength=self.visits.size)
+            spawned = chunk.dots != np.concatenate(([last_dot], chunk.dots[:-1]))
+            self.dot_spawns += np.bincount(chunk.dots[spawned], minlength=self.dot_spawns.size)
+
+            end = int(chunk.ticks[-1]) + 1
+            if end > self.score_totals.size:
+                self._extend_ticks(end)
+            self.score_totals[chunk.ticks] += chunk.scores
+            self.games_at_tick[chunk.ticks] += 1
+
+            previous_head = chunk.heads[-2] if len(chunk.heads) > 1 else last_head
+            last_head, last_dot = int(chunk.heads[-1]), int(chunk.dots[-1])
+            state = chunk.state
+
+        if state == "GAME_OVER":
+            cause = WALL if previous_head == last_head else SELF
+            self.deaths[cause, last_head] += 1
+        self.outcomes[state] = self.outcomes.get(state, 0) + 1
+        self.games += 1
+
+    def merge(self, other: "ReplayStats") -> None:
+        """
+        Adds the games aggregated by another `ReplayStats` to this one.
+
+        Args:
+            other (ReplayStats): The other statistics, over boards of the same size.
+
+        Raises:
+            ValueError: If the other statistics are over boards of a different size.
+        """
+        if other.cols is None:
+            return
+        self._set_board(other.cols, other.rows)
+        self.games += other.games
+        for state, count in other.outcomes.items():
+            self.outcomes[state] = self.outcomes.get(state, 0) + count
+        self.visits += other.visits
+        self.dot_spawns += other.dot_spawns
+        self.deaths += other.deaths
+        if other.score_totals.size > self.score_totals.size:
+            self._extend_ticks(other.score_totals.size)
+        self.score_totals[:other.score_totals.size] += other.score_totals
+        self.games_at_tick[:other.games_at_tick.size] += other.games_at_tick
+
+    def heatmap(self) -> np.ndarray:
+        """
+        Returns the head visits as a (rows, cols) grid.
+        """
+        return self.visits.reshape(self.rows or 0, self.cols or 0)
+
+    def death_causes(self) -> Dict[str, int]:
+        """
+        Returns how many snakes died of each cause.
+        """
+        return dict(zip(DEATH_CAUSES, self.deaths.sum(axis=1).tolist()))
+
+    def mean_scores(self) -> np.ndarray:
+        """
+        Returns the average score at each tick over the games that lasted that long.
+        """
+        # Every game covers the ticks from 0 to its end, so the counts only decrease.
+        longest = np.count_nonzero(self.games_at_tick)
+        return self.score_totals[:longest] / self.games_at_tick[:longest]
+
+    def _set_board(self, cols: int, rows: int) -> None:
+        if self.cols is None:
+            self.cols, self.rows = cols, rows
+            self.visits = np.zeros(cols * rows, dtype=np.int64)
+            self.dot_spawns = np.zeros(cols * rows, dtype=np.int64)
+            self.deaths = np.zeros((len(DEATH_CAUSES), cols * rows), dtype=np.int64)
+        elif (cols, rows) != (self.cols, self.rows):
+            raise ValueError(f"Cannot mix {cols}x{rows} boards with {self.cols}x{self.rows} boards")
+
+    def _extend_ticks(self, length: int) -> None:
+        # Doubling keeps the number of copies logarithmic in the longest game.
+        length = max(length, 2 * self.score_totals.size)
+        self.score_totals = np.concatenate((self.score_totals, np.zeros(length - self.score_totals.size,
+                                                                        dtype=np.int64)))
+        self.games_at_tick = np.concatenate((self.games_at_tick,
+                                             np.zeros(length - self.games_at_tick.size, dtype=np.int64)))
+
+def _analyze(task: Tuple[Union[str, os.PathLike], int]) -> ReplayStats:
+    path, chunk_size = task
+    stats = ReplayStats()
+    stats.add_replay(path, chunk_size)
+    return stats
+
+def analyze_replays(paths: Iterable[Union[str, os.PathLike]], workers: Optional[int] = None,
+                    chunk_size: int = 4096) -> ReplayStats:
+    """
+    Aggregates replay files across a pool of processes, one file per task.
+
+    Each worker returns the statistics of its file, and they are merged as they
+    arrive, so the parent never holds more than two sets of counters.
+
+    Args:
+        paths (Iterable[Union[str, os.PathLike]]): The replay files, all of one board size.
+        workers (Optional[int]): The number of processes. Defaults to the number of cores.
+        chunk_size (int): The number of ticks read at a time.
+
+    Returns:
+        ReplayStats: The statistics of every game in the files.
+    """
+    total = ReplayStats()
+    with Pool(workers) as pool:
+        for stats in pool.imap_unordered(_analyze, ((path, chunk_size) for path in paths)):
+            total.merge(stats)
+    return total
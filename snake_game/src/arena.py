@@ -0,0 +1,229 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .dot import Dot
+from .game import GRID_BACKENDS, Game, GameState, GridBackend
+from .grid import Grid
+from .snake import Direction, Snake, SnakeSnapshot
+
+SPAWN_ATTEMPTS = 100
+
+class ArenaSnapshot(NamedTuple):
+    """
+    The state of an arena at one moment, as taken by `Arena.snapshot`.
+
+    Attributes:
+        snakes (Tuple[SnakeSnapshot, ...]): Every snake, sharing its body with the live snake.
+        dots (Tuple[Optional[int], ...]): The packed cell of every dot, or None for a dot off the board.
+        alive (Tuple[bool, ...]): Whether each snake was alive.
+        scores (Tuple[int, ...]): The score of each snake.
+        winner (Optional[int]): The index of the snake that had won, if any.
+        ticks (int): The number of ticks played.
+        state (GameState): The state of the arena.
+        rng_state (Tuple[Any, ...]): The state of the arena's random generator.
+    """
+    snakes: Tuple[SnakeSnapshot, ...]
+    dots: Tuple[Optional[int], ...]
+    alive: Tuple[bool, ...]
+    scores: Tuple[int, ...]
+    winner: Optional[int]
+    ticks: int
+    state: "GameState"
+    rng_state: Tuple[Any, ...]
+
+class Arena(Game):
+    """
+    A game with many snakes and dots on one shared board.
+
+    Every snake lives on the same `Grid`, which doubles as the spatial hash for
+    collisions. Each tick has two phases: first every living snake picks its next
+    cell and frees its tail, then every move is checked against the grid and
+    against the other heads of this tick. Heads meeting in one cell all die; a head
+    entering any body dies; a head may follow a tail that moves away this tick.
+    A tick touches only heads and tails, so its cost grows with the number of
+    living snakes and not with their lengths. Dead snakes leave the board and have
+    no segments. A dot eaten when every free cell already holds a dot leaves the
+    board too, with its cell set to None.
+
+    The first snake and dot are also `snake` and `dot`, so the single-player API
+    (`change_direction`, `score`) steers and reports that snake. The game is over
+    once every snake is dead, and won by the first snake to reach `win_score`.
+    `snapshot` and `restore` cover every snake and dot. Replays are not supported for arenas.
+
+    Attributes:
+        snake_count (int): The number of snakes.
+        dot_count (int): The number of dots.
+        snakes (List[Snake]): Every snake, dead or alive.
+        dots (List[Dot]): Every dot.
+        alive (List[bool]): Whether each snake is alive.
+        scores (List[int]): The score of each snake.
+        winner (Optional[int]): The index of the snake that won, if any.
+    """
+
+    __slots__ = ("snake_count", "dot_count", "snakes", "dots", "alive", "scores", "winner",
+                 "_living", "_dot_cells")
+
+    def __init__(self, width: int = 500, height: int = 500, cell_size: int = 1, win_score: int = 20,
+                 snake_count: int = 2, dot_count: int = 1, seed: Optional[int] = None,
+                 backend: GridBackend = "dense") -> None:
+        self.snake_count = snake_count
+        self.dot_count = dot_count
+        super().__init__(width, height, cell_size, win_score, seed, backend)
+
+    def reset_game(self) -> None:
+        """
+        Resets the arena, spawning every snake at a random free spot, facing right.
+        """
+        grid = GRID_BACKENDS[self.backend](self.width, self.height, self.cell_size)
+        self.snakes: List[Snake] = [
+            Snake(self.width, self.height, self.cell_size, grid, self._spawn_cells(grid), shared_grid=True)
+            for _ in range(self.snake_count)
+        ]
+        self.dots = [Dot(self.width, self.height, self.cell_size, self.rng) for _ in range(self.dot_count)]
+        self.snake = self.snakes[0]
+        self.dot = self.dots[0]
+        self.alive = [True] * self.snake_count
+        self.scores = [0] * self.snake_count
+        self.winner: Optional[int] = None
+        self._living = list(range(self.snake_count))
+        self._dot_cells: Dict[int, int] = {}
+        self._rng_state = None
+        self.score = 0
+        self.ticks = 0
+        self.state = "PAUSED"
+
+    def start(self) -> None:
+        """
+        Starts the arena and places every dot.
+        """
+        self.reset_game()
+        self.state = "RUNNING"
+        for index in range(self.dot_count):
+            self._place_dot(index)
+
+    def living(self) -> List[int]:
+        """
+        Returns the indices of the snakes still alive.
+
+        Returns:
+            List[int]: The indices, ascending.
+        """
+        return list(self._living)
+
+    def update(self) -> None:
+        """
+        Moves every living snake one cell, resolving all collisions of the tick together.
+        """
+        if self.state != "RUNNING":
+            return
+        self.ticks += 1
+        snakes = self.snakes
+        movers = self._living
+        targets = [snakes[index].next_cell() for index in movers]
+        heads: Dict[Optional[int], int] = {}
+        for target in targets:
+            heads[target] = heads.get(target, 0) + 1
+        for index in movers:
+            snakes[index].retract_tail()
+
+        grid = self.snake.grid
+        survivors: List[int] = []
+        dead: List[int] = []
+        for index, target in zip(movers, targets):
+            if target is None or heads[target] > 1 or grid.is_occupied(target):
+                dead.append(index)
+            else:
+                survivors.append(index)
+                snakes[index].push_head(target)
+
+        for index in dead:
+            self.alive[index] = False
+            snakes[index].set_cells(())
+        self._living = survivors
+
+        for index in survivors:
+            dot = self._dot_cells.pop(snakes[index].head, None)
+            if dot is not None:
+                self._handle_dot_eaten(index, dot)
+        self.score = self.scores[0]
+        if self.state == "RUNNING" and not survivors:
+            self.game_over()
+
+    def snapshot(self) -> ArenaSnapshot:
+        """
+        Captures the arena's state, sharing every snake's body like `Game.snapshot`.
+
+        Returns:
+            ArenaSnapshot: The snapshot.
+        """
+        if self._rng_state is None:
+            self._rng_state = self.rng.getstate()
+        self.snake.grid.reorder()
+        return ArenaSnapshot(tuple(snake.snapshot() for snake in self.snakes),
+                             tuple(dot.cell for dot in self.dots), tuple(self.alive), tuple(self.scores),
+                             self.winner, self.ticks, self.state, self._rng_state)
+
+    def restore(self, saved: ArenaSnapshot) -> None:
+        """
+        Returns the arena to a snapshot, touching only the cells that changed since.
+
+        Args:
+            saved (ArenaSnapshot): A snapshot of this arena.
+        """
+        taken = [cell for snake, snapshot in zip(self.snakes, saved.snakes) for cell in snake.restore(snapshot)]
+        # A cell passed between snakes may have been taken back before it was freed.
+        grid = self.snake.grid
+        for cell in taken:
+            grid.occupy(cell)
+        grid.reorder()
+        for dot, cell in zip(self.dots, saved.dots):
+            dot.cell = cell
+        self._dot_cells = {cell: index for index, cell in enumerate(saved.dots) if cell is not None}
+        self.alive = list(saved.alive)
+        self._living = [index for index, alive in enumerate(saved.alive) if alive]
+        self.scores = list(saved.scores)
+        self.score = self.scores[0]
+        self.winner = saved.winner
+        self.ticks = saved.ticks
+        self.state = saved.state
+        self.rng.setstate(saved.rng_state)
+        self._rng_state = saved.rng_state
+
+    def change_direction(self, direction: Direction, snake: int = 0) -> None:
+        """
+        Changes the direction of one snake.
+
+        Args:
+            direction (Direction): The new direction.
+            snake (int): The index of the snake. Defaults to the first one.
+        """
+        if self.state == "RUNNING":
+            self.snakes[snake].change_direction(direction)
+
+    def _handle_dot_eaten(self, snake: int, dot: int) -> None:
+        self.snakes[snake].grow()
+        self.scores[snake] += 1
+        if self.scores[snake] >= self.win_score and self.winner is None:
+            self.winner = snake
+            self.win_game()
+        self._place_dot(dot)
+
+    def _place_dot(self, index: int) -> bool:
+        grid = self.snake.grid
+        dot = self.dots[index]
+        self._rng_state = None
+        if len(grid) <= len(self._dot_cells):
+            dot.cell = None
+            return False
+        while dot.reposition((), grid) and dot.cell in self._dot_cells:
+            pass
+        self._dot_cells[dot.cell] = index
+        return True
+
+    def _spawn_cells(self, grid: Grid) -> Iterable[int]:
+        for _ in range(SPAWN_ATTEMPTS):
+            head = grid.sample(self.rng)
+            if head is None:
+                break
+            if head % grid.cols >= 2 and grid.is_free(head - 1) and grid.is_free(head - 2):
+                return (head, head - 1, head - 2)
+        raise ValueError("No room left on the board to spawn a snake")
@@ -0,0 +1,71 @@
+from typing import List, NamedTuple
+import random
+import time
+
+from .arena import Arena
+from .snake import Direction
+
+DIRECTIONS: List[Direction] = ["UP", "DOWN", "LEFT", "RIGHT"]
+
+class ArenaBenchmark(NamedTuple):
+    """
+    The timings of an arena benchmark.
+
+    Attributes:
+        ticks (int): The number of ticks run.
+        seconds (float): The time spent ticking, excluding the random turns.
+        snake_ticks (int): The number of moves made by living snakes.
+        survivors (int): The number of snakes alive at the end.
+        longest (int): The length of the longest snake at the end.
+    """
+    ticks: int
+    seconds: float
+    snake_ticks: int
+    survivors: int
+    longest: int
+
+def run_benchmark(snake_count: int = 1000, size: int = 500, dot_count: int = 2000, ticks: int = 500,
+                  turn_chance: float = 0.1, seed: int = 0) -> ArenaBenchmark:
+    """
+    Times an arena of randomly turning snakes.
+
+    Args:
+        snake_count (int): The number of snakes.
+        size (int): The width and height of the board, in cells.
+        dot_count (int): The number of dots.
+        ticks (int): The number of ticks to run, unless every snake dies first.
+        turn_chance (float): The chance that a snake turns on a given tick.
+        seed (int): The seed for spawning, dots and turns.
+
+    Returns:
+        ArenaBenchmark: The timings.
+    """
+    arena = Arena(size, size, 1, win_score=ticks + 1, snake_count=snake_count,
+                  dot_count=dot_count, seed=seed)
+    arena.start()
+    rng = random.Random(seed)
+    seconds = 0.0
+    snake_ticks = 0
+    for _ in range(ticks):
+        living = arena.living()
+        if not living:
+            break
+        for index in living:
+            if rng.random() < turn_chance:
+                arena.change_direction(rng.choice(DIRECTIONS), index)
+        start = time.perf_counter()
+        arena.update()
+        seconds += time.perf_counter() - start
+        snake_ticks += len(living)
+    return ArenaBenchmark(arena.ticks, seconds, snake_ticks, len(arena.living()),
+                          max(len(snake) for snake in arena.snakes))
+
+def main() -> None:
+    result = run_benchmark()
+    print(f"{result.ticks} ticks in {result.seconds:.3f}s: "
+          f"{result.seconds / result.ticks * 1000:.2f} ms per tick, "
+          f"{result.seconds / max(result.snake_ticks, 1) * 1e6:.2f} us per snake move, "
+          f"{result.survivors} snakes alive, longest {result.longest}")
+
+if __name__ == "__main__":
+    main()
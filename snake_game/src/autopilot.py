@@ -0,0 +1,204 @@
+from collections import deque
+from heapq import heappop, heappush
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from .game import Game
+from .snake import Direction
+
+class Autopilot:
+    """
+    A bot that steers a `Game`'s snake to the dot along shortest paths.
+
+    Paths are found with A* on the snake's grid and cached: while the dot stays
+    put and the next cell of the path is free, each tick just pops the next step.
+    A path to the dot is only taken if, once the snake has eaten, its head could
+    still reach its tail, so it never seals itself in. When no path is safe the
+    snake follows its own tail, and when even that fails it moves towards the
+    largest open area.
+
+    Following the tail does not need a search per tick: after reaching the tail
+    the head can retrace the body, since every body cell is vacated just before
+    the head arrives. While it does, the dot is retried with a backoff that
+    doubles after every failed attempt, so a long snake does not search the whole
+    board each tick.
+
+    An autopilot is a `Policy`: call it with the game before each tick, or pass it
+    to `run_episode`.
+
+    Attributes:
+        searches (int): The number of path searches run, for profiling.
+    """
+
+    def __init__(self) -> None:
+        self.searches = 0
+        self._geometry: Tuple[int, int] = (0, 0)
+        self._neighbors: List[Tuple[int, ...]] = []
+        self._directions: Dict[int, Direction] = {}
+        self._path: Deque[int] = deque()
+        self._target: Optional[int] = None
+        self._retry_at = 0
+        self._backoff = 1
+
+    def __call__(self, game: Game) -> Optional[Direction]:
+        snake = game.snake
+        grid = snake.grid
+        if self._geometry != (grid.cols, grid.rows):
+            self._prepare(grid.cols, grid.rows)
+        head = snake.head
+        if not self._path_is_valid(game) or (self._target is None and game.ticks >= self._retry_at):
+            self._plan(game)
+        if not self._path:
+            return None
+        return self._directions[self._path.popleft() - head]
+
+    def _prepare(self, cols: int, rows: int) -> None:
+        self._geometry = (cols, rows)
+        self._directions = {-cols: "UP", cols: "DOWN", -1: "LEFT", 1: "RIGHT"}
+        neighbors = []
+        for cell in range(cols * rows):
+            y, x = divmod(cell, cols)
+            cells = []
+            if y > 0:
+                cells.append(cell - cols)
+            if y < rows - 1:
+                cells.append(cell + cols)
+            if x > 0:
+                cells.append(cell - 1)
+            if x < cols - 1:
+                cells.append(cell + 1)
+            neighbors.append(tuple(cells))
+        self._neighbors = neighbors
+        self._path.clear()
+        self._retry_at = 0
+        self._backoff = 1
+
+    def _path_is_valid(self, game: Game) -> bool:
+        if not self._path:
+            return False
+        if self._target is not None and self._target != game.dot.cell:
+            return False
+        snake = game.snake
+        step = self._path[0]
+        if step not in self._neighbors[snake.head]:
+            return False
+        if snake.grid.is_free(step):
+            return True
+        return step == snake.cell_at(-1) and not snake.growing
+
+    def _plan(self, game: Game) -> None:
+        snake = game.snake
+        body = list(snake.cells())
+        head, tail = body[0], body[-1]
+        occupied = bytearray(snake.grid.size)
+        for cell in body:
+            occupied[cell] = 1
+        if not snake.growing:
+            occupied[tail] = 0
+
+        path = self._search(head, game.dot.cell, occupied)
+        if path is not None and self._can_reach_tail(path, body):
+            self._path, self._target = deque(path), game.dot.cell
+            self._backoff = 1
+            return
+        self._retry_at = game.ticks + self._backoff
+        self._backoff = min(self._backoff * 2, len(body))
+        self._target = None
+
+        path = self._follow_tail(head, tail, game.dot.cell, occupied, snake.growing)
+        if path:
+            path.extend(body[-2::-1])
+            self._path = deque(path)
+            return
+
+        occupied[tail] = snake.growing
+        best, best_area = None, 0
+        for cell in self._neighbors[head]:
+            if not occupied[cell]:
+                area = self._area(cell, occupied)
+                if area > best_area:
+                    best, best_area = cell, area
+        self._path = deque([best] if best is not None else [])
+
+    def _follow_tail(self, head: int, tail: int, dot: int, occupied: bytearray,
+                     growing: bool) -> Optional[List[int]]:
+        # Leaving through the neighbor farthest from the dot changes the snake's
+        # shape, so the dot is not out of reach for the same reason next time.
+        # A growing snake keeps its tail for a tick, so it cannot step right onto it.
+        cols = self._geometry[0]
+        dot_y, dot_x = divmod(dot, cols)
+        occupied[tail] = 0
+        occupied[head] = 1
+        steps = sorted(
+            (cell for cell in self._neighbors[head] if not occupied[cell]),
+            key=lambda cell: -abs(cell // cols - dot_y) - abs(cell % cols - dot_x),
+        )
+        for step in steps:
+            if step == tail:
+                if growing:
+                    continue
+                return [tail]
+            occupied[step] = 1
+            path = self._search(step, tail, occupied)
+            occupied[step] = 0
+            if path is not None:
+                return [step] + path
+        return None
+
+    def _search(self, start: int, goal: int, occupied: bytearray) -> Optional[List[int]]:
+        """
+        Finds a shortest path with A* and the Manhattan distance.
+
+        Returns:
+            Optional[List[int]]: The cells after `start` up to and including `goal`, or None.
+        """
+        self.searches += 1
+        cols = self._geometry[0]
+        neighbors = self._neighbors
+        goal_y, goal_x = divmod(goal, cols)
+        costs = [-1] * len(occupied)
+        parents = {}
+        costs[start] = 0
+        start_y, start_x = divmod(start, cols)
+        heap = [(abs(start_y - goal_y) + abs(start_x - goal_x), 0, start)]
+        while heap:
+            _, negative_cost, cell = heappop(heap)
+            if cell == goal:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = parents[cell]
+                path.reverse()
+                return path
+            cost = -negative_cost
+            if cost != costs[cell]:
+                continue
+            cost += 1
+            for neighbor in neighbors[cell]:
+                if occupied[neighbor] and neighbor != goal:
+                    continue
+                known = costs[neighbor]
+                if known < 0 or cost < known:
+                    costs[neighbor] = cost
+                    parents[neighbor] = cell
+                    y, x = divmod(neighbor, cols)
+                    heappush(heap, (cost + abs(y - goal_y) + abs(x - goal_x), -cost, neighbor))
+        return None
+
+    def _can_reach_tail(self, path: Sequence[int], body: Sequence[int]) -> bool:
+        future = (list(reversed(path)) + list(body))[:len(body) + 1]
+        occupied = bytearray(len(self._neighbors))
+        for cell in future[:-1]:
+            occupied[cell] = 1
+        return self._search(future[0], future[-1], occupied) is not None
+
+    def _area(self, start: int, occupied: bytearray) -> int:
+        seen = bytearray(occupied)
+        seen[start] = 1
+        queue = deque([start])
+        neighbors = self._neighbors
+        while queue:
+            for neighbor in neighbors[queue.popleft()]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    queue.append(neighbor)
+        return seen.count(1) - occupied.count(1)
@@ -0,0 +1,216 @@
+from typing import List, Sequence, Tuple
+import random
+
+import numpy as np
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+KEEP_DIRECTION = -1
+
+RUNNING = 0
+GAME_OVER = 1
+WON = 2
+STATES = ("RUNNING", "GAME_OVER", "WON")
+
+_OPPOSITE_CODES = np.array([1, 0, 3, 2], dtype=np.int8)
+_STEP_X = np.array([0, 0, -1, 1], dtype=np.int64)
+_STEP_Y = np.array([-1, 1, 0, 0], dtype=np.int64)
+
+class BatchGame:
+    """
+    Plays many snake games in lockstep, holding every board in NumPy arrays.
+
+    Each board behaves exactly like a started `Game` with the same seed: for the
+    same sequence of directions the snake, dot, score and state match step for step.
+    Cells are stored as packed indices (y * cols + x). Every board keeps its body
+    in a ring buffer, an occupancy grid, and a dense free-cell list that is updated
+    in the same order as `Grid`, so dots land on the same cells as in `Game`.
+
+    Attributes:
+        width (int): The width of each board.
+        height (int): The height of each board.
+        cell_size (int): The size of each cell.
+        win_score (int): The score needed to win.
+        seeds (List[int]): The seed of each board.
+        cols (int): The number of columns of each board.
+        rows (int): The number of rows of each board.
+        directions (np.ndarray): The direction code of each snake, indexing DIRECTIONS.
+        heads (np.ndarray): The (x, y) cell of each snake's head.
+        lengths (np.ndarray): The length of each snake.
+        growing (np.ndarray): Whether each snake grows on its next move.
+        dots (np.ndarray): The packed cell of each dot.
+        scores (np.ndarray): The score of each board.
+        states (np.ndarray): The state code of each board, indexing STATES.
+    """
+
+    def __init__(self, seeds: Sequence[int], width: int = 600, height: int = 400,
+                 cell_size: int = 20, win_score: int = 20) -> None:
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.win_score = win_score
+        self.seeds = list(seeds)
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+        if not self.cols or not self.rows:
+            raise ValueError(f"A {width}x{height} board has no room for a {cell_size} pixel cell")
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def reset(self) -> None:
+        """
+        Starts a fresh game on every board.
+        """
+        count, cells = len(self.seeds), self.cols * self.rows
+        start_x, start_y = self.cols // 2, self.rows // 2
+        # Like `Snake`, boards too narrow for the whole body start with the segments that fit.
+        length = min(3, start_x + 1)
+        self._boards = np.arange(count)
+        self._body = np.zeros((count, cells), dtype=np.int32)
+        self._head_index = np.full(count, length - 1, dtype=np.int64)
+        self._occupied = np.zeros((count, cells), dtype=bool)
+        self._free = np.tile(np.arange(cells, dtype=np.int32), (count, 1))
+        self._free_index = np.tile(np.arange(cells, dtype=np.int32), (count, 1))
+        self._free_count = np.full(count, cells, dtype=np.int64)
+        self.directions = np.full(count, DIRECTIONS.index("RIGHT"), dtype=np.int8)
+        self.lengths = np.full(count, length, dtype=np.int64)
+        self.growing = np.zeros(count, dtype=bool)
+        self.scores = np.zeros(count, dtype=np.int64)
+        self.states = np.full(count, RUNNING, dtype=np.int8)
+
+        self.heads = np.tile(np.array([start_x, start_y], dtype=np.int64), (count, 1))
+        for offset, x in zip(range(length - 1, -1, -1), range(start_x, start_x - length, -1)):
+            cell = np.full(count, start_y * self.cols + x)
+            self._body[:, offset] = cell
+            self._occupied[self._boards, cell] = True
+            self._take_free_cell(self._boards, cell)
+
+        self._rngs = [random.Random(seed) for seed in self.seeds]
+        self.dots = np.zeros(count, dtype=np.int64)
+        for board, rng in enumerate(self._rngs):
+            # Game draws a dot in __init__ and again when start() resets, then
+            # repositions it; the discarded draws keep the generators in step.
+            for _ in range(2):
+                rng.randint(0, self.cols - 1)
+                rng.randint(0, self.rows - 1)
+            self._reposition_dot(board)
+
+    def step(self, directions: np.ndarray) -> None:
+        """
+        Advances every running board by one tick.
+
+        Args:
+            directions (np.ndarray): One direction code per board, indexing DIRECTIONS,
+                or KEEP_DIRECTION to leave the snake's direction unchanged. Reversals are
+                ignored, as in `Snake.change_direction`.
+        """
+        directions = np.asarray(directions)
+        running = self.states == RUNNING
+        turning = running & (directions != KEEP_DIRECTION)
+        turning[turning] &= _OPPOSITE_CODES[directions[turning]] != self.directions[turning]
+        self.directions[turning] = directions[turning]
+
+        boards = self._boards[running]
+        moves = self.directions[boards]
+        new_x = self.heads[boards, 0] + _STEP_X[moves]
+        new_y = self.heads[boards, 1] + _STEP_Y[moves]
+        in_bounds = (new_x >= 0) & (new_x < self.cols) & (new_y >= 0) & (new_y < self.rows)
+        new_heads = np.where(in_bounds, new_y * self.cols + new_x, 0)
+
+        cells = self._body.shape[1]
+        popping = ~self.growing[boards]
+        tails = self._body[boards, (self._head_index[boards] - self.lengths[boards] + 1) % cells]
+        hits_body = self._occupied[boards, new_heads] & ~(popping & (new_heads == tails))
+        dead = ~in_bounds | hits_body
+        self.states[boards[dead]] = GAME_OVER
+
+        alive = ~dead
+        boards, new_heads, new_x, new_y = boards[alive], new_heads[alive], new_x[alive], new_y[alive]
+        popping, tails = popping[alive], tails[alive]
+
+        vacating = boards[popping]
+        self._occupied[vacating, tails[popping]] = False
+        self._give_free_cell(vacating, tails[popping])
+        self.lengths[boards[~popping]] += 1
+        self.growing[boards] = False
+
+        self._head_index[boards] = (self._head_index[boards] + 1) % cells
+        self._body[boards, self._head_index[boards]] = new_heads
+        self._occupied[boards, new_heads] = True
+        self._take_free_cell(boards, new_heads)
+        self.heads[boards, 0] = new_x
+        self.heads[boards, 1] = new_y
+
+        for board in boards[new_heads == self.dots[boards]].tolist():
+            self._handle_dot_eaten(board)
+
+    def segments(self, board: int) -> List[Tuple[int, int]]:
+        """
+        Returns the body of a board's snake in pixel coordinates, head first,
+        in the same form as `Snake.segments`.
+
+        Args:
+            board (int): The index of the board.
+
+        Returns:
+            List[Tuple[int, int]]: The positions of the snake's segments.
+        """
+        cells = self._body.shape[1]
+        indices = (self._head_index[board] - np.arange(self.lengths[board])) % cells
+        return [self._to_position(cell) for cell in self._body[board, indices].tolist()]
+
+    def dot_position(self, board: int) -> Tuple[int, int]:
+        """
+        Returns the position of a board's dot in pixel coordinates.
+
+        Args:
+            board (int): The index of the board.
+
+        Returns:
+            Tuple[int, int]: The position of the dot.
+        """
+        return self._to_position(int(self.dots[board]))
+
+    def state(self, board: int) -> str:
+        """
+        Returns the state of a board as a `GameState` string.
+
+        Args:
+            board (int): The index of the board.
+
+        Returns:
+            str: The state of the board.
+        """
+        return STATES[self.states[board]]
+
+    def _handle_dot_eaten(self, board: int) -> None:
+        self.scores[board] += 1
+        self.growing[board] = True
+        board_full = not self._reposition_dot(board)
+        if board_full or self.scores[board] >= self.win_score:
+            self.states[board] = WON
+
+    def _reposition_dot(self, board: int) -> bool:
+        free_count = int(self._free_count[board])
+        if free_count == 0:
+            return False
+        self.dots[board] = self._free[board, self._rngs[board].randrange(free_count)]
+        return True
+
+    def _take_free_cell(self, boards: np.ndarray, cells: np.ndarray) -> None:
+        indices = self._free_index[boards, cells]
+        last_indices = self._free_count[boards] - 1
+        last_cells = self._free[boards, last_indices]
+        self._free[boards, indices] = last_cells
+        self._free_index[boards, last_cells] = indices
+        self._free_index[boards, cells] = -1
+        self._free_count[boards] = last_indices
+
+    def _give_free_cell(self, boards: np.ndarray, cells: np.ndarray) -> None:
+        self._free[boards, self._free_count[boards]] = cells
+        self._free_index[boards, cells] = self._free_count[boards]
+        self._free_count[boards] += 1
+
+    def _to_position(self, cell: int) -> Tuple[int, int]:
+        return ((cell % self.cols) * self.cell_size, (cell // self.cols) * self.cell_size)
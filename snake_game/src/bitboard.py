@@ -0,0 +1,131 @@
+from array import array
+from typing import Optional
+import random
+
+from .grid import Grid
+
+BLOCK_BITS = 9
+BLOCK_SIZE = 1 << BLOCK_BITS
+
+class BitboardGrid(Grid):
+    """
+    A grid for very large boards that stores occupancy as one bit per cell.
+
+    The bits live in a bytearray (the same little-endian layout as
+    `numpy.packbits(..., bitorder="little")`), so a 2000x2000 board needs 500 KB.
+    Free cells are counted per block of 512 cells in a Fenwick tree: occupying or
+    vacating a cell is O(log blocks), and picking a random free cell ranks into
+    the tree and then selects the bit inside one block.
+
+    It offers the same interface as `Grid` and can be handed to `Snake`
+    or chosen with `Game(..., backend="bitboard")`.
+    """
+
+    __slots__ = ("_bits", "_tree", "_free_count")
+
+    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20) -> None:
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+        self.cell_size = cell_size
+        self.size = self.cols * self.rows
+        self._free_count = self.size
+
+        blocks = -(-self.size // BLOCK_SIZE)
+        self._bits = bytearray(blocks * BLOCK_SIZE // 8)
+        for cell in range(self.size, blocks * BLOCK_SIZE):
+            self._bits[cell >> 3] |= 1 << (cell & 7)
+
+        tree = array("I", bytes(4 * (blocks + 1)))
+        for block in range(1, blocks + 1):
+            tree[block] += min(BLOCK_SIZE, self.size - (block - 1) * BLOCK_SIZE)
+            parent = block + (block & -block)
+            if parent <= blocks:
+                tree[parent] += tree[block]
+        self._tree = tree
+
+    def __len__(self) -> int:
+        return self._free_count
+
+    def is_free(self, cell: int) -> bool:
+        return not self._bits[cell >> 3] >> (cell & 7) & 1
+
+    def is_occupied(self, cell: int) -> bool:
+        return bool(self._bits[cell >> 3] >> (cell & 7) & 1)
+
+    def occupy(self, cell: int) -> Optional[int]:
+        """
+        Marks a cell as occupied. Cells that are not free are ignored.
+
+        Args:
+            cell (int): The cell to occupy.
+
+        Returns:
+            Optional[int]: Always None, as free cells are found by index.
+        """
+        byte, bit = cell >> 3, 1 << (cell & 7)
+        if self._bits[byte] & bit:
+            return None
+        self._bits[byte] |= bit
+        self._free_count -= 1
+        self._add_free((cell >> BLOCK_BITS) + 1, -1)
+
+    def vacate(self, cell: int, slot: Optional[int] = None) -> None:
+        """
+        Marks a cell as free. Cells that are already free are ignored.
+
+        Args:
+            cell (int): The cell to free.
+            slot (Optional[int]): Ignored, as free cells are found by index.
+        """
+        byte, bit = cell >> 3, 1 << (cell & 7)
+        if not self._bits[byte] & bit:
+            return
+        self._bits[byte] &= ~bit
+        self._free_count += 1
+        self._add_free((cell >> BLOCK_BITS) + 1, 1)
+
+    def reorder(self) -> None:
+        """
+        Does nothing, as free cells are found by index and have no order to restore.
+        """
+
+    def sample(self, rng: Optional[random.Random] = None) -> Optional[int]:
+        """
+        Picks a free cell uniformly at random.
+
+        Args:
+            rng (Optional[random.Random]): The random generator to draw from.
+                Defaults to the global one of the random module.
+
+        Returns:
+            Optional[int]: A free cell, or None if the grid is full.
+        """
+        if not self._free_count:
+            return None
+        rank = (rng or random).randrange(self._free_count)
+
+        tree, block = self._tree, 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            if block + step < len(tree) and tree[block + step] <= rank:
+                block += step
+                rank -= tree[block]
+            step >>= 1
+
+        start = block * BLOCK_SIZE
+        for word_start in range(start, start + BLOCK_SIZE, 64):
+            word = int.from_bytes(self._bits[word_start >> 3:(word_start >> 3) + 8], "little")
+            free = ~word & 0xFFFFFFFFFFFFFFFF
+            count = bin(free).count("1")
+            if rank < count:
+                for _ in range(rank):
+                    free &= free - 1
+                return word_start + (free & -free).bit_length() - 1
+            rank -= count
+        raise AssertionError("free cell counts are out of sync with the bitboard")
+
+    def _add_free(self, index: int, delta: int) -> None:
+        tree = self._tree
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
@@ -1,6 +1,8 @@
-from typing import List, Tuple
+from typing import Optional, Sequence, Tuple
 import random
 
+from .grid import Grid
+
 class Dot:
     """
     Represents a dot in a grid-based game.
@@ -9,34 +11,60 @@ class Dot:
         width (int): The width of the grid.
         height (int): The height of the grid.
         cell_size (int): The size of each cell in the grid.
-        position (Tuple[int, int]): The current position of the dot.
+        cell (Optional[int]): The packed cell index (y * cols + x) of the dot, or None
+            once an `Arena` has taken it off a full board.
+        position (Tuple[int, int]): The current position of the dot, in pixels.
+        rng (random.Random): The random generator used to place the dot.
     """
 
-    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20) -> None:
+    __slots__ = ("width", "height", "cell_size", "cell", "rng")
+
+    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20,
+                 rng: Optional[random.Random] = None) -> None:
         self.width = width
         self.height = height
         self.cell_size = cell_size
+        self.rng = rng if rng is not None else random.Random()
         self.position = self._generate_random_position()
 
+    @property
+    def position(self) -> Tuple[int, int]:
+        y, x = divmod(self.cell, self.width // self.cell_size)
+        return (x * self.cell_size, y * self.cell_size)
+
+    @position.setter
+    def position(self, position: Tuple[int, int]) -> None:
+        self.cell = (position[1] // self.cell_size) * (self.width // self.cell_size) + position[0] // self.cell_size
+
     def _generate_random_position(self) -> Tuple[int, int]:
         max_x = (self.width // self.cell_size) - 1
         max_y = (self.height // self.cell_size) - 1
         return (
-            random.randint(0, max_x) * self.cell_size,
-            random.randint(0, max_y) * self.cell_size
+            self.rng.randint(0, max_x) * self.cell_size,
+            self.rng.randint(0, max_y) * self.cell_size
         )
 
-    def reposition(self, snake_positions: List[Tuple[int, int]]) -> None:
+    def reposition(self, snake_positions: Sequence[Tuple[int, int]],
+                   grid: Optional[Grid] = None) -> bool:
         """
         Repositions the dot to a valid position that is not occupied by the snake.
 
         Args:
-            snake_positions (List[Tuple[int, int]]): The positions occupied by the snake.
+            snake_positions (Sequence[Tuple[int, int]]): The positions occupied by the snake.
+            grid (Optional[Grid]): The grid tracking the free cells, if there is one.
+                When given, the new position is drawn from it in constant time.
+
+        Returns:
+            bool: True if the dot was moved, False if the board has no free cell left.
         """
-        self.position = self._find_valid_position(snake_positions)
+        new_cell = self._find_valid_cell(snake_positions, grid)
+        if new_cell is None:
+            return False
+        self.cell = new_cell
+        return True
 
-    def _find_valid_position(self, snake_positions: List[Tuple[int, int]]) -> Tuple[int, int]:
-        while True:
-            new_position = self._generate_random_position()
-            if new_position not in snake_positions:
-                return new_position
\ No newline at end of file
+    def _find_valid_cell(self, snake_positions: Sequence[Tuple[int, int]],
+                         grid: Optional[Grid]) -> Optional[int]:
+        if grid is None:
+            grid = Grid.excluding(self.width, self.height, self.cell_size, snake_positions)
+        return grid.sample(self.rng)
@@ -0,0 +1,286 @@
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+import os
+
+import numpy as np
+
+from .batch import DIRECTIONS
+from .game import Game
+
+ObservationKind = Literal["grid", "features"]
+
+EMPTY = 0
+BODY = 1
+HEAD = 2
+DOT = 3
+
+FEATURES = 12
+
+class SnakeEnv:
+    """
+    A reset/step environment over a single `Game`, in the style of Gym.
+
+    Actions index `DIRECTIONS`; reversing into the snake is ignored like a key press.
+    The reward is the score gained on the step (1 when a dot is eaten), minus 1
+    when the game is lost. An episode terminates when the game is over or won,
+    and is truncated after `max_steps` ticks.
+
+    Observations are either a (rows, cols) uint8 grid holding EMPTY, BODY, HEAD and
+    DOT, or a float32 vector of 12 features: whether the next cell in each
+    direction is blocked, whether the dot lies up, down, left or right of the head,
+    and the current direction, one-hot.
+
+    Attributes:
+        game (Game): The game being played.
+        observation (ObservationKind): The kind of observation returned.
+        observation_shape (Tuple[int, ...]): The shape of each observation.
+        observation_dtype (np.dtype): The dtype of each observation.
+        max_steps (Optional[int]): The number of ticks after which an episode is truncated.
+    """
+
+    def __init__(self, width: int = 200, height: int = 200, cell_size: int = 20, win_score: int = 20,
+                 observation: ObservationKind = "grid", max_steps: Optional[int] = None,
+                 seed: Optional[int] = None) -> None:
+        if observation not in ("grid", "features"):
+            raise ValueError(f"Unknown observation kind {observation!r}")
+        self.game = Game(width, height, cell_size, win_score, seed)
+        self.observation = observation
+        self.max_steps = max_steps
+        grid = self.game.snake.grid
+        if observation == "grid":
+            self.observation_shape: Tuple[int, ...] = (grid.rows, grid.cols)
+            self.observation_dtype = np.dtype(np.uint8)
+        else:
+            self.observation_shape = (FEATURES,)
+            self.observation_dtype = np.dtype(np.float32)
+
+    def reset(self, seed: Optional[int] = None, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Starts a new episode.
+
+        Args:
+            seed (Optional[int]): Reseeds dot placement. Defaults to continuing the current generator.
+            out (Optional[np.ndarray]): An array to write the observation into.
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, Any]]: The first observation and an info dict.
+        """
+        if seed is not None:
+            self.game.seed = seed
+            self.game.rng.seed(seed)
+        self.game.start()
+        return self.observe(out), {"score": 0}
+
+    def step(self, action: int, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        """
+        Turns the snake and advances the game by one tick.
+
+        Args:
+            action (int): The index of the direction in `DIRECTIONS`.
+            out (Optional[np.ndarray]): An array to write the observation into.
+
+        Returns:
+            Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]: The observation, the reward,
+            whether the episode terminated, whether it was truncated, and an info dict.
+        """
+        game = self.game
+        score = game.score
+        game.change_direction(DIRECTIONS[action])
+        game.update()
+
+        reward = float(game.score - score)
+        if game.state == "GAME_OVER":
+            reward -= 1.0
+        terminated = game.state in ("GAME_OVER", "WON")
+        truncated = not terminated and self.max_steps is not None and game.ticks >= self.max_steps
+        return self.observe(out), reward, terminated, truncated, {"score": game.score}
+
+    def observe(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Builds the observation of the current state.
+
+        Args:
+            out (Optional[np.ndarray]): An array to write the observation into.
+
+        Returns:
+            np.ndarray: The observation, which is `out` when given.
+        """
+        if out is None:
+            out = np.empty(self.observation_shape, self.observation_dtype)
+        if self.observation == "grid":
+            self._observe_grid(out)
+        else:
+            self._observe_features(out)
+        return out
+
+    def _observe_grid(self, out: np.ndarray) -> None:
+        snake = self.game.snake
+        cells = out.reshape(-1)
+        cells.fill(EMPTY)
+        cells[np.fromiter(snake.cells(), dtype=np.intp, count=len(snake))] = BODY
+        cells[self.game.dot.cell] = DOT
+        cells[snake.head] = HEAD
+
+    def _observe_features(self, out: np.ndarray) -> None:
+        snake = self.game.snake
+        grid = snake.grid
+        head = snake.head
+        for index, direction in enumerate(DIRECTIONS):
+            neighbor = grid.neighbor(head, direction)
+            out[index] = neighbor is None or grid.is_occupied(neighbor)
+
+        head_y, head_x = divmod(head, grid.cols)
+        dot_y, dot_x = divmod(self.game.dot.cell, grid.cols)
+        out[4:8] = (dot_y < head_y, dot_y > head_y, dot_x < head_x, dot_x > head_x)
+        out[8:12] = 0
+        out[8 + DIRECTIONS.index(snake.direction)] = 1
+
+class VectorSnakeEnv:
+    """
+    Runs several `SnakeEnv`s in subprocesses and exchanges data through shared memory.
+
+    Observations, actions, rewards and flags live in shared arrays. Each step only
+    sends one byte to each worker and waits for one byte back, so the cost of a
+    step does not grow with the size of the observations. Environments are split
+    evenly across the workers. An environment whose episode ends is reset in the
+    same step, and `info["final_score"]` holds the score it ended with, or -1 for
+    every environment whose episode is still running.
+
+    The arrays returned by `reset` and `step` are views of the shared memory. The
+    next call overwrites them, so copy them to keep them.
+
+    Attributes:
+        num_envs (int): The number of environments.
+        observation_shape (Tuple[int, ...]): The shape of each observation.
+    """
+
+    def __init__(self, num_envs: int, workers: Optional[int] = None, **options) -> None:
+        probe = SnakeEnv(**options)
+        self.num_envs = num_envs
+        self.observation_shape = probe.observation_shape
+        workers = min(workers or os.cpu_count() or 1, num_envs)
+
+        layout = (
+            ("observations", (num_envs, *probe.observation_shape), probe.observation_dtype),
+            ("actions", (num_envs,), np.dtype(np.int8)),
+            ("rewards", (num_envs,), np.dtype(np.float32)),
+            ("terminated", (num_envs,), np.dtype(np.bool_)),
+            ("truncated", (num_envs,), np.dtype(np.bool_)),
+            ("final_scores", (num_envs,), np.dtype(np.int64)),
+            ("seeds", (num_envs,), np.dtype(np.int64)),
+        )
+        context = get_context()
+        specs = [
+            (name, context.RawArray("b", int(np.prod(shape)) * dtype.itemsize), shape, dtype.str)
+            for name, shape, dtype in layout
+        ]
+        self._arrays = _shared_arrays(specs)
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+        self._connections: List[Connection] = []
+        self._processes = []
+        for start, stop in zip(bounds, bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(target=_run_worker, args=(child, specs, start, stop, options), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self) -> "VectorSnakeEnv":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Starts a new episode in every environment.
+
+        Args:
+            seed (Optional[int]): Seeds environment i with seed + i. Defaults to unseeded play.
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, Any]]: The observations and an info dict.
+        """
+        if seed is None:
+            self._arrays["seeds"].fill(-1)
+        else:
+            self._arrays["seeds"][:] = np.arange(seed, seed + self.num_envs)
+        self._broadcast(_RESET)
+        return self._arrays["observations"], {}
+
+    def step(self, actions: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Steps every environment with its action.
+
+        Args:
+            actions (Sequence[int]): One index into `DIRECTIONS` per environment.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]: The
+            observations, rewards, terminated and truncated flags, and an info dict
+            holding the final score of each environment whose episode ended this step,
+            and -1 for the others.
+        """
+        self._arrays["actions"][:] = actions
+        self._broadcast(_STEP)
+        arrays = self._arrays
+        return (arrays["observations"], arrays["rewards"], arrays["terminated"],
+                arrays["truncated"], {"final_score": arrays["final_scores"]})
+
+    def close(self) -> None:
+        """
+        Stops the workers and releases the shared memory.
+        """
+        if not self._processes:
+            return
+        for connection in self._connections:
+            connection.send_bytes(_CLOSE)
+        for process in self._processes:
+            process.join()
+        for connection in self._connections:
+            connection.close()
+        self._processes = []
+
+    def _broadcast(self, command: bytes) -> None:
+        for connection in self._connections:
+            connection.send_bytes(command)
+        for connection in self._connections:
+            if connection.recv_bytes() != _DONE:
+                raise RuntimeError("A snake environment worker failed")
+
+_RESET = b"r"
+_STEP = b"s"
+_CLOSE = b"c"
+_DONE = b"d"
+_FAILED = b"f"
+
+def _shared_arrays(specs: List[Tuple]) -> Dict[str, np.ndarray]:
+    return {name: np.frombuffer(raw, np.dtype(dtype)).reshape(shape) for name, raw, shape, dtype in specs}
+
+def _run_worker(connection: Connection, specs: List[Tuple], start: int, stop: int, options: Dict) -> None:
+    arrays = _shared_arrays(specs)
+    envs = [SnakeEnv(**options) for _ in range(start, stop)]
+    observations, actions = arrays["observations"], arrays["actions"]
+    while True:
+        command = connection.recv_bytes()
+        if command == _CLOSE:
+            return
+        try:
+            for index, env in enumerate(envs, start):
+                if command == _RESET:
+                    seed = int(arrays["seeds"][index])
+                    env.reset(None if seed < 0 else seed, observations[index])
+                    continue
+                _, reward, terminated, truncated, info = env.step(int(actions[index]), observations[index])
+                arrays["rewards"][index] = reward
+                arrays["terminated"][index] = terminated
+                arrays["truncated"][index] = truncated
+                arrays["final_scores"][index] = info["score"] if terminated or truncated else -1
+                if terminated or truncated:
+                    env.reset(out=observations[index])
+            connection.send_bytes(_DONE)
+        except Exception:
+            connection.send_bytes(_FAILED)
+            raise
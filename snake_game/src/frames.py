@@ -0,0 +1,166 @@
+from typing import Optional, Tuple, Union
+import os
+import weakref
+
+import numpy as np
+
+from .game import Game
+
+BACKGROUND = (0, 0, 0)
+SNAKE = (0, 255, 0)
+DOT = (255, 0, 0)
+
+def _palette(*colors: Tuple[int, int, int]) -> np.ndarray:
+    pixels = np.array([(*color, 255) for color in colors], dtype=np.uint8)
+    return pixels.view(np.uint32).ravel()
+
+class FrameRasterizer:
+    """
+    Draws games into RGBX frames with NumPy alone, without Qt.
+
+    Frames have shape (height, width, 4) and hold R, G, B, 255 per pixel, the
+    layout of `QImage.Format_RGBX8888`. They are pixel-identical to
+    `OffscreenRenderer` frames drawn without text. Cells are coloured on a
+    (rows, cols) grid that is broadcast onto a (rows, cell, cols, cell) view of
+    the frame, so every pixel is written once with no per-pixel index lookups.
+
+    Attributes:
+        shape (Tuple[int, int, int]): The shape of the frames.
+    """
+
+    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20) -> None:
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+        self.cell_size = cell_size
+        self.shape = (height, width, 4)
+        self._colors = np.zeros(self.rows * self.cols, dtype=np.uint8)
+        self._palette = _palette(BACKGROUND, SNAKE, DOT)
+
+    def render(self, game: Game, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Draws the snake and the dot of a game.
+
+        Args:
+            game (Game): The game to draw. Its board must match the rasterizer's.
+            out (Optional[np.ndarray]): A contiguous uint8 array of `shape` to draw into.
+
+        Returns:
+            np.ndarray: The frame, which is `out` when given.
+        """
+        if out is None:
+            out = np.empty(self.shape, dtype=np.uint8)
+        colors = self._colors
+        colors.fill(0)
+        colors[np.fromiter(game.snake.cells(), dtype=np.intp, count=len(game.snake))] = 1
+        colors[game.dot.cell] = 2
+
+        background = self._palette[0]
+        size = self.cell_size
+        frame = out.view(np.uint32).reshape(self.shape[:2])
+        frame[self.rows * size:] = background
+        frame[:, self.cols * size:] = background
+        cells = frame[:self.rows * size, :self.cols * size].reshape(self.rows, size, self.cols, size)
+        cells[...] = self._palette[colors].reshape(self.rows, 1, self.cols, 1)
+        cells[:, size - 1] = background
+        cells[:, :, :, size - 1] = background
+        return out
+
+class FrameExporter:
+    """
+    Streams frames into a memory-mapped `.npy` file of shape (frames, height, width, 4).
+
+    Room for `max_frames` is reserved up front and frames are drawn straight into
+    the mapping, so nothing is copied or buffered in between. Closing the exporter
+    shrinks the file to the frames written, and the result can be opened with
+    `numpy.load(path, mmap_mode="r")`. Shrinking unmaps the tail of the file, so
+    every frame returned by `next_frame` must be dropped before closing; `close`
+    refuses to run while any of them is still alive.
+
+    Attributes:
+        rasterizer (FrameRasterizer): The rasterizer used by `write`.
+        count (int): The number of frames written so far.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], width: int = 600, height: int = 400,
+                 cell_size: int = 20, max_frames: int = 10_000) -> None:
+        self.path = path
+        self.rasterizer = FrameRasterizer(width, height, cell_size)
+        self.count = 0
+        self._frames = np.lib.format.open_memmap(path, "w+", np.uint8, (max_frames, *self.rasterizer.shape))
+
+    def __enter__(self) -> "FrameExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, game: Game) -> None:
+        """
+        Draws a game as the next frame.
+
+        Args:
+            game (Game): The game to draw.
+        """
+        self.rasterizer.render(game, self.next_frame())
+
+    def append(self, frame: np.ndarray) -> None:
+        """
+        Copies a frame drawn elsewhere, such as by `OffscreenRenderer`, as the next frame.
+
+        Args:
+            frame (np.ndarray): A uint8 array of shape (height, width, 4).
+        """
+        self.next_frame()[...] = frame
+
+    def next_frame(self) -> np.ndarray:
+        """
+        Reserves the next frame and returns it as a writable view into the file.
+
+        The view, and any array derived from it, must be dropped before `close`.
+
+        Returns:
+            np.ndarray: The frame to fill in.
+        """
+        if self.count == len(self._frames):
+            raise ValueError(f"{self.path} already holds {self.count} frames")
+        self.count += 1
+        return self._frames[self.count - 1]
+
+    def close(self) -> None:
+        """
+        Flushes the frames and trims the file to the frames written.
+
+        Raises:
+            ValueError: If a frame from `next_frame` is still referenced. Reading or
+                writing it after the file shrinks would crash the process, so the
+                exporter stays open until the frame is dropped and `close` is called again.
+        """
+        if self._frames is None:
+            return
+        self._frames.flush()
+        frame_bytes = int(np.prod(self.rasterizer.shape))
+        # Handed-out frames are views whose base is the mapping, so it outlives
+        # our own reference exactly as long as one of them is alive.
+        frames = weakref.ref(self._frames)
+        self._frames = None
+        if frames() is not None:
+            self._frames = frames()
+            raise ValueError(f"frames of {self.path} are still referenced; drop them before closing")
+
+        with open(self.path, "r+b") as file:
+            version = np.lib.format.read_magic(file)
+            header_start = file.tell()
+            if version == (1, 0):
+                np.lib.format.read_array_header_1_0(file)
+            else:
+                np.lib.format.read_array_header_2_0(file)
+            data_start = file.tell()
+            header = repr({
+                "descr": "|u1",
+                "fortran_order": False,
+                "shape": (self.count, *self.rasterizer.shape),
+            })
+            length_bytes = 2 if version == (1, 0) else 4
+            file.seek(header_start + length_bytes)
+            file.write(header.ljust(data_start - header_start - length_bytes - 1).encode("latin1") + b"\n")
+            file.truncate(data_start + self.count * frame_bytes)
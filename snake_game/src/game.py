@@ -1,20 +1,64 @@
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, Optional, Tuple
+import random
 
-from .snake import Snake, Direction
+from .bitboard import BitboardGrid
+from .grid import Grid
+from .snake import Snake, SnakeSnapshot, Direction
 from .dot import Dot
 
+if TYPE_CHECKING:
+    from .replay import ReplayRecorder
+
 GameState = Literal["RUNNING", "PAUSED", "GAME_OVER", "WON"]
+GridBackend = Literal["dense", "bitboard"]
+
+GRID_BACKENDS = {
+    "dense": Grid,
+    "bitboard": BitboardGrid
+}
+
+class SavedGame(NamedTuple):
+    """
+    The state of a game at one moment, as taken by `Game.snapshot`.
+
+    Attributes:
+        snake (SnakeSnapshot): The snake, sharing its body with the live snake.
+        dot (int): The packed cell of the dot.
+        score (int): The score.
+        ticks (int): The number of ticks played.
+        state (GameState): The state of the game.
+        rng_state (Tuple[Any, ...]): The state of the game's random generator.
+    """
+    snake: SnakeSnapshot
+    dot: int
+    score: int
+    ticks: int
+    state: "GameState"
+    rng_state: Tuple[Any, ...]
 
 class Game:
     """
     Represents the game state and logic for the Snake game.
+
+    Passing a seed makes dot placement, and therefore the whole game for a given
+    sequence of inputs, reproducible. The "bitboard" backend keeps occupancy in one
+    bit per cell, for boards with millions of cells. A `ReplayRecorder` assigned to
+    `recorder` is told about every start, direction change, dot spawn and tick.
     """
 
-    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20, win_score: int = 20) -> None:
+    __slots__ = ("width", "height", "cell_size", "win_score", "backend", "seed", "rng", "recorder",
+                 "snake", "dot", "score", "state", "ticks", "_rng_state")
+
+    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20, win_score: int = 20,
+                 seed: Optional[int] = None, backend: GridBackend = "dense") -> None:
         self.width = width
         self.height = height
         self.cell_size = cell_size
         self.win_score = win_score
+        self.backend = backend
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder: Optional["ReplayRecorder"] = None
 
         self.reset_game()
 
@@ -22,9 +66,12 @@ class Game:
         """
         Resets the game to its initial state.
         """
-        self.snake = Snake(self.width, self.height, self.cell_size)
-        self.dot = Dot(self.width, self.height, self.cell_size)
+        grid = GRID_BACKENDS[self.backend](self.width, self.height, self.cell_size)
+        self.snake = Snake(self.width, self.height, self.cell_size, grid)
+        self.dot = Dot(self.width, self.height, self.cell_size, self.rng)
+        self._rng_state: Optional[Tuple[Any, ...]] = None
         self.score = 0
+        self.ticks = 0
         self.state: GameState = "PAUSED"
 
     def start(self) -> None:
@@ -33,7 +80,10 @@ class Game:
         """
         self.reset_game()
         self.state = "RUNNING"
-        self.dot.reposition(self.snake.segments)
+        self.dot.reposition(self.snake.segments, self.snake.grid)
+        self._rng_state = None
+        if self.recorder is not None:
+            self.recorder.record_start(self)
 
     def update(self) -> None:
         """
@@ -42,24 +92,30 @@ class Game:
         if self.state != "RUNNING":
             return
 
+        self.ticks += 1
         self.snake.move()
 
         if self.snake.check_collision():
             self.game_over()
-            return
-
-        if self.snake.segments[0] == self.dot.position:
+        elif self.snake.head == self.dot.cell:
             self.handle_dot_eaten()
 
+        if self.recorder is not None:
+            self.recorder.record_tick(self)
+
     def handle_dot_eaten(self) -> None:
         """
         Handles the event when the snake eats a dot.
+        The game is won once the score is reached or the snake covers the whole board.
         """
         self.score += 1
         self.snake.grow()
-        self.dot.reposition(self.snake.segments)
+        board_full = not self.dot.reposition(self.snake.segments, self.snake.grid)
+        self._rng_state = None
+        if self.recorder is not None and not board_full:
+            self.recorder.record_dot(self)
 
-        if self.score >= self.win_score:
+        if board_full or self.score >= self.win_score:
             self.win_game()
 
     def change_direction(self, direction: Direction) -> None:
@@ -69,7 +125,50 @@ class Game:
         :param direction: The new direction for the snake.
         """
         if self.state == "RUNNING":
+            previous = self.snake.direction
             self.snake.change_direction(direction)
+            if self.recorder is not None and self.snake.direction != previous:
+                self.recorder.record_direction(self)
+
+    def snapshot(self) -> SavedGame:
+        """
+        Captures the game's state, cheaply enough to do every tick.
+
+        The snapshot shares the snake's body instead of copying it, so taking one
+        does not depend on the snake's length. The random generator's state is
+        only read again after a dot has been placed, since that is all it is used for.
+        The grid sorts its free cells before the next dot, as it does after a restore,
+        so the game and its restores place the same dots.
+
+        Returns:
+            SavedGame: The snapshot.
+        """
+        if self._rng_state is None:
+            self._rng_state = self.rng.getstate()
+        self.snake.grid.reorder()
+        return SavedGame(self.snake.snapshot(), self.dot.cell, self.score, self.ticks, self.state,
+                         self._rng_state)
+
+    def restore(self, saved: SavedGame) -> None:
+        """
+        Returns the game to a snapshot, for rollback or undo.
+
+        A snapshot can be restored any number of times, and snapshots taken after
+        it stay valid. Restoring costs about as much as the moves made since the
+        snapshot. Restores are not recorded in replays. Since the random generator
+        is restored too, later dots land where they did the first time.
+
+        Args:
+            saved (SavedGame): A snapshot of this game or of one with the same board.
+        """
+        self.snake.restore(saved.snake)
+        self.snake.grid.reorder()
+        self.dot.cell = saved.dot
+        self.score = saved.score
+        self.ticks = saved.ticks
+        self.state = saved.state
+        self.rng.setstate(saved.rng_state)
+        self._rng_state = saved.rng_state
 
     def game_over(self) -> None:
         """
@@ -0,0 +1,222 @@
+from array import array
+from typing import Iterable, Optional, Tuple
+import random
+
+def cell_typecode(size: int) -> str:
+    """
+    Returns the smallest array typecode that can hold every cell of a grid and one sentinel.
+
+    Args:
+        size (int): The number of cells of the grid.
+
+    Returns:
+        str: The array typecode.
+    """
+    return "H" if size < 0xFFFF else "I"
+
+class Grid:
+    """
+    The cells of a game board, addressed by packed index (y * cols + x).
+
+    Tracks which cells are free in a dense array with an index array beside it.
+    Occupying a cell swaps the last free cell into its slot, so occupying,
+    vacating, occupancy queries and picking a random free cell are all O(1).
+    Snapshots, restores and saved games put the free cells back in ascending
+    order before the next pick with `reorder`, so a restored or reloaded game
+    draws the same cells as the original.
+    Pixel positions are only produced on request, for rendering.
+
+    Attributes:
+        cols (int): The number of columns of the grid.
+        rows (int): The number of rows of the grid.
+        cell_size (int): The size of each cell in pixels.
+        size (int): The number of cells of the grid.
+    """
+
+    __slots__ = ("cols", "rows", "cell_size", "size", "_free", "_free_index", "_unordered")
+
+    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20) -> None:
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+        self.cell_size = cell_size
+        self.size = self.cols * self.rows
+        typecode = cell_typecode(self.size)
+        self._free = array(typecode, range(self.size))
+        self._free_index = array(typecode, range(self.size))
+        self._unordered = False
+
+    @classmethod
+    def excluding(cls, width: int, height: int, cell_size: int,
+                  positions: Iterable[Tuple[int, int]]) -> "Grid":
+        """
+        Builds a grid with the given pixel positions already occupied.
+
+        Args:
+            width (int): The width of the grid.
+            height (int): The height of the grid.
+            cell_size (int): The size of each cell in the grid.
+            positions (Iterable[Tuple[int, int]]): The occupied positions.
+
+        Returns:
+            Grid: The grid.
+        """
+        grid = cls(width, height, cell_size)
+        for position in positions:
+            cell = grid.to_cell(position)
+            if cell is not None:
+                grid.occupy(cell)
+        return grid
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def cell_array(self, length: int) -> array:
+        """
+        Creates a zeroed array able to hold cells of this grid in as few bytes as possible.
+
+        Args:
+            length (int): The length of the array.
+
+        Returns:
+            array: The array.
+        """
+        cells = array(cell_typecode(self.size))
+        cells.frombytes(bytes(length * cells.itemsize))
+        return cells
+
+    def is_free(self, cell: int) -> bool:
+        return self._free_index[cell] != self.size
+
+    def is_occupied(self, cell: int) -> bool:
+        return self._free_index[cell] == self.size
+
+    def occupy(self, cell: int) -> Optional[int]:
+        """
+        Marks a cell as occupied. Cells that are not free are ignored.
+
+        Args:
+            cell (int): The cell to occupy.
+
+        Returns:
+            Optional[int]: The slot the cell had among the free cells, which `vacate`
+                can put it back into, or None if the cell was not free.
+        """
+        index = self._free_index[cell]
+        if index == self.size:
+            return None
+        last = self._free.pop()
+        if last != cell:
+            self._free[index] = last
+            self._free_index[last] = index
+        self._free_index[cell] = self.size
+        return index
+
+    def vacate(self, cell: int, slot: Optional[int] = None) -> None:
+        """
+        Marks a cell as free. Cells that are already free are ignored.
+
+        Passing the slot that `occupy` returned undoes that call exactly, leaving
+        the free cells in the order they were in, as long as calls are undone in
+        the reverse order they were made.
+
+        Args:
+            cell (int): The cell to free.
+            slot (Optional[int]): The slot to put the cell back into. By default the
+                cell is added after the other free cells.
+        """
+        if self._free_index[cell] != self.size:
+            return
+        free, free_index = self._free, self._free_index
+        if slot is None or slot == len(free):
+            free_index[cell] = len(free)
+            free.append(cell)
+            return
+        # Move the cell that took the slot back to the end, where it was popped from.
+        moved = free[slot]
+        free_index[moved] = len(free)
+        free.append(moved)
+        free[slot] = cell
+        free_index[cell] = slot
+
+    def sample(self, rng: Optional[random.Random] = None) -> Optional[int]:
+        """
+        Picks a free cell uniformly at random.
+
+        Args:
+            rng (Optional[random.Random]): The random generator to draw from.
+                Defaults to the global one of the random module.
+
+        Returns:
+            Optional[int]: A free cell, or None if the grid is full.
+        """
+        if not self._free:
+            return None
+        if self._unordered:
+            self._sort_free()
+        return self._free[(rng or random).randrange(len(self._free))]
+
+    def reorder(self) -> None:
+        """
+        Puts the free cells in ascending order before the next sample, so that the
+        cells drawn from then on only depend on which cells are free and on the
+        moves made, not on the order earlier moves left the free cells in.
+
+        The free cells are only sorted at the next sample, so calling this every
+        tick costs nothing until a dot is placed.
+        """
+        self._unordered = True
+
+    def _sort_free(self) -> None:
+        free, free_index = self._free, self._free_index
+        free[:] = array(free.typecode, sorted(free))
+        for slot, cell in enumerate(free):
+            free_index[cell] = slot
+        self._unordered = False
+
+    def neighbor(self, cell: int, direction: str) -> Optional[int]:
+        """
+        Returns the cell next to a cell in a direction.
+
+        Args:
+            cell (int): The starting cell.
+            direction (str): One of "UP", "DOWN", "LEFT" or "RIGHT".
+
+        Returns:
+            Optional[int]: The neighbouring cell, or None if it is off the grid.
+        """
+        cols = self.cols
+        if direction == "RIGHT":
+            return cell + 1 if cell % cols != cols - 1 else None
+        if direction == "LEFT":
+            return cell - 1 if cell % cols != 0 else None
+        if direction == "UP":
+            return cell - cols if cell >= cols else None
+        return cell + cols if cell + cols < self.size else None
+
+    def to_cell(self, position: Tuple[int, int]) -> Optional[int]:
+        """
+        Converts a pixel position to a cell.
+
+        Args:
+            position (Tuple[int, int]): The top-left pixel of the cell.
+
+        Returns:
+            Optional[int]: The cell, or None if the position is off the grid.
+        """
+        x, y = position[0] // self.cell_size, position[1] // self.cell_size
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return y * self.cols + x
+        return None
+
+    def to_position(self, cell: int) -> Tuple[int, int]:
+        """
+        Converts a cell to the pixel position of its top-left corner.
+
+        Args:
+            cell (int): The cell.
+
+        Returns:
+            Tuple[int, int]: The pixel position.
+        """
+        y, x = divmod(cell, self.cols)
+        return (x * self.cell_size, y * self.cell_size)
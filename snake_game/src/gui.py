@@ -1,53 +1,212 @@
-from typing import Optional
+from typing import Iterable, List, Optional, Set, Tuple
+import time
 
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QPainter, QColor, QKeyEvent
+from PySide6.QtCore import Qt, QRect, QTimer
+from PySide6.QtGui import QPainter, QColor, QCloseEvent, QKeyEvent, QPixmap, QRegion
 from PySide6.QtWidgets import QMainWindow, QApplication
 
 from .game import Game
+from .loop import FixedTimestepLoop
+from .simulation import PAUSE, RESTART, GameSnapshot, SimulationThread
+from .world import WorldGame
 
-class SnakeGameWindow(QMainWindow):
+SCORE_AREA = QRect(0, 0, 160, 30)
+
+class GamePainter:
+    """
+    Drawing code shared by the game window and the offscreen renderer.
+
+    Subclasses provide a `game` and may override the state accessors to draw from
+    somewhere else, such as a snapshot published by another thread.
+    """
+
+    game: Game
+
+    def _tracked_state(self) -> Tuple[str, int, Tuple[int, ...]]:
+        snake = self.game.snake
+        return self.game.state, self.game.score, (snake.head, snake.cell_at(-1), self.game.dot.cell)
+
+    def _body_cells(self) -> Iterable[int]:
+        return self.game.snake.cells()
+
+    def _is_occupied(self, cell: int) -> bool:
+        return self.game.snake.grid.is_occupied(cell)
+
+    def _board(self) -> Tuple[int, int, int]:
+        grid = self.game.snake.grid
+        return grid.cols, grid.rows, grid.cell_size
+
+    def _interpolation(self) -> Optional[Tuple[int, int, float]]:
+        return None
+
+    def _to_position(self, cell: int) -> Tuple[int, int]:
+        cols, _, cell_size = self._board()
+        y, x = divmod(cell, cols)
+        return (x * cell_size, y * cell_size)
+
+    def _cell_rect(self, cell: int) -> QRect:
+        x, y = self._to_position(cell)
+        cell_size = self._board()[2]
+        return QRect(x, y, cell_size, cell_size)
+
+    def _draw_snake(self, painter: QPainter) -> None:
+        self._draw_snake_cells(painter, self._body_cells())
+
+    def _draw_snake_cells(self, painter: QPainter, cells: Iterable[int]) -> None:
+        cols, _, cell_size = self._board()
+        size = cell_size - 1
+        interpolation = self._interpolation()
+        sliding_head = self._tracked_state()[2][0] if interpolation is not None else None
+        rects: List[QRect] = []
+        for cell in cells:
+            if cell != sliding_head and self._is_occupied(cell):
+                y, x = divmod(cell, cols)
+                rects.append(QRect(x * cell_size, y * cell_size, size, size))
+        if interpolation is not None:
+            rects.extend(self._interpolated_rects(*interpolation))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 255, 0))
+        if rects:
+            painter.drawRects(rects)
+
+    def _interpolated_rects(self, previous_head: int, previous_tail: int, alpha: float) -> List[QRect]:
+        _, _, (head, tail, _) = self._tracked_state()
+        rects = [self._partial_cell_rect(head, previous_head, alpha)]
+        if not self._is_occupied(previous_tail):
+            rects.append(self._partial_cell_rect(previous_tail, tail, 1 - alpha))
+        return rects
+
+    def _partial_cell_rect(self, cell: int, neighbor: int, fraction: float) -> QRect:
+        """
+        Returns the part of a cell's square that touches a neighbouring cell.
+        """
+        x, y = self._to_position(cell)
+        neighbor_x, neighbor_y = self._to_position(neighbor)
+        size = self._board()[2] - 1
+        length = round(size * fraction)
+        if neighbor_x < x:
+            return QRect(x, y, length, size)
+        if neighbor_x > x:
+            return QRect(x + size - length, y, length, size)
+        if neighbor_y < y:
+            return QRect(x, y, size, length)
+        return QRect(x, y + size - length, size, length)
+
+    def _draw_dot(self, painter: QPainter) -> None:
+        x, y = self._to_position(self._tracked_state()[2][2])
+        size = self._board()[2] - 1
+        painter.setBrush(QColor(255, 0, 0))
+        painter.drawRect(x, y, size, size)
+
+    def _draw_score(self, painter: QPainter) -> None:
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(10, 20, f"Score: {self._tracked_state()[1]}")
+
+    def _draw_game_state_messages(self, painter: QPainter) -> None:
+        state = self._tracked_state()[0]
+        if state == "PAUSED":
+            self._draw_centered_text(painter, "PAUSED - Press SPACE to continue")
+        elif state == "GAME_OVER":
+            self._draw_centered_text(painter, "GAME OVER - Press R to restart")
+        elif state == "WON":
+            self._draw_centered_text(painter, "YOU WIN! - Press R to play again")
+
+    def _draw_centered_text(self, painter: QPainter, text: str) -> None:
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(
+            0, 0, self.game.width, self.game.height,
+            Qt.AlignmentFlag.AlignCenter,
+            text
+        )
+
+class SnakeGameWindow(GamePainter, QMainWindow):
     """
     Main window for the Snake game.
+
+    The game ticks at `tick_rate` through a `FixedTimestepLoop`, while the window
+    repaints at `frame_rate`, sliding the head and tail between ticks.
+    Each frame only repaints the cells that changed (new head, vacated tail, old and
+    new dot) and the score area. Full repaints blit a cached background and draw the
+    whole body with a single `drawRects` call.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, tick_rate: float = 10.0, frame_rate: float = 60.0, game: Optional[Game] = None) -> None:
         super().__init__()
-        self.game = Game()
+        self.game = game if game is not None else Game()
+        self.tick_rate = tick_rate
+        self.frame_rate = frame_rate
         self._initialize_window()
         self._initialize_timer()
 
     def _initialize_window(self) -> None:
         self.setWindowTitle("Snake Game")
         self.setFixedSize(self.game.width, self.game.height)
+        self._background = QPixmap(self.game.width, self.game.height)
+        self._background.fill(QColor(0, 0, 0))
 
     def _initialize_timer(self) -> None:
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self._update_game)
-        self.timer.start(100)
+        self.timer.start(round(1000 / self.frame_rate))
         self.game.start()
+        self.loop = FixedTimestepLoop(self.game, self.tick_rate)
 
     def _update_game(self) -> None:
-        self.game.update()
-        self.update()
+        before = self._tracked_state()
+        ticks = self.loop.advance()
+        if ticks > 1:
+            self.update()
+            return
+        self._update_changed(before, ticks > 0)
+
+    def _update_changed(self, before: Tuple[str, int, Tuple[int, ...]], ticked: bool) -> None:
+        region = self._dirty_region(before) if ticked else QRegion()
+        interpolation = self._interpolation()
+        if interpolation is not None:
+            region += self._cell_rect(self._tracked_state()[2][0])
+            region += self._cell_rect(interpolation[1])
+        if not region.isEmpty():
+            self.update(region)
+
+    def _interpolation(self) -> Optional[Tuple[int, int, float]]:
+        if self.loop.previous_cells is None:
+            return None
+        return (*self.loop.previous_cells, self.loop.alpha)
+
+    def _dirty_region(self, before: Tuple[str, int, Tuple[int, ...]]) -> QRegion:
+        state, score, cells = before
+        after_state, after_score, after_cells = self._tracked_state()
+        if state != after_state:
+            return QRegion(self.rect())
+        region = QRegion()
+        for cell in set(cells + after_cells):
+            region += self._cell_rect(cell)
+        if score != after_score:
+            region += SCORE_AREA
+        return region
+
+    KEY_DIRECTIONS = {
+        Qt.Key.Key_Up: "UP",
+        Qt.Key.Key_Down: "DOWN",
+        Qt.Key.Key_Left: "LEFT",
+        Qt.Key.Key_Right: "RIGHT"
+    }
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
         """
         Handle key press events to control the game.
         Overrides the keyPressEvent method from QMainWindow.
         """
-        key_map = {
-            Qt.Key.Key_Up: "UP",
-            Qt.Key.Key_Down: "DOWN",
-            Qt.Key.Key_Left: "LEFT",
-            Qt.Key.Key_Right: "RIGHT"
-        }
         if event.key() == Qt.Key.Key_Space:
             self.game.toggle_pause()
+            self.update()
         elif event.key() == Qt.Key.Key_R and self.game.state in ["GAME_OVER", "WON"]:
             self.game.start()
-        elif event.key() in key_map:
-            self.game.change_direction(key_map[event.key()])
+            self.loop.reset()
+            self.update()
+        elif event.key() in self.KEY_DIRECTIONS:
+            self.loop.queue_direction(self.KEY_DIRECTIONS[event.key()])
 
     def paintEvent(self, event) -> None:
         """
@@ -55,51 +214,179 @@ class SnakeGameWindow(QMainWindow):
         Overrides the paintEvent method from QMainWindow.
         """
         painter = QPainter(self)
-        self._draw_background(painter)
-        self._draw_snake(painter)
+        region = event.region()
+        if region.rectCount() == 1 and region.boundingRect().contains(self.rect()):
+            self._draw_background(painter)
+            self._draw_snake(painter)
+        else:
+            for rect in region:
+                painter.drawPixmap(rect, self._background, rect)
+            self._draw_snake_cells(painter, self._cells_in(region))
         self._draw_dot(painter)
         self._draw_score(painter)
         self._draw_game_state_messages(painter)
 
     def _draw_background(self, painter: QPainter) -> None:
-        painter.fillRect(0, 0, self.width(), self.height(), QColor(0, 0, 0))
+        painter.drawPixmap(0, 0, self._background)
 
-    def _draw_snake(self, painter: QPainter) -> None:
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QColor(0, 255, 0))
-        for segment in self.game.snake.segments:
-            painter.drawRect(
-                segment[0],
-                segment[1],
-                self.game.cell_size - 1,
-                self.game.cell_size - 1
-            )
+    def _cells_in(self, region: QRegion) -> Set[int]:
+        cols, rows, cell_size = self._board()
+        cells = set()
+        for rect in region:
+            rect = rect.intersected(self.rect())
+            for y in range(rect.top() // cell_size, rect.bottom() // cell_size + 1):
+                for x in range(rect.left() // cell_size, rect.right() // cell_size + 1):
+                    if x < cols and y < rows:
+                        cells.add(y * cols + x)
+        return cells
 
-    def _draw_dot(self, painter: QPainter) -> None:
-        painter.setBrush(QColor(255, 0, 0))
-        painter.drawRect(
-            self.game.dot.position[0],
-            self.game.dot.position[1],
-            self.game.cell_size - 1,
-            self.game.cell_size - 1
-        )
+class ThreadedSnakeGameWindow(SnakeGameWindow):
+    """
+    A Snake game window whose game runs on a `SimulationThread`.
 
-    def _draw_score(self, painter: QPainter) -> None:
-        painter.setPen(QColor(255, 255, 255))
-        painter.drawText(10, 20, f"Score: {self.game.score}")
+    Apart from the board's size, which is fixed before the thread starts, the GUI
+    thread never touches the game: key presses are sent to the simulation thread's
+    queue, and each frame reads the latest `GameSnapshot`, so a slow paint or a busy
+    event loop cannot stall the simulation. The GUI thread keeps its own set of the
+    snake's cells for occupancy, moving it along by the head and tail of each tick,
+    so a frame costs the same however long the snake is. Only a full repaint, or a
+    frame that skipped ticks, reads the whole body.
+    """
 
-    def _draw_game_state_messages(self, painter: QPainter) -> None:
-        if self.game.state == "PAUSED":
-            self._draw_centered_text(painter, "PAUSED - Press SPACE to continue")
-        elif self.game.state == "GAME_OVER":
-            self._draw_centered_text(painter, "GAME OVER - Press R to restart")
-        elif self.game.state == "WON":
-            self._draw_centered_text(painter, "YOU WIN! - Press R to play again")
+    def _initialize_timer(self) -> None:
+        self.game.start()
+        self.simulation = SimulationThread(self.game, self.tick_rate)
+        self.loop = self.simulation.loop
+        self._snapshot = self.simulation.snapshot
+        self._cells_snapshot: Optional[GameSnapshot] = None
+        self._cells: List[int] = []
+        self._occupied_snapshot: Optional[GameSnapshot] = None
+        self._occupied: Set[int] = set()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._update_game)
+        self.timer.start(round(1000 / self.frame_rate))
+        self.simulation.start()
 
-    def _draw_centered_text(self, painter: QPainter, text: str) -> None:
-        painter.setPen(QColor(255, 255, 255))
-        painter.drawText(
-            0, 0, self.width(), self.height(),
-            Qt.AlignmentFlag.AlignCenter,
-            text
-        )
\ No newline at end of file
+    def _update_game(self) -> None:
+        before = self._tracked_state()
+        previous = self._snapshot
+        self._snapshot = self.simulation.snapshot
+        self._advance_occupied()
+        if self._snapshot.ticks - previous.ticks > 1:
+            self.update()
+            return
+        self._update_changed(before, self._snapshot is not previous)
+
+    def _tracked_state(self) -> Tuple[str, int, Tuple[int, ...]]:
+        snapshot = self._snapshot
+        return snapshot.state, snapshot.score, (snapshot.snake.head, snapshot.snake.tail, snapshot.dot)
+
+    def _body_cells(self) -> Iterable[int]:
+        if self._cells_snapshot is not self._snapshot:
+            self._cells_snapshot = self._snapshot
+            self._cells = self._snapshot.cells()
+        return self._cells
+
+    def _is_occupied(self, cell: int) -> bool:
+        self._advance_occupied()
+        return cell in self._occupied
+
+    def _advance_occupied(self) -> None:
+        snapshot, previous = self._snapshot, self._occupied_snapshot
+        if snapshot is previous:
+            return
+        self._occupied_snapshot = snapshot
+        snake = snapshot.snake
+        if previous is not None:
+            before = previous.snake
+            if (snapshot.ticks, snake.start, snake.end) == (previous.ticks, before.start, before.end):
+                return
+            if snapshot.ticks == previous.ticks + 1 and snake.end == before.end + 1:
+                if snake.start != before.start:
+                    self._occupied.discard(before.tail)
+                self._occupied.add(snake.head)
+                return
+        self._occupied = set(self._body_cells())
+
+    def _board(self) -> Tuple[int, int, int]:
+        snapshot = self._snapshot
+        return snapshot.cols, snapshot.rows, snapshot.cell_size
+
+    def _interpolation(self) -> Optional[Tuple[int, int, float]]:
+        snapshot = self._snapshot
+        if snapshot.previous_cells is None or snapshot.state != "RUNNING":
+            return None
+        alpha = min((time.perf_counter() - snapshot.tick_time) * self.tick_rate, 1.0)
+        return (*snapshot.previous_cells, alpha)
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        """
+        Sends key presses to the simulation thread.
+        Overrides the keyPressEvent method from QMainWindow.
+        """
+        if event.key() == Qt.Key.Key_Space:
+            self.simulation.send(PAUSE)
+        elif event.key() == Qt.Key.Key_R:
+            self.simulation.send(RESTART)
+        elif event.key() in self.KEY_DIRECTIONS:
+            self.simulation.send(self.KEY_DIRECTIONS[event.key()])
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """
+        Stops the simulation thread when the window closes.
+        Overrides the closeEvent method from QMainWindow.
+        """
+        self.simulation.stop()
+        super().closeEvent(event)
+
+class WorldGameWindow(SnakeGameWindow):
+    """
+    A window onto a `WorldGame`, whose view follows the snake's head.
+
+    Since the view scrolls with every tick, each tick repaints the whole window,
+    but only the chunks inside the viewport are read, so a frame costs the same
+    however large the explored world has become.
+    """
+
+    def __init__(self, tick_rate: float = 10.0, frame_rate: float = 60.0,
+                 game: Optional[WorldGame] = None) -> None:
+        super().__init__(tick_rate, frame_rate, game if game is not None else WorldGame())
+
+    def _update_game(self) -> None:
+        if self.loop.advance():
+            self.update()
+
+    def _tracked_state(self) -> Tuple[str, int, Tuple[int, ...]]:
+        snake = self.game.snake
+        return self.game.state, self.game.score, (snake.head, snake.cell_at(-1))
+
+    def _interpolation(self) -> Optional[Tuple[int, int, float]]:
+        return None
+
+    def paintEvent(self, event) -> None:
+        """
+        Handle paint events to draw the part of the world inside the viewport.
+        Overrides the paintEvent method from QMainWindow.
+        """
+        painter = QPainter(self)
+        self._draw_background(painter)
+        left, top, cols, rows = self.game.viewport()
+        occupied, food = self.game.snake.grid.visible(left, top, cols, rows)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for cells, color in ((occupied, QColor(0, 255, 0)), (food, QColor(255, 0, 0))):
+            if cells:
+                painter.setBrush(color)
+                painter.drawRects(self._viewport_rects(cells, left, top))
+        self._draw_score(painter)
+        self._draw_game_state_messages(painter)
+
+    def _viewport_rects(self, cells: Iterable[int], left: int, top: int) -> List[QRect]:
+        grid = self.game.snake.grid
+        cell_size = self.game.cell_size
+        size = cell_size - 1
+        rects = []
+        for cell in cells:
+            x, y = grid.to_coordinates(cell)
+            rects.append(QRect((x - left) * cell_size, (y - top) * cell_size, size, size))
+        return rects
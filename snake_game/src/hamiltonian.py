@@ -0,0 +1,210 @@
+from typing import Dict, List, Optional, Tuple
+import os
+
+import numpy as np
+
+from .game import Game
+from .snake import Direction
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "snake_game")
+
+SHORTCUT_BUFFER = 3
+
+def build_cycle(cols: int, rows: int) -> np.ndarray:
+    """
+    Builds a Hamiltonian cycle over a grid of cells.
+
+    The cycle runs along the top row, zigzags through every other column row by
+    row and returns up the first column. When the number of rows is odd the same
+    walk is taken over the columns instead.
+
+    Args:
+        cols (int): The number of columns.
+        rows (int): The number of rows.
+
+    Returns:
+        np.ndarray: A (2, cols * rows) int32 table. Row 0 lists the cells in cycle
+        order and row 1 holds the position of each cell in the cycle.
+
+    Raises:
+        ValueError: If the grid has no Hamiltonian cycle, which is when either side
+            is shorter than 2 or both sides are odd.
+    """
+    if cols < 2 or rows < 2 or (cols % 2 and rows % 2):
+        raise ValueError(f"A {cols}x{rows} grid has no Hamiltonian cycle")
+    cells = np.arange(cols * rows, dtype=np.int32).reshape(rows, cols)
+    if rows % 2:
+        cells = cells.T
+    zigzag = cells[1:, 1:].copy()
+    zigzag[0::2] = zigzag[0::2, ::-1]
+
+    table = np.empty((2, cols * rows), dtype=np.int32)
+    table[0] = np.concatenate((cells[0], zigzag.ravel(), cells[:0:-1, 0]))
+    table[1][table[0]] = np.arange(cols * rows, dtype=np.int32)
+    return table
+
+def load_cycle(cols: int, rows: int, cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Loads the Hamiltonian cycle of a grid from the disk cache, building it on first use.
+
+    Each grid shape is stored once as `cycle_<cols>x<rows>.npy` and memory-mapped
+    read-only, so processes playing on the same board share one copy of it. The
+    file is written under a temporary name and renamed into place, so processes
+    racing to build it never see a partial file. A file of the wrong shape is rebuilt.
+
+    Args:
+        cols (int): The number of columns.
+        rows (int): The number of rows.
+        cache_dir (Optional[str]): The cache directory. Defaults to `DEFAULT_CACHE_DIR`.
+
+    Returns:
+        np.ndarray: The table described in `build_cycle`, memory-mapped.
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    path = os.path.join(cache_dir, f"cycle_{cols}x{rows}.npy")
+    try:
+        table = np.load(path, mmap_mode="r")
+        if table.shape == (2, cols * rows):
+            return table
+    except (OSError, ValueError):
+        pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as file:
+        np.save(file, build_cycle(cols, rows))
+    os.replace(partial, path)
+    return np.load(path, mmap_mode="r")
+
+class HamiltonianPlanner:
+    """
+    A bot that fills the board by following a Hamiltonian cycle, cutting corners when it is safe.
+
+    As long as the snake's body lies in cycle order from tail to head, the head can
+    jump ahead along the cycle without cutting the snake off: any neighbor that is
+    further along the cycle than the next cell, but not past the dot and well
+    short of the tail, is a safe shortcut. Shortcuts stop once the snake covers
+    half of the board, from where it follows the cycle exactly and cannot lose.
+
+    A snake that starts out of cycle order is first steered onto the cycle. Every
+    later tick does a constant amount of work: a few lookups in the cycle table,
+    which comes from `load_cycle`.
+
+    A planner is a `Policy`: call it with the game before each tick, or pass it
+    to `run_episode`.
+
+    Attributes:
+        cache_dir (Optional[str]): Where cycles are cached. Defaults to `DEFAULT_CACHE_DIR`.
+        shortcuts (bool): Whether to take shortcuts or follow the cycle exactly.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, shortcuts: bool = True) -> None:
+        self.cache_dir = cache_dir
+        self.shortcuts = shortcuts
+        self._geometry: Tuple[int, int] = (0, 0)
+        self._cycle = self._order = np.empty(0, dtype=np.int32)
+        self._directions: Dict[int, Direction] = {}
+        self._ticks = -1
+        self._aligning = 0
+
+    def __call__(self, game: Game) -> Optional[Direction]:
+        snake = game.snake
+        grid = snake.grid
+        if self._geometry != (grid.cols, grid.rows):
+            self._prepare(grid.cols, grid.rows)
+        if game.ticks <= self._ticks:
+            self._ticks = -1
+        head = snake.head
+        if self._ticks < 0:
+            step = self._align(game)
+        elif self._aligning:
+            self._aligning -= 1
+            if not self._aligning and not self._is_ordered(list(snake.cells())):
+                self._aligning = 1
+            step = self._next(head)
+        elif self.shortcuts:
+            step = self._shortcut(game)
+        else:
+            step = self._next(head)
+        self._ticks = game.ticks
+        return self._directions.get(step - head)
+
+    def _prepare(self, cols: int, rows: int) -> None:
+        self._geometry = (cols, rows)
+        table = load_cycle(cols, rows, self.cache_dir)
+        self._cycle, self._order = table[0], table[1]
+        self._directions = {-cols: "UP", cols: "DOWN", -1: "LEFT", 1: "RIGHT"}
+        self._ticks = -1
+
+    def _next(self, cell: int) -> int:
+        return int(self._cycle[(int(self._order[cell]) + 1) % len(self._cycle)])
+
+    def _neighbors(self, cell: int) -> List[int]:
+        cols, rows = self._geometry
+        y, x = divmod(cell, cols)
+        cells = []
+        if y > 0:
+            cells.append(cell - cols)
+        if y < rows - 1:
+            cells.append(cell + cols)
+        if x > 0:
+            cells.append(cell - 1)
+        if x < cols - 1:
+            cells.append(cell + 1)
+        return cells
+
+    def _is_ordered(self, body: List[int]) -> bool:
+        order, size = self._order, len(self._order)
+        tail = int(order[body[-1]])
+        positions = [(int(order[cell]) - tail) % size for cell in body]
+        return all(ahead > behind for ahead, behind in zip(positions, positions[1:]))
+
+    def _align(self, game: Game) -> int:
+        # Pick a first step from which walking the cycle for a body length never
+        # runs into a part of the body that has not moved away yet.
+        snake = game.snake
+        body = list(snake.cells())
+        head = body[0]
+        if self._is_ordered(body):
+            self._aligning = 0
+            return self._next(head) if not self.shortcuts else self._shortcut(game)
+        self._aligning = len(body)
+        index = {cell: position for position, cell in enumerate(body)}
+        candidates = [cell for cell in self._neighbors(head) if snake.grid.is_free(cell)]
+        for start in candidates:
+            cell = start
+            for tick in range(1, len(body) + 1):
+                position = index.get(cell)
+                if position is not None and position < len(body) - tick:
+                    break
+                cell = self._next(cell)
+            else:
+                return start
+        return candidates[0] if candidates else self._next(head)
+
+    def _shortcut(self, game: Game) -> int:
+        snake = game.snake
+        order, size = self._order, len(self._order)
+        head = snake.head
+        position = int(order[head])
+        to_tail = (int(order[snake.cell_at(-1)]) - position) % size
+        to_dot = (int(order[game.dot.cell]) - position) % size
+        growth = int(snake.growing)
+        empty = size - len(snake) - growth - 1
+
+        allowed = to_tail - growth - SHORTCUT_BUFFER
+        if empty < size // 2:
+            allowed = 0
+        elif to_dot < to_tail:
+            # Eating on the way grows the snake, and the next dot may come soon after.
+            allowed -= 1
+            if (to_tail - to_dot) * 4 > empty:
+                allowed -= 10
+        allowed = min(allowed, to_dot)
+
+        best, best_distance = self._next(head), 1
+        for cell in self._neighbors(head):
+            distance = (int(order[cell]) - position) % size
+            if best_distance < distance <= allowed and snake.grid.is_free(cell):
+                best, best_distance = cell, distance
+        return best
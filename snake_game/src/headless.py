@@ -0,0 +1,131 @@
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+import signal
+import threading
+import time
+
+from .game import Game
+from .snake import Direction
+
+Policy = Callable[[Game], Optional[Direction]]
+
+TIMEOUT = "TIMEOUT"
+OVER_BUDGET = "OVER_BUDGET"
+
+# Not an Exception, like KeyboardInterrupt, so a policy catching Exception cannot swallow it.
+class _OverBudget(BaseException):
+    pass
+
+def _raise_over_budget(signum: int, frame: object) -> None:
+    raise _OverBudget
+
+def _can_interrupt() -> bool:
+    # Signal handlers only run on the main thread, and interval timers are Unix only.
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+class EpisodeStats(NamedTuple):
+    """
+    The outcome of a single headless game.
+
+    Attributes:
+        seed (Optional[int]): The seed the game was played with.
+        score (int): The final score.
+        steps (int): The number of ticks the game ran for.
+        outcome (str): "WON", "GAME_OVER", "TIMEOUT" if the step limit was hit first,
+            or "OVER_BUDGET" if the policy took longer than its move budget.
+        wall_time (float): The time spent playing the game, in seconds.
+    """
+    seed: Optional[int]
+    score: int
+    steps: int
+    outcome: str
+    wall_time: float
+
+def run_episode(policy: Optional[Policy] = None, seed: Optional[int] = None, width: int = 600,
+                height: int = 400, cell_size: int = 20, win_score: int = 20,
+                max_steps: int = 100_000, move_budget: Optional[float] = None) -> EpisodeStats:
+    """
+    Plays one game to the end without Qt, ticking it as fast as the CPU allows.
+
+    Args:
+        policy (Optional[Policy]): Called with the game before every tick. A returned
+            direction is passed to `Game.change_direction`; None keeps the current one.
+            Without a policy the snake goes straight.
+        seed (Optional[int]): The seed for dot placement.
+        width (int): The width of the board.
+        height (int): The height of the board.
+        cell_size (int): The size of each cell.
+        win_score (int): The score needed to win.
+        max_steps (int): The number of ticks after which the game is abandoned.
+        move_budget (Optional[float]): The longest a single policy call may take, in seconds.
+            A slower call forfeits the game. On the main thread of a Unix process, such
+            as a pool worker, a call that runs over is interrupted by a timer signal;
+            elsewhere it is only caught once it returns.
+
+    Returns:
+        EpisodeStats: The statistics of the game.
+    """
+    game = Game(width, height, cell_size, win_score, seed)
+    game.start()
+    update = game.update
+    change_direction = game.change_direction
+    steps = 0
+
+    outcome = None
+    start_time = time.perf_counter()
+    if policy is None:
+        while game.state == "RUNNING" and steps < max_steps:
+            update()
+            steps += 1
+    elif move_budget is None:
+        while game.state == "RUNNING" and steps < max_steps:
+            direction = policy(game)
+            if direction is not None:
+                change_direction(direction)
+            update()
+            steps += 1
+    else:
+        clock = time.perf_counter
+        interrupt = _can_interrupt()
+        if interrupt:
+            previous_handler = signal.signal(signal.SIGALRM, _raise_over_budget)
+        try:
+            while game.state == "RUNNING" and steps < max_steps:
+                move_start = clock()
+                if interrupt:
+                    signal.setitimer(signal.ITIMER_REAL, move_budget)
+                direction = policy(game)
+                if interrupt:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                if clock() - move_start > move_budget:
+                    outcome = OVER_BUDGET
+                    break
+                if direction is not None:
+                    change_direction(direction)
+                update()
+                steps += 1
+        except _OverBudget:
+            outcome = OVER_BUDGET
+        finally:
+            if interrupt:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+    wall_time = time.perf_counter() - start_time
+
+    if outcome is None:
+        outcome = game.state if game.state != "RUNNING" else TIMEOUT
+    return EpisodeStats(seed, game.score, steps, outcome, wall_time)
+
+def run_episodes(policy: Optional[Policy], seeds: Iterable[int], **options) -> Iterator[EpisodeStats]:
+    """
+    Plays one headless game per seed, yielding each result as soon as it finishes.
+
+    Args:
+        policy (Optional[Policy]): The policy steering the snake, see `run_episode`.
+        seeds (Iterable[int]): The seeds to play.
+        **options: Board and limit options forwarded to `run_episode`.
+
+    Yields:
+        EpisodeStats: The statistics of each game, in seed order.
+    """
+    for seed in seeds:
+        yield run_episode(policy, seed, **options)
@@ -0,0 +1,110 @@
+from typing import List, NamedTuple, Optional
+import argparse
+import asyncio
+import random
+import time
+
+from .server import ArenaMirror, raise_open_file_limit, read_message
+
+class LoadTestResult(NamedTuple):
+    """
+    The outcome of a load test.
+
+    Attributes:
+        connections (int): The number of clients that connected.
+        failed (int): The number of clients that could not connect or were dropped.
+        messages (int): The number of messages received across all clients.
+        bytes_received (int): The number of bytes received across all clients.
+        seconds (float): How long the clients listened for.
+        mirror (Optional[ArenaMirror]): The state rebuilt by the first client.
+    """
+    connections: int
+    failed: int
+    messages: int
+    bytes_received: int
+    seconds: float
+    mirror: Optional[ArenaMirror]
+
+async def run_load_test(host: str = "127.0.0.1", port: int = 8765, connections: int = 10_000,
+                        duration: float = 10.0, turn_chance: float = 0.05, seed: int = 0,
+                        connect_batch: int = 500) -> LoadTestResult:
+    """
+    Connects many simulated clients to a `SnakeServer` and measures what they receive.
+
+    Every client reads and counts every message and occasionally turns its snake.
+    The first client also rebuilds the full arena with an `ArenaMirror`, to check
+    that the deltas decode.
+
+    Args:
+        host (str): The server's host.
+        port (int): The server's port.
+        connections (int): The number of clients to simulate.
+        duration (float): How long to listen after connecting, in seconds.
+        turn_chance (float): The chance that a client sends a turn after a message.
+        seed (int): The seed for the turns.
+        connect_batch (int): The number of connections opened at once.
+
+    Returns:
+        LoadTestResult: The totals across all clients.
+    """
+    rng = random.Random(seed)
+    counts = [0, 0, 0]
+    mirror = ArenaMirror()
+    stop = asyncio.Event()
+
+    async def client(index: int, streams) -> None:
+        reader, writer = streams
+        try:
+            while not stop.is_set():
+                message = await read_message(reader)
+                counts[0] += 1
+                counts[1] += len(message) + 4
+                if index == 0:
+                    mirror.apply(message)
+                if rng.random() < turn_chance:
+                    writer.write(bytes([rng.randrange(4)]))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            if not stop.is_set():
+                counts[2] += 1
+        finally:
+            writer.close()
+
+    opened: List = []
+    failed = 0
+    for start in range(0, connections, connect_batch):
+        batch = range(start, min(start + connect_batch, connections))
+        results = await asyncio.gather(*(asyncio.open_connection(host, port) for _ in batch),
+                                       return_exceptions=True)
+        for streams in results:
+            if isinstance(streams, BaseException):
+                failed += 1
+            else:
+                opened.append(streams)
+
+    tasks = [asyncio.create_task(client(index, streams)) for index, streams in enumerate(opened)]
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    stop.set()
+    seconds = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return LoadTestResult(len(opened), failed + counts[2], counts[0], counts[1], seconds,
+                          mirror if opened else None)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test a multiplayer snake server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    raise_open_file_limit()
+    result = asyncio.run(run_load_test(args.host, args.port, args.connections, args.duration))
+    print(f"{result.connections} connected, {result.failed} failed or dropped, "
+          f"{result.messages / result.seconds:.0f} messages/s, "
+          f"{result.bytes_received / result.seconds / 1e6:.2f} MB/s, "
+          f"{result.bytes_received / max(result.messages, 1):.0f} bytes per message")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+from typing import List, Optional
+import random
+
+from .game import Game
+from .grid import Grid
+from .snake import OPPOSITES, Direction, Snake
+
+SEARCH_DIRECTIONS: List[Direction] = ["UP", "DOWN", "LEFT", "RIGHT"]
+
+DEATH = -100.0
+DISCOUNT = 0.95
+
+def zobrist_keys(count: int, seed: int = 0) -> List[int]:
+    """
+    Draws random 64-bit Zobrist keys.
+
+    Args:
+        count (int): The number of keys.
+        seed (int): The seed, so that hashes are reproducible.
+
+    Returns:
+        List[int]: The keys.
+    """
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+class TranspositionTable:
+    """
+    A fixed-size cache of search results, keyed by Zobrist hash.
+
+    Values are only reused at the depth they were searched to, since a deeper
+    search discounts its leaves more and would not compare fairly with its
+    siblings. Each hash maps to one slot, chosen by its low bits. When two positions share
+    a slot the table keeps the one searched deeper, except that an entry left by
+    an earlier search is always replaced, so stale results age out. The table
+    never grows past `size` entries.
+
+    Attributes:
+        size (int): The number of slots, a power of two.
+        hits (int): The number of lookups that found a usable entry.
+        misses (int): The number of lookups that did not.
+        evictions (int): The number of entries overwritten by a different position.
+    """
+
+    __slots__ = ("size", "hits", "misses", "evictions", "_keys", "_depths", "_values",
+                 "_generations", "_generation")
+
+    def __init__(self, size: int = 1 << 16) -> None:
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f"Table size {size} is not a power of two")
+        self.size = size
+        self.hits = self.misses = self.evictions = 0
+        self._keys: List[Optional[int]] = [None] * size
+        self._depths = [0] * size
+        self._values = [0.0] * size
+        self._generations = [0] * size
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return self.size - self._keys.count(None)
+
+    def new_search(self) -> None:
+        """
+        Marks every current entry as left by an earlier search.
+        """
+        self._generation += 1
+
+    def probe(self, key: int, depth: int) -> Optional[float]:
+        """
+        Looks up the value of a position.
+
+        Args:
+            key (int): The position's hash.
+            depth (int): The depth the value is needed for.
+
+        Returns:
+            Optional[float]: The value, if the position was searched to exactly this depth.
+        """
+        slot = key & (self.size - 1)
+        if self._keys[slot] == key and self._depths[slot] == depth:
+            self.hits += 1
+            return self._values[slot]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, value: float) -> None:
+        """
+        Records the value of a position, unless its slot holds a deeper result of this search.
+
+        Args:
+            key (int): The position's hash.
+            depth (int): The depth the position was searched to.
+            value (float): The value found.
+        """
+        slot = key & (self.size - 1)
+        stored = self._keys[slot]
+        if stored is not None and stored != key:
+            if self._generations[slot] == self._generation and self._depths[slot] > depth:
+                return
+            self.evictions += 1
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._values[slot] = value
+        self._generations[slot] = self._generation
+
+class LookaheadAgent:
+    """
+    A bot that picks each move by searching every move sequence a few ticks deep.
+
+    The search walks the real snake with `Snake.make_move` and `Snake.unmake_move`
+    rather than copying the game at every node. Eating a dot is worth 1, dying
+    ends the line with `DEATH`, which outweighs any dots eaten before it, and
+    rewards further ahead are discounted, so nearer dots win. Where the depth runs
+    out, positions are scored by how close the head is to the dot. Where the next
+    dot will appear is unknown, so the search stops chasing dots once one is
+    eaten. Moves that leave the head fewer free cells than the snake is long are
+    only taken when nothing else is left.
+
+    Positions are identified by the snake's incrementally updated Zobrist hash of
+    the occupied cells, mixed with keys for the head, the dot and growth. Values
+    are cached in a `TranspositionTable` that is kept across moves.
+
+    An agent is a `Policy`: call it with the game before each tick, or pass it
+    to `run_episode`.
+
+    Attributes:
+        depth (int): The number of moves searched ahead.
+        table (TranspositionTable): The cache of searched positions.
+        nodes (int): The number of positions searched, for profiling.
+    """
+
+    def __init__(self, depth: int = 6, table_size: int = 1 << 16, seed: int = 0) -> None:
+        self.depth = depth
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+        self._seed = seed
+        self._size = 0
+        self._cell_keys: List[int] = []
+        self._head_keys: List[int] = []
+        self._dot_keys: List[int] = []
+        self._growing_key = 0
+        self._snake: Optional[Snake] = None
+
+    def __call__(self, game: Game) -> Optional[Direction]:
+        snake = game.snake
+        grid = snake.grid
+        if self._size != grid.size:
+            self._prepare(grid.size)
+        if snake is not self._snake:
+            snake.track_zobrist(self._cell_keys)
+            self._snake = snake
+        self.table.new_search()
+
+        best, best_value = None, 3 * DEATH
+        for direction in SEARCH_DIRECTIONS:
+            value = self._child_value(snake, direction, game.dot.cell, self.depth)
+            if value is None:
+                continue
+            if not self._has_room(snake, direction):
+                value += DEATH
+            if value > best_value:
+                best, best_value = direction, value
+        return best
+
+    def _prepare(self, size: int) -> None:
+        keys = zobrist_keys(3 * size + 1, self._seed)
+        self._size = size
+        self._cell_keys = keys[:size]
+        self._head_keys = keys[size:2 * size]
+        self._dot_keys = keys[2 * size:3 * size]
+        self._growing_key = keys[-1]
+        self._snake = None
+
+    def _child_value(self, snake: Snake, direction: Direction, dot: Optional[int],
+                     depth: int) -> Optional[float]:
+        if OPPOSITES[direction] == snake.direction:
+            # The game ignores a reversal, which a snake of two could otherwise make into its tail.
+            return None
+        grid = snake.grid
+        cell = grid.neighbor(snake.head, direction)
+        if cell is None:
+            return None
+        if grid.is_occupied(cell) and (snake.growing or cell != snake.cell_at(-1)):
+            return None
+        if depth == 1:
+            # Leaves only depend on the head, so they are scored without moving.
+            return 1.0 if cell == dot else DISCOUNT * self._evaluate(grid, cell, dot)
+        record = snake.make_move(direction)
+        if cell == dot:
+            snake.grow()
+            value = 1.0 + DISCOUNT * self._search(snake, None, depth - 1)
+        else:
+            value = DISCOUNT * self._search(snake, dot, depth - 1)
+        snake.unmake_move(record)
+        return value
+
+    def _search(self, snake: Snake, dot: Optional[int], depth: int) -> float:
+        self.nodes += 1
+        key = snake.zobrist ^ self._head_keys[snake.head]
+        if dot is not None:
+            key ^= self._dot_keys[dot]
+        if snake.growing:
+            key ^= self._growing_key
+        value = self.table.probe(key, depth)
+        if value is not None:
+            return value
+
+        value = DEATH
+        for direction in SEARCH_DIRECTIONS:
+            child = self._child_value(snake, direction, dot, depth)
+            if child is not None and child > value:
+                value = child
+        self.table.store(key, depth, value)
+        return value
+
+    def _has_room(self, snake: Snake, direction: Direction) -> bool:
+        # Beyond the search horizon, a move is only safe if it leaves the head
+        # at least a body length of free cells to run into.
+        record = snake.make_move(direction)
+        grid = snake.grid
+        needed = len(snake)
+        seen = {snake.head}
+        frontier = [snake.head]
+        while frontier and len(seen) <= needed:
+            cell = frontier.pop()
+            for step in SEARCH_DIRECTIONS:
+                neighbor = grid.neighbor(cell, step)
+                if neighbor is not None and neighbor not in seen and grid.is_free(neighbor):
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+        snake.unmake_move(record)
+        return len(seen) > needed
+
+    def _evaluate(self, grid: Grid, head: int, dot: Optional[int]) -> float:
+        if dot is None:
+            return 0.0
+        head_y, head_x = divmod(head, grid.cols)
+        dot_y, dot_x = divmod(dot, grid.cols)
+        return -0.5 * (abs(head_y - dot_y) + abs(head_x - dot_x)) / (grid.cols + grid.rows)
@@ -0,0 +1,96 @@
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+import time
+
+from .game import Game
+from .snake import OPPOSITES, Direction
+
+class FixedTimestepLoop:
+    """
+    Drives a game at a fixed tick rate, independent of how often it is rendered.
+
+    Elapsed time is accumulated and consumed in whole ticks, so a late or early
+    frame neither slows down nor speeds up the simulation. Direction changes are
+    queued and applied one per tick, so two quick key presses both take effect.
+    `alpha` tells the renderer how far it is between the previous tick and the next.
+
+    Attributes:
+        game (Game): The game being driven.
+        tick_rate (float): The number of game ticks per second.
+        max_ticks_per_advance (int): The most ticks run by one `advance` call, so a
+            long stall does not freeze the window while the game catches up.
+        previous_cells (Optional[Tuple[int, int]]): The head and tail cells before the
+            last tick, or None when there is nothing to interpolate from.
+    """
+
+    def __init__(self, game: Game, tick_rate: float = 10.0, max_ticks_per_advance: int = 5,
+                 max_queued_directions: int = 3, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.game = game
+        self.tick_rate = tick_rate
+        self.max_ticks_per_advance = max_ticks_per_advance
+        self.previous_cells: Optional[Tuple[int, int]] = None
+        self._clock = clock
+        self._queue: Deque[Direction] = deque(maxlen=max_queued_directions)
+        self._accumulator = 0.0
+        self._last_time = clock()
+
+    @property
+    def alpha(self) -> float:
+        """
+        The fraction of a tick that has elapsed since the last tick, between 0 and 1.
+        """
+        return min(self._accumulator * self.tick_rate, 1.0)
+
+    def queue_direction(self, direction: Direction) -> None:
+        """
+        Queues a direction change for an upcoming tick. Input is ignored unless the
+        game is running, and repeats and reversals of the last queued direction are dropped.
+
+        Args:
+            direction (Direction): The new direction.
+        """
+        if self.game.state != "RUNNING":
+            return
+        last = self._queue[-1] if self._queue else self.game.snake.direction
+        if direction != last and direction != OPPOSITES[last]:
+            self._queue.append(direction)
+
+    def reset(self) -> None:
+        """
+        Drops queued input and elapsed time, for example after the game is restarted.
+        """
+        self._queue.clear()
+        self._accumulator = 0.0
+        self._last_time = self._clock()
+        self.previous_cells = None
+
+    def advance(self) -> int:
+        """
+        Runs as many ticks as the time elapsed since the last call allows.
+
+        Returns:
+            int: The number of ticks run.
+        """
+        now = self._clock()
+        elapsed, self._last_time = now - self._last_time, now
+        if self.game.state != "RUNNING":
+            self._accumulator = 0.0
+            self.previous_cells = None
+            return 0
+
+        tick_length = 1.0 / self.tick_rate
+        self._accumulator += elapsed
+        ticks = 0
+        while self._accumulator >= tick_length and ticks < self.max_ticks_per_advance:
+            if self._queue:
+                self.game.change_direction(self._queue.popleft())
+            snake = self.game.snake
+            self.previous_cells = (snake.head, snake.cell_at(-1))
+            self.game.update()
+            self._accumulator -= tick_length
+            ticks += 1
+        if ticks == self.max_ticks_per_advance:
+            self._accumulator %= tick_length
+        if self.game.state != "RUNNING":
+            self.previous_cells = None
+        return ticks
@@ -1,10 +1,15 @@
 import sys
 from PySide6.QtWidgets import QApplication
-from .gui import SnakeGameWindow
+from .gui import SnakeGameWindow, ThreadedSnakeGameWindow, WorldGameWindow
 
 def main():
     app = QApplication(sys.argv)
-    window = SnakeGameWindow()
+    if "--world" in sys.argv[1:]:
+        window = WorldGameWindow()
+    elif "--threaded" in sys.argv[1:]:
+        window = ThreadedSnakeGameWindow()
+    else:
+        window = SnakeGameWindow()
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,46 @@
+import numpy as np
+from PySide6.QtGui import QColor, QImage, QPainter
+
+from .game import Game
+from .gui import GamePainter
+
+class OffscreenRenderer(GamePainter):
+    """
+    Renders a game into a `QImage` with the game window's drawing code, without a window.
+
+    `render` returns the image's own pixel buffer as a NumPy array of shape
+    (height, width, 4) in RGBX order, without copying it, so each render overwrites
+    the previous frame. Copy a frame to keep it, or pass it to `FrameExporter.append`.
+    Frames drawn without text match `FrameRasterizer` pixel for pixel. Drawing
+    text needs a `QGuiApplication`.
+
+    Attributes:
+        game (Game): The game to render.
+        text (bool): Whether to draw the score and the state messages.
+        image (QImage): The image frames are drawn into.
+    """
+
+    def __init__(self, game: Game, text: bool = False) -> None:
+        self.game = game
+        self.text = text
+        self.image = QImage(game.width, game.height, QImage.Format.Format_RGBX8888)
+        rows = np.ndarray((game.height, self.image.bytesPerLine() // 4, 4), dtype=np.uint8,
+                          buffer=self.image.bits())
+        self._pixels = rows[:, :game.width]
+
+    def render(self) -> np.ndarray:
+        """
+        Draws the current state of the game.
+
+        Returns:
+            np.ndarray: A view of the image's pixels.
+        """
+        self.image.fill(QColor(0, 0, 0))
+        painter = QPainter(self.image)
+        self._draw_snake(painter)
+        self._draw_dot(painter)
+        if self.text:
+            self._draw_score(painter)
+            self._draw_game_state_messages(painter)
+        painter.end()
+        return self._pixels
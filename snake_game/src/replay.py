@@ -0,0 +1,447 @@
+from bisect import bisect_right
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Union
+import mmap
+import os
+
+import numpy as np
+
+from .game import Game
+from .snake import Direction
+from .varint import read_varint, write_varint
+
+MAGIC = b"SNKR"
+VERSION = 1
+
+START = 1
+DIRECTION = 2
+DOT = 3
+KEYFRAME = 4
+
+DIRECTIONS: Tuple[Direction, ...] = ("UP", "DOWN", "LEFT", "RIGHT")
+STATES = ("RUNNING", "PAUSED", "GAME_OVER", "WON")
+
+BODY_AS_STEPS = 0
+BODY_AS_CELLS = 1
+
+def encode_body(payload: bytearray, cells: List[int], cols: int) -> None:
+    """
+    Appends a snake's body to a payload, as 2-bit steps from the head when every
+    segment touches the next and as varint cells otherwise.
+
+    Args:
+        payload (bytearray): The payload to append to.
+        cells (List[int]): The packed cells of the body, head first.
+        cols (int): The number of columns of the board.
+    """
+    deltas = {-cols: 0, cols: 1, -1: 2, 1: 3}
+    steps = [deltas.get(cell - previous) for previous, cell in zip(cells, cells[1:])]
+    write_varint(payload, len(cells))
+    if None in steps or not cells:
+        payload.append(BODY_AS_CELLS)
+        for cell in cells:
+            write_varint(payload, cell)
+        return
+    payload.append(BODY_AS_STEPS)
+    write_varint(payload, cells[0])
+    for start in range(0, len(steps), 4):
+        packed = 0
+        for shift, step in enumerate(steps[start:start + 4]):
+            packed |= step << (2 * shift)
+        payload.append(packed)
+
+def decode_body(data: Union[bytes, bytearray, memoryview, mmap.mmap], offset: int,
+                cols: int) -> Tuple[List[int], int]:
+    """
+    Reads a body written by `encode_body`.
+
+    Args:
+        data (Union[bytes, bytearray, memoryview, mmap.mmap]): The data to read from.
+        offset (int): The offset of the body.
+        cols (int): The number of columns of the board.
+
+    Returns:
+        Tuple[List[int], int]: The packed cells, head first, and the offset just past the body.
+    """
+    length, offset = read_varint(data, offset)
+    encoding = data[offset]
+    offset += 1
+    cells = []
+    if encoding == BODY_AS_CELLS:
+        for _ in range(length):
+            cell, offset = read_varint(data, offset)
+            cells.append(cell)
+        return cells, offset
+    cell, offset = read_varint(data, offset)
+    cells.append(cell)
+    deltas = (-cols, cols, -1, 1)
+    for index in range(length - 1):
+        step = (data[offset + index // 4] >> (2 * (index % 4))) & 3
+        cell += deltas[step]
+        cells.append(cell)
+    return cells, offset + (length + 2) // 4
+
+class ReplayRecorder:
+    """
+    Records games into an append-only binary stream.
+
+    Assign a recorder to `Game.recorder` and every start, direction change, dot
+    spawn and, every `keyframe_interval` ticks, a keyframe of the full state are
+    appended. The stream starts with a short header and then holds one record per
+    event: a type byte, the tick delta since the previous record as a varint, and
+    a payload. Keyframes are length-prefixed and store the body as 2-bit steps
+    from the head, so a 100-segment snake takes about 30 bytes.
+
+    Records are buffered and written out at each keyframe, or sooner once the
+    buffer holds `buffer_size` bytes, so a crash loses at most the ticks since
+    then rather than the whole game.
+
+    Attributes:
+        keyframe_interval (int): The number of ticks between keyframes.
+        buffer_size (int): The number of buffered bytes that triggers a write between keyframes.
+    """
+
+    def __init__(self, target: Union[str, os.PathLike, BinaryIO], keyframe_interval: int = 256,
+                 buffer_size: int = 64 * 1024) -> None:
+        if isinstance(target, (str, os.PathLike)):
+            self._file: BinaryIO = open(target, "ab")
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self.keyframe_interval = keyframe_interval
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._last_tick = 0
+        if self._file.tell() == 0:
+            self._buffer += MAGIC + bytes([VERSION])
+
+    def __enter__(self) -> "ReplayRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record_start(self, game: Game) -> None:
+        """
+        Records the start of a game and a keyframe of its initial state.
+
+        Args:
+            game (Game): The game that started.
+        """
+        self._last_tick = 0
+        self._begin(START, 0)
+        self._buffer.append(game.seed is not None)
+        write_varint(self._buffer, (game.seed or 0) & 0xFFFFFFFFFFFFFFFF)
+        for value in (game.width, game.height, game.cell_size, game.win_score):
+            write_varint(self._buffer, value)
+        self._record_keyframe(game)
+        self.flush()
+
+    def record_direction(self, game: Game) -> None:
+        """
+        Records a change of the snake's direction before the next tick.
+
+        Args:
+            game (Game): The game whose snake turned.
+        """
+        self._begin(DIRECTION, game.ticks)
+        self._buffer.append(DIRECTIONS.index(game.snake.direction))
+
+    def record_dot(self, game: Game) -> None:
+        """
+        Records the cell a dot spawned on.
+
+        Args:
+            game (Game): The game whose dot moved.
+        """
+        self._begin(DOT, game.ticks)
+        write_varint(self._buffer, game.dot.cell)
+
+    def record_tick(self, game: Game) -> None:
+        """
+        Records a keyframe if one is due and flushes the stream after it, or once
+        the buffer is full. The final state of a game is always recorded as a keyframe.
+
+        Args:
+            game (Game): The game that ticked.
+        """
+        if game.state in ("GAME_OVER", "WON") or game.ticks % self.keyframe_interval == 0:
+            self._record_keyframe(game)
+            self.flush()
+        elif len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes buffered records to the stream.
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Flushes the recorder and closes the file it opened.
+        """
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def _begin(self, record_type: int, tick: int) -> None:
+        self._buffer.append(record_type)
+        write_varint(self._buffer, tick - self._last_tick)
+        self._last_tick = tick
+
+    def _record_keyframe(self, game: Game) -> None:
+        payload = bytearray()
+        for value in (game.ticks, game.score, game.dot.cell):
+            write_varint(payload, value)
+        payload.append(STATES.index(game.state))
+        payload.append(DIRECTIONS.index(game.snake.direction))
+        payload.append(game.snake.growing)
+        encode_body(payload, list(game.snake.cells()), game.snake.grid.cols)
+
+        self._begin(KEYFRAME, game.ticks)
+        write_varint(self._buffer, len(payload))
+        self._buffer += payload
+
+class RecordedGame(NamedTuple):
+    """
+    The index of one game in a replay file.
+
+    Attributes:
+        seed (Optional[int]): The seed the game was played with.
+        width (int): The width of the board.
+        height (int): The height of the board.
+        cell_size (int): The size of each cell.
+        win_score (int): The score needed to win.
+        keyframe_ticks (List[int]): The tick of each keyframe, ascending.
+        keyframe_offsets (List[int]): The file offset of each keyframe record.
+        end_offset (int): The offset just past the game's last record.
+        last_tick (int): The last tick recorded for the game.
+    """
+    seed: Optional[int]
+    width: int
+    height: int
+    cell_size: int
+    win_score: int
+    keyframe_ticks: List[int]
+    keyframe_offsets: List[int]
+    end_offset: int
+    last_tick: int
+
+class TickChunk(NamedTuple):
+    """
+    A run of consecutive ticks of a recorded game, as yielded by `ReplayReader.history`.
+
+    Each array holds one entry per tick, taken after the tick and any direction
+    change or dot spawn recorded with it.
+
+    Attributes:
+        ticks (np.ndarray): The tick numbers.
+        heads (np.ndarray): The packed cell of the snake's head.
+        dots (np.ndarray): The packed cell of the dot.
+        scores (np.ndarray): The score.
+        state (str): The state of the game after the chunk's last tick.
+    """
+    ticks: np.ndarray
+    heads: np.ndarray
+    dots: np.ndarray
+    scores: np.ndarray
+    state: str
+
+class ReplayReader:
+    """
+    Reads a replay file written by `ReplayRecorder`.
+
+    The file is memory-mapped and indexed once when opened by skipping from record to
+    record. Seeking to a tick restores the nearest earlier keyframe and replays only
+    the ticks after it, placing dots where they were recorded. A file cut off by a
+    crash is read up to its last complete record.
+
+    Attributes:
+        games (List[RecordedGame]): The games in the file, in the order they were played.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(MAGIC) + 1] != MAGIC + bytes([VERSION]):
+            raise ValueError(f"{path} is not a version {VERSION} snake replay")
+        self.games: List[RecordedGame] = self._index()
+
+    def __enter__(self) -> "ReplayReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the file.
+        """
+        self._data.close()
+        self._file.close()
+
+    def seek(self, tick: int, game: int = 0) -> Game:
+        """
+        Rebuilds a recorded game as it was after a number of ticks, including any
+        direction change made before the following tick.
+
+        Args:
+            tick (int): The tick to seek to. Ticks past the end of the recording give its last state.
+            game (int): The index of the game in the file.
+
+        Returns:
+            Game: A game in the recorded state, which can be inspected or played on.
+        """
+        recorded = self.games[game]
+        keyframe = bisect_right(recorded.keyframe_ticks, tick) - 1
+        restored, offset = self._restore_keyframe(recorded, recorded.keyframe_offsets[keyframe])
+        current = restored.ticks
+        target = min(tick, recorded.last_tick)
+
+        for record_type, record_tick, value in self._records(offset, recorded.end_offset, current):
+            while current < record_tick and current < target:
+                restored.update()
+                current += 1
+            if record_tick > target:
+                break
+            if record_type == DIRECTION and record_tick == current:
+                restored.snake.change_direction(DIRECTIONS[value])
+            elif record_type == DOT and record_tick == current:
+                restored.dot.cell = value
+        while current < target:
+            restored.update()
+            current += 1
+        return restored
+
+    def history(self, game: int = 0, chunk_size: int = 4096) -> Iterator[TickChunk]:
+        """
+        Replays a recorded game from its start, yielding its ticks in chunks of a fixed size,
+        so that a game of any length is read in constant memory.
+
+        Args:
+            game (int): The index of the game in the file.
+            chunk_size (int): The number of ticks per chunk. The last chunk may be shorter.
+
+        Yields:
+            TickChunk: The next ticks of the game, starting with its initial state at tick 0.
+        """
+        buffers = [np.empty(chunk_size, dtype=np.int64) for _ in range(4)]
+        filled = 0
+        state = "RUNNING"
+        for restored in self._replay(self.games[game]):
+            if filled == chunk_size:
+                yield TickChunk(*buffers, state)
+                buffers = [np.empty(chunk_size, dtype=np.int64) for _ in range(4)]
+                filled = 0
+            for buffer, value in zip(buffers, (restored.ticks, restored.snake.head, restored.dot.cell,
+                                               restored.score)):
+                buffer[filled] = value
+            filled += 1
+            state = restored.state
+        yield TickChunk(*(buffer[:filled] for buffer in buffers), state)
+
+    def _replay(self, recorded: RecordedGame) -> Iterator[Game]:
+        # Yields the same game after every tick, once the records of that tick are applied.
+        restored, offset = self._restore_keyframe(recorded, recorded.keyframe_offsets[0])
+        current = restored.ticks
+        for record_type, record_tick, value in self._records(offset, recorded.end_offset, current):
+            while current < record_tick:
+                yield restored
+                restored.update()
+                current += 1
+            if record_type == DIRECTION:
+                restored.snake.change_direction(DIRECTIONS[value])
+            elif record_type == DOT:
+                restored.dot.cell = value
+        yield restored
+
+    def _index(self) -> List[RecordedGame]:
+        # A file cut off in the middle of a record, as a crash leaves it, ends at its last complete record.
+        games: List[RecordedGame] = []
+        offset, end = len(MAGIC) + 1, len(self._data)
+        header: Optional[Tuple] = None
+        ticks: List[int] = []
+        offsets: List[int] = []
+        tick = 0
+        while offset < end:
+            record_offset = offset
+            record_type = self._data[offset]
+            try:
+                delta, offset = read_varint(self._data, offset + 1)
+                if record_type == START:
+                    has_seed = self._data[offset]
+                    seed, offset = read_varint(self._data, offset + 1)
+                    geometry = []
+                    for _ in range(4):
+                        value, offset = read_varint(self._data, offset)
+                        geometry.append(value)
+                elif record_type == DIRECTION:
+                    offset += 1
+                elif record_type == DOT:
+                    _, offset = read_varint(self._data, offset)
+                elif record_type == KEYFRAME:
+                    length, offset = read_varint(self._data, offset)
+                    offset += length
+                else:
+                    raise ValueError(f"Unknown replay record type {record_type} at offset {record_offset}")
+            except IndexError:
+                offset = end + 1
+            if offset > end:
+                offset = record_offset
+                break
+
+            tick += delta
+            if record_type == START:
+                if ticks:
+                    games.append(RecordedGame(*header, ticks, offsets, record_offset, tick))
+                tick, ticks, offsets = 0, [], []
+                if seed >= 1 << 63:
+                    seed -= 1 << 64
+                header = (seed if has_seed else None, *geometry)
+            elif record_type == KEYFRAME:
+                ticks.append(tick)
+                offsets.append(record_offset)
+        if ticks:
+            games.append(RecordedGame(*header, ticks, offsets, offset, tick))
+        return games
+
+    def _records(self, offset: int, end: int, tick: int) -> Iterator[Tuple[int, int, int]]:
+        while offset < end:
+            record_type = self._data[offset]
+            delta, offset = read_varint(self._data, offset + 1)
+            tick += delta
+            if record_type == DIRECTION:
+                value = self._data[offset]
+                offset += 1
+            elif record_type == DOT:
+                value, offset = read_varint(self._data, offset)
+            else:
+                length, offset = read_varint(self._data, offset)
+                offset += length
+                value = 0
+            yield record_type, tick, value
+
+    def _restore_keyframe(self, recorded: RecordedGame, offset: int) -> Tuple[Game, int]:
+        _, offset = read_varint(self._data, offset + 1)
+        length, offset = read_varint(self._data, offset)
+        end = offset + length
+        ticks, offset = read_varint(self._data, offset)
+        score, offset = read_varint(self._data, offset)
+        dot, offset = read_varint(self._data, offset)
+        state, direction, growing = self._data[offset:offset + 3]
+        offset += 3
+
+        game = Game(recorded.width, recorded.height, recorded.cell_size, recorded.win_score, recorded.seed)
+        game.ticks = ticks
+        game.score = score
+        game.dot.cell = dot
+        game.state = STATES[state]
+        game.snake.direction = DIRECTIONS[direction]
+        game.snake.growing = bool(growing)
+        game.snake.set_cells(decode_body(self._data, offset, game.snake.grid.cols)[0])
+        return game, end
+
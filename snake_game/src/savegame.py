@@ -0,0 +1,134 @@
+from typing import Optional, Tuple, Union
+import os
+import struct
+
+from .game import GRID_BACKENDS, Game
+from .replay import DIRECTIONS, STATES, decode_body, encode_body
+from .varint import read_varint, write_varint
+
+MAGIC = b"SNKS"
+VERSION = 1
+
+BACKENDS = tuple(GRID_BACKENDS)
+
+RNG_WORDS = 625
+
+def dump_game(game: Game) -> bytes:
+    """
+    Serializes a game, typically a paused one, so that it can be resumed later.
+
+    The board, score, dot, snake and the state of the random generator are kept,
+    so a resumed seeded game places the same dots as the original would have.
+    Integers are varints and the body is stored as in replay keyframes, so the
+    whole game takes a few dozen bytes plus about 2.5 KB for the generator. The
+    game's grid sorts its free cells before the next dot, as a loaded game's does,
+    so both place the same dots.
+
+    Args:
+        game (Game): The game to serialize.
+
+    Returns:
+        bytes: The serialized game.
+    """
+    game.snake.grid.reorder()
+    payload = bytearray(MAGIC)
+    payload.append(VERSION)
+    for value in (game.width, game.height, game.cell_size, game.win_score,
+                  game.ticks, game.score, game.dot.cell):
+        write_varint(payload, value)
+    payload.append(BACKENDS.index(game.backend))
+    payload.append(STATES.index(game.state))
+    payload.append(DIRECTIONS.index(game.snake.direction))
+    payload.append(game.snake.growing)
+    _write_seed(payload, game.seed)
+    encode_body(payload, list(game.snake.cells()), game.snake.grid.cols)
+
+    version, words, gauss = game.rng.getstate()
+    payload.append(version)
+    payload += struct.pack(f"<{RNG_WORDS}I", *words)
+    payload += struct.pack("<?d", gauss is not None, gauss or 0.0)
+    return bytes(payload)
+
+def load_game(data: bytes) -> Game:
+    """
+    Rebuilds a game serialized by `dump_game`.
+
+    Args:
+        data (bytes): The serialized game.
+
+    Returns:
+        Game: The game, in the state it was saved in.
+
+    Raises:
+        ValueError: If the data is not a saved game or was written by a newer version.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a saved snake game")
+    if data[len(MAGIC)] > VERSION:
+        raise ValueError(f"Unsupported saved game version {data[len(MAGIC)]}")
+    offset = len(MAGIC) + 1
+    values = []
+    for _ in range(7):
+        value, offset = read_varint(data, offset)
+        values.append(value)
+    width, height, cell_size, win_score, ticks, score, dot = values
+    backend, state, direction, growing = data[offset:offset + 4]
+    seed, offset = _read_seed(data, offset + 4)
+
+    game = Game(width, height, cell_size, win_score, seed, BACKENDS[backend])
+    cells, offset = decode_body(data, offset, game.snake.grid.cols)
+    game.snake.set_cells(cells)
+    game.snake.grid.reorder()
+    game.snake.direction = DIRECTIONS[direction]
+    game.snake.growing = bool(growing)
+    game.dot.cell = dot
+    game.ticks = ticks
+    game.score = score
+    game.state = STATES[state]
+
+    rng_version = data[offset]
+    offset += 1
+    words = struct.unpack_from(f"<{RNG_WORDS}I", data, offset)
+    has_gauss, gauss = struct.unpack_from("<?d", data, offset + 4 * RNG_WORDS)
+    game.rng.setstate((rng_version, words, gauss if has_gauss else None))
+    return game
+
+def save_game(game: Game, path: Union[str, os.PathLike]) -> None:
+    """
+    Writes a game to a file with `dump_game`, replacing the file in one step.
+
+    Args:
+        game (Game): The game to save.
+        path (Union[str, os.PathLike]): The file to write.
+    """
+    partial = f"{os.fspath(path)}.tmp"
+    with open(partial, "wb") as file:
+        file.write(dump_game(game))
+    os.replace(partial, path)
+
+def resume_game(path: Union[str, os.PathLike]) -> Game:
+    """
+    Reads a game saved with `save_game`.
+
+    Args:
+        path (Union[str, os.PathLike]): The file to read.
+
+    Returns:
+        Game: The saved game.
+    """
+    with open(path, "rb") as file:
+        return load_game(file.read())
+
+def _write_seed(payload: bytearray, seed: Optional[int]) -> None:
+    # Zigzag-encoded so negative seeds stay short, and shifted so 0 means no seed.
+    if seed is None:
+        write_varint(payload, 0)
+    else:
+        write_varint(payload, (2 * seed if seed >= 0 else -2 * seed - 1) + 1)
+
+def _read_seed(data: bytes, offset: int) -> Tuple[Optional[int], int]:
+    value, offset = read_varint(data, offset)
+    if value == 0:
+        return None, offset
+    value -= 1
+    return (value // 2 if value % 2 == 0 else -(value + 1) // 2), offset
@@ -0,0 +1,392 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+import argparse
+import asyncio
+import struct
+import time
+
+from .arena import Arena
+from .snake import Direction
+from .varint import read_varint, write_varint
+
+WELCOME = 1
+SNAPSHOT = 2
+TICK = 3
+
+HEAD = 1
+TAIL = 2
+DIED = 3
+DOT = 4
+SCORE = 5
+STATE = 6
+
+DIRECTIONS: Tuple[Direction, ...] = ("UP", "DOWN", "LEFT", "RIGHT")
+STATES = ("RUNNING", "PAUSED", "GAME_OVER", "WON")
+
+_LENGTH = struct.Struct("<I")
+
+def encode_frame(message_type: int, payload: bytes) -> bytes:
+    """
+    Frames a message as a 4-byte little-endian length, a type byte and the payload.
+
+    Args:
+        message_type (int): WELCOME, SNAPSHOT or TICK.
+        payload (bytes): The body of the message.
+
+    Returns:
+        bytes: The framed message.
+    """
+    return _LENGTH.pack(len(payload) + 1) + bytes([message_type]) + payload
+
+class SnakeServer:
+    """
+    Runs an authoritative `Arena` and streams it to TCP clients as binary deltas.
+
+    Each client is given a snake while any are free and spectates otherwise. A
+    client steers by sending single bytes, each an index into `DIRECTIONS`. On
+    connecting it receives a WELCOME message (its snake index plus one, or 0 for
+    spectators, and the board size) and a SNAPSHOT of the whole arena. After that
+    every tick is one TICK message listing only what changed: heads added, tails
+    removed, deaths, dots moved, scores and the arena's state. Dot cells are sent
+    plus one, with 0 for a dot that has left the board. The message is
+    encoded once and written to every client, and its size depends on the number
+    of living snakes, not on their length. Clients that fall more than
+    `max_buffer` bytes behind are disconnected. A finished arena restarts after
+    `restart_delay` ticks with a fresh SNAPSHOT.
+
+    Attributes:
+        arena (Arena): The authoritative game.
+        tick_rate (float): The number of ticks per second. With 0 the server only
+            ticks when `tick` is called.
+        port (int): The port the server listens on, once started.
+        last_tick_bytes (int): The size of the last TICK message.
+        last_tick_seconds (float): The time the last tick took, including the broadcast.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, tick_rate: float = 10.0,
+                 restart_delay: int = 30, max_buffer: int = 1 << 20, **arena_options) -> None:
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.restart_delay = restart_delay
+        self.max_buffer = max_buffer
+        self.arena = Arena(**arena_options)
+        self.arena.start()
+        self._dot_cells = [dot.cell for dot in self.arena.dots]
+        self.last_tick_bytes = 0
+        self.last_tick_seconds = 0.0
+        self._clients: Dict[asyncio.StreamWriter, Optional[int]] = {}
+        self._free_snakes: Deque[int] = deque(range(self.arena.snake_count))
+        self._ended_ticks = 0
+        self._generation = 0
+        self._snapshot: Tuple[Tuple[int, int], bytes] = ((-1, -1), b"")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ticker: Optional[asyncio.Task] = None
+        self._handlers: Set[asyncio.Task] = set()
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def start(self) -> None:
+        """
+        Starts listening and ticking.
+        """
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.tick_rate > 0:
+            self._ticker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """
+        Stops ticking, disconnects every client and stops listening.
+        """
+        if self._ticker is not None:
+            self._ticker.cancel()
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._clients):
+            self._disconnect(writer)
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def tick(self) -> None:
+        """
+        Advances the arena by one tick and broadcasts what changed.
+        """
+        start = time.perf_counter()
+        arena = self.arena
+        if arena.state != "RUNNING":
+            self._ended_ticks += 1
+            if self._ended_ticks >= self.restart_delay:
+                self._ended_ticks = 0
+                self._generation += 1
+                arena.start()
+                self._dot_cells = [dot.cell for dot in arena.dots]
+                self._broadcast(self._snapshot_frame())
+            return
+
+        living = arena.living()
+        lengths = [len(arena.snakes[index]) for index in living]
+        scores = [arena.scores[index] for index in living]
+        arena.update()
+
+        payload = bytearray()
+        write_varint(payload, arena.ticks)
+        scored = False
+        for index, length, score in zip(living, lengths, scores):
+            if not arena.alive[index]:
+                payload.append(DIED)
+                write_varint(payload, index)
+                continue
+            snake = arena.snakes[index]
+            payload.append(HEAD)
+            write_varint(payload, index)
+            write_varint(payload, snake.head)
+            if len(snake) == length:
+                payload.append(TAIL)
+                write_varint(payload, index)
+            if arena.scores[index] != score:
+                scored = True
+                payload.append(SCORE)
+                write_varint(payload, index)
+                write_varint(payload, arena.scores[index])
+        if scored:
+            for index, cell in self._moved_dots():
+                payload.append(DOT)
+                write_varint(payload, index)
+                write_varint(payload, 0 if cell is None else cell + 1)
+        if arena.state != "RUNNING":
+            payload.append(STATE)
+            payload.append(STATES.index(arena.state))
+
+        frame = encode_frame(TICK, bytes(payload))
+        self._broadcast(frame)
+        self.last_tick_bytes = len(frame)
+        self.last_tick_seconds = time.perf_counter() - start
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            self.tick()
+            await asyncio.sleep(max(deadline - loop.time(), 0))
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        snake = self._free_snakes.popleft() if self._free_snakes else None
+        self._clients[writer] = snake
+        writer.write(self._welcome_frame(snake) + self._snapshot_frame())
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                if snake is not None:
+                    for code in data:
+                        if code < len(DIRECTIONS):
+                            self.arena.change_direction(DIRECTIONS[code], snake)
+        except ConnectionError:
+            pass
+        finally:
+            self._disconnect(writer)
+            self._handlers.discard(handler)
+
+    def _disconnect(self, writer: asyncio.StreamWriter) -> None:
+        if writer not in self._clients:
+            return
+        snake = self._clients.pop(writer)
+        if snake is not None:
+            self._free_snakes.append(snake)
+        writer.close()
+
+    def _broadcast(self, frame: bytes) -> None:
+        for writer in list(self._clients):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self._disconnect(writer)
+            else:
+                writer.write(frame)
+
+    def _moved_dots(self) -> List[Tuple[int, Optional[int]]]:
+        moved = []
+        for index, dot in enumerate(self.arena.dots):
+            if self._dot_cells[index] != dot.cell:
+                self._dot_cells[index] = dot.cell
+                moved.append((index, dot.cell))
+        return moved
+
+    def _welcome_frame(self, snake: Optional[int]) -> bytes:
+        grid = self.arena.snake.grid
+        payload = bytearray()
+        for value in (0 if snake is None else snake + 1, grid.cols, grid.rows,
+                      self.arena.snake_count, self.arena.dot_count):
+            write_varint(payload, value)
+        return encode_frame(WELCOME, bytes(payload))
+
+    def _snapshot_frame(self) -> bytes:
+        arena = self.arena
+        key = (self._generation, arena.ticks)
+        if self._snapshot[0] == key:
+            return self._snapshot[1]
+        payload = bytearray()
+        write_varint(payload, arena.ticks)
+        payload.append(STATES.index(arena.state))
+        for index, snake in enumerate(arena.snakes):
+            payload.append(arena.alive[index])
+            write_varint(payload, arena.scores[index])
+            write_varint(payload, len(snake))
+            for cell in snake.cells():
+                write_varint(payload, cell)
+        for dot in arena.dots:
+            write_varint(payload, 0 if dot.cell is None else dot.cell + 1)
+        self._snapshot = (key, encode_frame(SNAPSHOT, bytes(payload)))
+        return self._snapshot[1]
+
+class ArenaMirror:
+    """
+    Rebuilds the state of a `SnakeServer` arena from its messages, on the client side.
+
+    Attributes:
+        snake (Optional[int]): The index of the client's own snake, or None for spectators.
+        cols (int): The number of columns of the board.
+        rows (int): The number of rows of the board.
+        tick (int): The last tick applied.
+        state (str): The state of the arena.
+        snakes (List[Deque[int]]): The cells of each snake, head first.
+        alive (List[bool]): Whether each snake is alive.
+        scores (List[int]): The score of each snake.
+        dots (List[Optional[int]]): The cell of each dot, or None for a dot off the board.
+    """
+
+    def __init__(self) -> None:
+        self.snake: Optional[int] = None
+        self.cols = self.rows = 0
+        self.tick = 0
+        self.state = "PAUSED"
+        self.snakes: List[Deque[int]] = []
+        self.alive: List[bool] = []
+        self.scores: List[int] = []
+        self.dots: List[Optional[int]] = []
+        self._snake_count = self._dot_count = 0
+
+    def apply(self, message: bytes) -> None:
+        """
+        Applies one message, without its length prefix.
+
+        Args:
+            message (bytes): The type byte followed by the payload.
+        """
+        message_type = message[0]
+        if message_type == WELCOME:
+            values = []
+            offset = 1
+            for _ in range(5):
+                value, offset = read_varint(message, offset)
+                values.append(value)
+            snake, self.cols, self.rows, self._snake_count, self._dot_count = values
+            self.snake = snake - 1 if snake else None
+        elif message_type == SNAPSHOT:
+            self._apply_snapshot(message)
+        elif message_type == TICK:
+            self._apply_tick(message)
+        else:
+            raise ValueError(f"Unknown message type {message_type}")
+
+    def _apply_snapshot(self, message: bytes) -> None:
+        self.tick, offset = read_varint(message, 1)
+        self.state = STATES[message[offset]]
+        offset += 1
+        self.snakes, self.alive, self.scores = [], [], []
+        for _ in range(self._snake_count):
+            self.alive.append(bool(message[offset]))
+            score, offset = read_varint(message, offset + 1)
+            length, offset = read_varint(message, offset)
+            cells: Deque[int] = deque()
+            for _ in range(length):
+                cell, offset = read_varint(message, offset)
+                cells.append(cell)
+            self.scores.append(score)
+            self.snakes.append(cells)
+        self.dots = []
+        for _ in range(self._dot_count):
+            cell, offset = read_varint(message, offset)
+            self.dots.append(cell - 1 if cell else None)
+
+    def _apply_tick(self, message: bytes) -> None:
+        self.tick, offset = read_varint(message, 1)
+        while offset < len(message):
+            event = message[offset]
+            if event == STATE:
+                self.state = STATES[message[offset + 1]]
+                offset += 2
+                continue
+            index, offset = read_varint(message, offset + 1)
+            if event == HEAD:
+                cell, offset = read_varint(message, offset)
+                self.snakes[index].appendleft(cell)
+            elif event == TAIL:
+                self.snakes[index].pop()
+            elif event == DIED:
+                self.alive[index] = False
+                self.snakes[index].clear()
+            elif event == SCORE:
+                self.scores[index], offset = read_varint(message, offset)
+            elif event == DOT:
+                cell, offset = read_varint(message, offset)
+                self.dots[index] = cell - 1 if cell else None
+            else:
+                raise ValueError(f"Unknown tick event {event}")
+
+async def read_message(reader: asyncio.StreamReader) -> bytes:
+    """
+    Reads one framed message from a server.
+
+    Args:
+        reader (asyncio.StreamReader): The connection to read from.
+
+    Returns:
+        bytes: The type byte followed by the payload.
+    """
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    return await reader.readexactly(length)
+
+def raise_open_file_limit() -> None:
+    """
+    Raises the soft limit on open files to the hard limit, so thousands of sockets can be open.
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+async def _serve(server: SnakeServer) -> None:
+    await server.start()
+    print(f"Serving on {server.host}:{server.port}")
+    while True:
+        await asyncio.sleep(1)
+        print(f"tick {server.arena.ticks}: {server.client_count} clients, "
+              f"{server.last_tick_bytes} bytes, {server.last_tick_seconds * 1000:.2f} ms")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a multiplayer snake server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick-rate", type=float, default=10.0)
+    parser.add_argument("--size", type=int, default=200, help="The width and height of the board, in cells.")
+    parser.add_argument("--snakes", type=int, default=1000)
+    parser.add_argument("--dots", type=int, default=500)
+    args = parser.parse_args()
+    raise_open_file_limit()
+    server = SnakeServer(args.host, args.port, args.tick_rate, width=args.size, height=args.size,
+                         cell_size=1, snake_count=args.snakes, dot_count=args.dots)
+    asyncio.run(_serve(server))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from queue import Empty, SimpleQueue
+from typing import Callable, List, NamedTuple, Optional, Tuple
+import threading
+import time
+
+from .game import Game
+from .loop import FixedTimestepLoop
+from .snake import SnakeSnapshot
+
+PAUSE = "PAUSE"
+RESTART = "RESTART"
+STOP = "STOP"
+
+class GameSnapshot(NamedTuple):
+    """
+    An immutable copy of the state needed to draw a game.
+
+    The snake is a `SnakeSnapshot`, which shares the body with the live snake, so
+    capturing takes the same time however long the snake is. Readers build the
+    list of cells from it only when they need it. The board's shape is copied too,
+    so that readers can place cells without touching the game's grid.
+
+    Attributes:
+        state (str): The state of the game.
+        score (int): The score.
+        ticks (int): The number of ticks played.
+        snake (SnakeSnapshot): The snake.
+        dot (int): The packed cell of the dot.
+        previous_cells (Optional[Tuple[int, int]]): The head and tail cells before the
+            last tick, or None when there is nothing to interpolate from.
+        tick_time (float): When the last tick ran, on the simulation's clock.
+        cols (int): The number of columns of the board.
+        rows (int): The number of rows of the board.
+        cell_size (int): The size of each cell in pixels.
+    """
+    state: str
+    score: int
+    ticks: int
+    snake: SnakeSnapshot
+    dot: int
+    previous_cells: Optional[Tuple[int, int]]
+    tick_time: float
+    cols: int
+    rows: int
+    cell_size: int
+
+    @classmethod
+    def capture(cls, game: Game, previous_cells: Optional[Tuple[int, int]] = None,
+                tick_time: float = 0.0) -> "GameSnapshot":
+        """
+        Copies the drawable state of a game.
+
+        Args:
+            game (Game): The game to copy.
+            previous_cells (Optional[Tuple[int, int]]): The head and tail before the last tick.
+            tick_time (float): When the last tick ran.
+
+        Returns:
+            GameSnapshot: The snapshot.
+        """
+        grid = game.snake.grid
+        return cls(game.state, game.score, game.ticks, game.snake.snapshot(), game.dot.cell,
+                   previous_cells, tick_time, grid.cols, grid.rows, grid.cell_size)
+
+    def cells(self) -> List[int]:
+        """
+        Returns the packed cells of the snake, head first.
+        """
+        return self.snake.cells()
+
+class SimulationThread(threading.Thread):
+    """
+    Runs a game on its own thread at a fixed tick rate.
+
+    Input is sent through a queue as direction names or the `PAUSE`, `RESTART` and
+    `STOP` commands; the thread waits on that queue between ticks, so input is
+    handled as soon as it arrives. After every change the thread publishes a new
+    `GameSnapshot` by swapping a single reference, so readers such as the GUI thread
+    never take a lock and never see a half-updated game.
+
+    Attributes:
+        game (Game): The game being simulated. Only the simulation thread may touch it
+            once the thread has started.
+        loop (FixedTimestepLoop): The loop that ticks the game.
+    """
+
+    def __init__(self, game: Game, tick_rate: float = 10.0,
+                 clock: Callable[[], float] = time.perf_counter) -> None:
+        super().__init__(name="snake-simulation", daemon=True)
+        self.game = game
+        self.loop = FixedTimestepLoop(game, tick_rate, clock=clock)
+        self._clock = clock
+        self._commands: "SimpleQueue[str]" = SimpleQueue()
+        self._running = True
+        self._snapshot = GameSnapshot.capture(game, tick_time=clock())
+
+    @property
+    def snapshot(self) -> GameSnapshot:
+        """
+        The latest published state of the game.
+        """
+        return self._snapshot
+
+    def send(self, command: str) -> None:
+        """
+        Queues input for the simulation. Safe to call from any thread.
+
+        Args:
+            command (str): A direction, `PAUSE`, `RESTART` or `STOP`.
+        """
+        self._commands.put(command)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the simulation and waits for the thread to finish.
+
+        Args:
+            timeout (Optional[float]): The most seconds to wait.
+        """
+        self.send(STOP)
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self) -> None:
+        while self._running:
+            remaining = (1 - self.loop.alpha) / self.loop.tick_rate
+            try:
+                command: Optional[str] = self._commands.get(timeout=max(remaining, 0.001))
+            except Empty:
+                command = None
+            self.step(command)
+
+    def step(self, command: Optional[str] = None) -> bool:
+        """
+        Handles queued input and runs the ticks that are due, publishing a new
+        snapshot if anything changed.
+
+        Args:
+            command (Optional[str]): A command already taken off the queue, handled first.
+
+        Returns:
+            bool: True if a new snapshot was published.
+        """
+        changed = command is not None and self._handle(command)
+        while True:
+            try:
+                changed |= self._handle(self._commands.get_nowait())
+            except Empty:
+                break
+        if self.loop.advance():
+            changed = True
+        if changed:
+            tick_time = self._clock() - self.loop.alpha / self.loop.tick_rate
+            self._snapshot = GameSnapshot.capture(self.game, self.loop.previous_cells, tick_time)
+        return changed
+
+    def _handle(self, command: str) -> bool:
+        if command == STOP:
+            self._running = False
+        elif command == PAUSE:
+            self.game.toggle_pause()
+            return True
+        elif command == RESTART and self.game.state in ("GAME_OVER", "WON"):
+            self.game.start()
+            self.loop.reset()
+            return True
+        elif command in ("UP", "DOWN", "LEFT", "RIGHT"):
+            self.loop.queue_direction(command)
+        return False
@@ -1,45 +1,443 @@
-from typing import List, Tuple, Literal
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Literal, Union
+import sys
+
+from .grid import Grid
 
 Direction = Literal["UP", "DOWN", "LEFT", "RIGHT"]
 
+OPPOSITES = {
+    "UP": "DOWN",
+    "DOWN": "UP",
+    "LEFT": "RIGHT",
+    "RIGHT": "LEFT"
+}
+
+STEPS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0)
+}
+
+CHUNK_SHIFT = 8
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+class SegmentsView(Sequence):
+    """
+    A read-only view over the body of a snake, head first, in pixel coordinates.
+
+    Positions are computed from the snake's packed cells as they are read.
+    Membership tests use the grid's occupancy, so `position in segments`
+    is constant time regardless of the snake's length. On a grid shared with
+    other snakes, an occupied cell is looked up in the body itself.
+    """
+
+    __slots__ = ("_snake",)
+
+    def __init__(self, snake: "Snake") -> None:
+        self._snake = snake
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Tuple[int, int], List[Tuple[int, int]]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        return self._snake.grid.to_position(self._snake.cell_at(index))
+
+    def __len__(self) -> int:
+        return len(self._snake)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        to_position = self._snake.grid.to_position
+        return (to_position(cell) for cell in self._snake.cells())
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, tuple):
+            return False
+        snake = self._snake
+        cell = snake.grid.to_cell(position)
+        if cell is None or not snake.grid.is_occupied(cell):
+            return False
+        return not snake.shared_grid or cell in snake.cells()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (SegmentsView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SegmentsView({list(self)!r})"
+
+class MoveRecord(NamedTuple):
+    """
+    What `Snake.make_move` changed, for `Snake.unmake_move` to undo.
+
+    Attributes:
+        direction (Direction): The direction before the move.
+        growing (bool): Whether the snake was growing before the move.
+        tail (Optional[int]): The tail cell freed by the move, or None if the snake grew.
+        slot (Optional[int]): What the grid's `occupy` returned for the new head.
+    """
+    direction: "Direction"
+    growing: bool
+    tail: Optional[int]
+    slot: Optional[int]
+
+class SnakeSnapshot(NamedTuple):
+    """
+    The state of a snake at one moment, as taken by `Snake.snapshot`.
+
+    The body is a window onto chunks of the snake's cell log, which the snapshot
+    shares with the snake and with other snapshots instead of copying.
+
+    Attributes:
+        chunks (Tuple[array, ...]): The chunks of the cell log holding the body.
+        base (int): The log index of the first cell of the first chunk.
+        start (int): The log index of the tail.
+        end (int): The log index just past the head.
+        direction (Direction): The direction of the snake.
+        growing (bool): Whether the snake was growing.
+        collided (bool): Whether the snake had collided.
+    """
+    chunks: Tuple[array, ...]
+    base: int
+    start: int
+    end: int
+    direction: "Direction"
+    growing: bool
+    collided: bool
+
+    @property
+    def head(self) -> int:
+        if self.end == self.start:
+            raise IndexError("the snake has no segments")
+        offset = self.end - 1 - self.base
+        return self.chunks[offset >> CHUNK_SHIFT][offset & CHUNK_MASK]
+
+    @property
+    def tail(self) -> int:
+        if self.end == self.start:
+            raise IndexError("the snake has no segments")
+        offset = self.start - self.base
+        return self.chunks[offset >> CHUNK_SHIFT][offset & CHUNK_MASK]
+
+    def cells(self) -> List[int]:
+        """
+        Returns the packed cells of the body, head first.
+        """
+        return _log_cells(self.chunks, self.base, self.start, self.end)
+
 class Snake:
     """
     Represents a snake in a grid-based game.
 
+    The body is a window onto an append-only log of packed cell indices
+    (y * cols + x): moving appends the new head and advances the tail, and the
+    log is stored in fixed-size chunks that are dropped once the tail has left
+    them. The occupancy lives in the snake's grid, so moving, growing and
+    checking for self-collision are all constant time. Pixel coordinates are only
+    computed when `segments` is read.
+
+    Because cells in the log are never overwritten, a `snapshot` shares the
+    chunks instead of copying the body. Only a write to a slot that a snapshot can
+    see, after `unmake_move` or `restore`, copies a chunk first.
+
     Attributes:
         width (int): The width of the game grid.
         height (int): The height of the game grid.
         cell_size (int): The size of each cell in the grid.
         direction (Direction): The current direction of the snake.
-        segments (List[Tuple[int, int]]): The list of segments representing the snake's body.
+        segments (SegmentsView): A read-only view of the snake's body, head first.
         growing (bool): Flag indicating if the snake is growing.
+        grid (Grid): The occupancy and free cells of the board. A grid can be passed in
+            to choose its backend or to share one board between several snakes;
+            by default the snake creates a dense `Grid`.
+        shared_grid (bool): Whether other snakes live on the grid too, so that its
+            occupancy does not tell which snake holds a cell.
+        zobrist (int): The XOR of the Zobrist keys of the body's cells, kept up to date
+            on every move once `track_zobrist` is called, and 0 otherwise.
     """
 
-    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20) -> None:
+    __slots__ = ("width", "height", "cell_size", "direction", "growing", "grid", "shared_grid", "zobrist",
+                 "_chunks", "_base", "_start", "_end", "_shared_end", "_collided", "_zobrist_keys")
+
+    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20,
+                 grid: Optional[Grid] = None, cells: Optional[Iterable[int]] = None,
+                 shared_grid: bool = False) -> None:
         self.width = width
         self.height = height
         self.cell_size = cell_size
+        self.grid = grid if grid is not None else Grid(width, height, cell_size)
+        self.shared_grid = shared_grid
+        self._chunks: List[array] = []
+        self._base = self._start = self._end = self._shared_end = 0
         self.direction: Direction = "RIGHT"
-        start_x = (width // cell_size // 2) * cell_size
-        start_y = (height // cell_size // 2) * cell_size
-        self.segments: List[Tuple[int, int]] = [
-            (start_x, start_y),
-            (start_x - cell_size, start_y),
-            (start_x - cell_size * 2, start_y)
-        ]
         self.growing = False
+        self.zobrist = 0
+        self._zobrist_keys: Optional[List[int]] = None
+        if cells is not None:
+            self.set_cells(cells)
+            return
+        if width < cell_size or height < cell_size:
+            raise ValueError(f"A {width}x{height} board has no room for a {cell_size} pixel cell")
+        start_x = width // cell_size // 2
+        start_y = (height // cell_size // 2) * cell_size
+        # Boards too narrow for the whole body start with the segments that fit.
+        self.segments = [(x * cell_size, start_y) for x in range(start_x, start_x - 3, -1) if x >= 0]
+
+    @property
+    def segments(self) -> SegmentsView:
+        return SegmentsView(self)
+
+    @segments.setter
+    def segments(self, positions: Iterable[Tuple[int, int]]) -> None:
+        cells = []
+        for position in positions:
+            cell = self.grid.to_cell(position)
+            if cell is None:
+                raise ValueError(f"Segment {position} is outside the grid")
+            cells.append(cell)
+        self.set_cells(cells)
+
+    def set_cells(self, cells: Iterable[int]) -> None:
+        """
+        Replaces the body of the snake, updating the grid's occupancy.
+
+        Args:
+            cells (Iterable[int]): The packed cells of the new body, head first.
+        """
+        for cell in self.cells():
+            self.grid.vacate(cell)
+        cells = list(cells)
+
+        self._chunks = [self.grid.cell_array(CHUNK_SIZE) for _ in range(len(cells) // CHUNK_SIZE + 1)]
+        self._base = self._start = self._shared_end = 0
+        self._end = len(cells)
+        for offset, cell in enumerate(cells):
+            index = self._end - 1 - offset
+            self._chunks[index >> CHUNK_SHIFT][index & CHUNK_MASK] = cell
+            self.grid.occupy(cell)
+        self._collided = bool(cells) and cells.count(cells[0]) > 1
+        if self._zobrist_keys is not None:
+            self.track_zobrist(self._zobrist_keys)
+
+    def track_zobrist(self, keys: Optional[List[int]]) -> None:
+        """
+        Starts keeping `zobrist` up to date as the snake moves.
+
+        Args:
+            keys (Optional[List[int]]): One random key per cell of the grid,
+                or None to stop tracking.
+        """
+        self._zobrist_keys = keys
+        self.zobrist = 0
+        if keys is not None:
+            for cell in set(self.cells()):
+                self.zobrist ^= keys[cell]
+
+    @property
+    def head(self) -> int:
+        if self._end == self._start:
+            raise IndexError("the snake has no segments")
+        offset = self._end - 1 - self._base
+        return self._chunks[offset >> CHUNK_SHIFT][offset & CHUNK_MASK]
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def cell_at(self, index: int) -> int:
+        """
+        Returns the packed cell of a segment.
+
+        Args:
+            index (int): The index of the segment, 0 being the head. Negative indices count from the tail.
+
+        Returns:
+            int: The cell of the segment.
+        """
+        length = self._end - self._start
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("segment index out of range")
+        offset = self._end - 1 - index - self._base
+        return self._chunks[offset >> CHUNK_SHIFT][offset & CHUNK_MASK]
+
+    def cells(self) -> Iterator[int]:
+        """
+        Iterates over the packed cells of the body, head first.
+        """
+        return iter(_log_cells(self._chunks, self._base, self._start, self._end))
+
+    def next_cell(self) -> Optional[int]:
+        """
+        Returns the cell the head moves into on the next move.
+
+        Returns:
+            Optional[int]: The cell, or None if the move runs into a wall.
+        """
+        return self.grid.neighbor(self.head, self.direction)
 
     def move(self) -> None:
         """
         Moves the snake in the current direction.
+        A move into a wall counts as a collision and leaves the body where it was.
         """
-        head = self.segments[0]
-        new_head = self._get_new_head(head)
-        self.segments.insert(0, new_head)
-        if not self.growing:
-            self.segments.pop()
-        else:
-            self.growing = False
+        new_head = self.next_cell()
+        if new_head is None:
+            self._collided = True
+            return
+        self.retract_tail()
+        self.push_head(new_head)
+
+    def retract_tail(self) -> None:
+        """
+        Frees the tail cell, the first half of a move. A growing snake keeps its tail.
+        """
+        if self.growing:
+            return
+        offset = self._start - self._base
+        tail = self._chunks[offset >> CHUNK_SHIFT][offset & CHUNK_MASK]
+        self.grid.vacate(tail)
+        self._start += 1
+        if offset == CHUNK_MASK:
+            del self._chunks[0]
+            self._base += CHUNK_SIZE
+        if self._zobrist_keys is not None:
+            self.zobrist ^= self._zobrist_keys[tail]
+
+    def push_head(self, cell: int) -> Optional[int]:
+        """
+        Moves the head into a cell, the second half of a move. Entering an occupied
+        cell counts as a collision.
+
+        Args:
+            cell (int): The new head cell, next to the current head.
+
+        Returns:
+            Optional[int]: What the grid's `occupy` returned for the cell.
+        """
+        self.growing = False
+        self._collided = self.grid.is_occupied(cell)
+        offset = self._end - self._base
+        number = offset >> CHUNK_SHIFT
+        if self._end < self._shared_end:
+            self._unshare(number)
+        if number == len(self._chunks):
+            self._chunks.append(self.grid.cell_array(CHUNK_SIZE))
+        self._chunks[number][offset & CHUNK_MASK] = cell
+        self._end += 1
+        slot = self.grid.occupy(cell)
+        if self._zobrist_keys is not None and not self._collided:
+            self.zobrist ^= self._zobrist_keys[cell]
+        return slot
+
+    def make_move(self, direction: Direction) -> MoveRecord:
+        """
+        Turns and moves the snake in one step that `unmake_move` can take back,
+        so searches can walk through moves without copying the snake.
+
+        Unlike `move`, the move must be legal. Taking it back leaves the body, the
+        grid, down to the order of its free cells, and `zobrist` exactly as they were.
+
+        Args:
+            direction (Direction): The direction to move in. Reversing is not allowed.
+
+        Returns:
+            MoveRecord: What the move changed.
+
+        Raises:
+            ValueError: If the move runs into a wall or into the body.
+        """
+        cell = self.grid.neighbor(self.head, direction)
+        if cell is None:
+            raise ValueError(f"Moving {direction} runs into a wall")
+        tail = None if self.growing else self.cell_at(-1)
+        if self.grid.is_occupied(cell) and cell != tail:
+            raise ValueError(f"Moving {direction} runs into the snake")
+        previous_direction, growing = self.direction, self.growing
+        self.direction = direction
+        self.retract_tail()
+        slot = self.push_head(cell)
+        return MoveRecord(previous_direction, growing, tail, slot)
+
+    def unmake_move(self, record: MoveRecord) -> None:
+        """
+        Takes back the last move made with `make_move`. Moves must be taken back
+        in the reverse order they were made.
+
+        Args:
+            record (MoveRecord): The record that `make_move` returned.
+        """
+        head = self.head
+        self.grid.vacate(head, record.slot)
+        self._end -= 1
+        if self._zobrist_keys is not None:
+            self.zobrist ^= self._zobrist_keys[head]
+        if record.tail is not None:
+            # The log still holds the tail, unless its chunk was dropped.
+            self._start -= 1
+            if self._start < self._base:
+                self._chunks.insert(0, self.grid.cell_array(CHUNK_SIZE))
+                self._base -= CHUNK_SIZE
+                self._chunks[0][self._start & CHUNK_MASK] = record.tail
+            self.grid.occupy(record.tail)
+            if self._zobrist_keys is not None:
+                self.zobrist ^= self._zobrist_keys[record.tail]
+        self.direction = record.direction
+        self.growing = record.growing
+        self._collided = False
+
+    def snapshot(self) -> SnakeSnapshot:
+        """
+        Captures the snake's state in constant time, sharing the body with the snake.
+
+        Returns:
+            SnakeSnapshot: The snapshot.
+        """
+        self._shared_end = max(self._shared_end, self._end)
+        return SnakeSnapshot(tuple(self._chunks), self._base, self._start, self._end,
+                             self.direction, self.growing, self._collided)
+
+    def restore(self, snapshot: SnakeSnapshot) -> List[int]:
+        """
+        Returns the snake to a snapshot taken from it or from a snake on a grid of the same shape.
+
+        Only cells that differ between the current body and the snapshot's touch
+        the grid, and chunks shared by both are skipped whole, so restoring a
+        recent snapshot costs about as much as the moves made since.
+
+        Args:
+            snapshot (SnakeSnapshot): The snapshot to return to.
+
+        Returns:
+            List[int]: The cells the snake took back. On a shared grid, another snake
+                restored after this one may free a cell it gave up to this snake, so
+                these are occupied again once every snake is restored.
+        """
+        current = _occupied_window(self._chunks, self._base, self._start, self._end, self._collided)
+        restored = _occupied_window(snapshot.chunks, snapshot.base, snapshot.start, snapshot.end,
+                                    snapshot.collided)
+        keys = self._zobrist_keys
+        for cell in _changed_cells(current, restored):
+            self.grid.vacate(cell)
+            if keys is not None:
+                self.zobrist ^= keys[cell]
+        taken = list(_changed_cells(restored, current))
+        for cell in taken:
+            self.grid.occupy(cell)
+            if keys is not None:
+                self.zobrist ^= keys[cell]
+
+        self._chunks = list(snapshot.chunks)
+        self._base, self._start, self._end = snapshot.base, snapshot.start, snapshot.end
+        # Snapshots taken after this one may see the slots past its head.
+        self._shared_end = sys.maxsize
+        self.direction = snapshot.direction
+        self.growing = snapshot.growing
+        self._collided = snapshot.collided
+        return taken
 
     def grow(self) -> None:
         """
@@ -54,13 +452,7 @@ class Snake:
         Args:
             new_direction (Direction): The new direction for the snake.
         """
-        opposites = {
-            "UP": "DOWN",
-            "DOWN": "UP",
-            "LEFT": "RIGHT",
-            "RIGHT": "LEFT"
-        }
-        if opposites[new_direction] != self.direction:
+        if OPPOSITES[new_direction] != self.direction:
             self.direction = new_direction
 
     def check_collision(self) -> bool:
@@ -70,19 +462,55 @@ class Snake:
         Returns:
             bool: True if a collision has occurred, False otherwise.
         """
-        head = self.segments[0]
+        return self._collided
 
-        if head in self.segments[1:]:
-            return True
-        return self._is_out_of_bounds(head)
+    def _unshare(self, number: int) -> None:
+        # Copy every chunk from the one about to be written, so no snapshot sees the write.
+        for index in range(number, len(self._chunks)):
+            self._chunks[index] = self._chunks[index][:]
+        self._shared_end = self._base + (number << CHUNK_SHIFT)
 
-    def _get_new_head(self, head: Tuple[int, int]) -> Tuple[int, int]:
-        return {
-            "UP": (head[0], head[1] - self.cell_size),
-            "DOWN": (head[0], head[1] + self.cell_size),
-            "LEFT": (head[0] - self.cell_size, head[1]),
-            "RIGHT": (head[0] + self.cell_size, head[1])
-        }[self.direction]
+Log = Tuple[Sequence[array], int, int, int]
 
-    def _is_out_of_bounds(self, head: Tuple[int, int]) -> bool:
-        return head[0] < 0 or head[0] >= self.width or head[1] < 0 or head[1] >= self.height
\ No newline at end of file
+def _log_cells(chunks: Sequence[array], base: int, start: int, end: int) -> List[int]:
+    cells: List[int] = []
+    for number in range((end - 1 - base) >> CHUNK_SHIFT, ((start - base) >> CHUNK_SHIFT) - 1, -1):
+        first = max(start - base - (number << CHUNK_SHIFT), 0)
+        last = min(end - base - (number << CHUNK_SHIFT), CHUNK_SIZE)
+        piece = chunks[number][first:last]
+        piece.reverse()
+        cells.extend(piece)
+    return cells
+
+def _occupied_window(chunks: Sequence[array], base: int, start: int, end: int, collided: bool) -> Log:
+    # A head that ran into the body repeats one of its cells, and freeing that cell
+    # would free the body too, so the head is left out. Only collided bodies are searched.
+    if collided and end - start > 1:
+        offset = end - 1 - base
+        if chunks[offset >> CHUNK_SHIFT][offset & CHUNK_MASK] in _log_cells(chunks, base, start, end - 1):
+            return (chunks, base, start, end - 1)
+    return (chunks, base, start, end)
+
+def _changed_cells(log: Log, other: Log) -> Iterator[int]:
+    # Chunks start at multiples of CHUNK_SIZE in both logs, so each piece of one
+    # chunk here lines up with a piece of one chunk there.
+    chunks, base, start, end = log
+    other_chunks, other_base, other_start, other_end = other
+    index = start
+    while index < end:
+        first = (index - base) & CHUNK_MASK
+        chunk = chunks[(index - base) >> CHUNK_SHIFT]
+        stop = min(end, index - first + CHUNK_SIZE)
+        low, high = max(index, other_start), min(stop, other_end)
+        if low >= high:
+            yield from chunk[first:first + stop - index]
+        else:
+            yield from chunk[first:first + low - index]
+            other_first = (low - other_base) & CHUNK_MASK
+            other_chunk = other_chunks[(low - other_base) >> CHUNK_SHIFT]
+            if other_chunk is not chunk:
+                mine = chunk[first + low - index:first + high - index]
+                theirs = other_chunk[other_first:other_first + high - low]
+                yield from (cell for cell, known in zip(mine, theirs) if cell != known)
+            yield from chunk[first + high - index:first + stop - index]
+        index = stop
@@ -0,0 +1,157 @@
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .headless import EpisodeStats, Policy, run_episode
+
+class TournamentResult(NamedTuple):
+    """
+    The result of one episode played by one agent.
+
+    Attributes:
+        agent (str): The name of the agent.
+        stats (EpisodeStats): The statistics of the episode.
+    """
+    agent: str
+    stats: EpisodeStats
+
+class AgentSummary(NamedTuple):
+    """
+    The aggregated results of one agent.
+
+    Attributes:
+        episodes (int): The number of episodes played.
+        wins (int): The number of episodes won.
+        win_rate (float): The fraction of episodes won.
+        mean_score (float): The average score.
+        scores (Dict[int, int]): How many episodes ended with each score.
+        outcomes (Dict[str, int]): How many episodes ended with each outcome.
+    """
+    episodes: int
+    wins: int
+    win_rate: float
+    mean_score: float
+    scores: Dict[int, int]
+    outcomes: Dict[str, int]
+
+    def score_percentile(self, percentile: float) -> int:
+        """
+        Returns the score below which a given share of episodes ended.
+
+        Args:
+            percentile (float): The percentile, between 0 and 100.
+
+        Returns:
+            int: The score at that percentile.
+        """
+        rank = percentile / 100 * (self.episodes - 1)
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen > rank:
+                return score
+        return max(self.scores)
+
+class Leaderboard:
+    """
+    Aggregates tournament results per agent as they arrive, in constant memory per agent.
+    """
+
+    def __init__(self) -> None:
+        self._scores: Dict[str, Counter] = {}
+        self._outcomes: Dict[str, Counter] = {}
+
+    def add(self, result: TournamentResult) -> None:
+        """
+        Adds the result of one episode.
+
+        Args:
+            result (TournamentResult): The result to add.
+        """
+        self._scores.setdefault(result.agent, Counter())[result.stats.score] += 1
+        self._outcomes.setdefault(result.agent, Counter())[result.stats.outcome] += 1
+
+    def summary(self) -> Dict[str, AgentSummary]:
+        """
+        Summarizes the results added so far.
+
+        Returns:
+            Dict[str, AgentSummary]: The summary of each agent.
+        """
+        summaries = {}
+        for agent, scores in self._scores.items():
+            episodes = sum(scores.values())
+            wins = self._outcomes[agent]["WON"]
+            summaries[agent] = AgentSummary(
+                episodes,
+                wins,
+                wins / episodes,
+                sum(score * count for score, count in scores.items()) / episodes,
+                dict(scores),
+                dict(self._outcomes[agent])
+            )
+        return summaries
+
+_worker_agents: Mapping[str, Policy] = {}
+_worker_budgets: Mapping[str, Optional[float]] = {}
+_worker_options: Dict = {}
+
+def _initialize_worker(agents: Mapping[str, Policy], budgets: Mapping[str, Optional[float]],
+                       options: Dict) -> None:
+    global _worker_agents, _worker_budgets, _worker_options
+    _worker_agents = agents
+    _worker_budgets = budgets
+    _worker_options = options
+
+def _play(task: Tuple[str, int]) -> TournamentResult:
+    agent, seed = task
+    stats = run_episode(_worker_agents[agent], seed, move_budget=_worker_budgets.get(agent), **_worker_options)
+    return TournamentResult(agent, stats)
+
+def run_tournament(agents: Mapping[str, Policy], seeds: Iterable[int], workers: Optional[int] = None,
+                   chunksize: int = 64, move_budget: Union[None, float, Mapping[str, Optional[float]]] = None,
+                   **options) -> Iterator[TournamentResult]:
+    """
+    Plays every agent on every seed across a pool of processes.
+
+    Agents are sent to each worker once, so they must be picklable, such as
+    module-level functions. Results are yielded as soon as their chunk finishes,
+    in no particular order. Each worker interrupts a policy call that runs over
+    its agent's budget, so an agent that hangs forfeits its games instead of
+    blocking the worker.
+
+    Args:
+        agents (Mapping[str, Policy]): The agents to evaluate, by name.
+        seeds (Iterable[int]): The seeds each agent plays.
+        workers (Optional[int]): The number of processes. Defaults to the number of cores.
+        chunksize (int): The number of episodes handed to a worker at a time.
+        move_budget (Union[None, float, Mapping[str, Optional[float]]]): The longest a
+            single move may take, in seconds, for every agent or by agent name. Agents
+            without a budget are not limited.
+        **options: Board and step limit options forwarded to `run_episode`.
+
+    Yields:
+        TournamentResult: The result of each episode.
+    """
+    if isinstance(move_budget, Mapping):
+        budgets = dict(move_budget)
+    else:
+        budgets = {agent: move_budget for agent in agents}
+    tasks = ((agent, seed) for seed in seeds for agent in agents)
+    with Pool(workers, _initialize_worker, (dict(agents), budgets, options)) as pool:
+        yield from pool.imap_unordered(_play, tasks, chunksize)
+
+def summarize(results: Iterable[TournamentResult]) -> Dict[str, AgentSummary]:
+    """
+    Aggregates tournament results into a summary per agent.
+
+    Args:
+        results (Iterable[TournamentResult]): The results, for example from `run_tournament`.
+
+    Returns:
+        Dict[str, AgentSummary]: The summary of each agent.
+    """
+    leaderboard = Leaderboard()
+    for result in results:
+        leaderboard.add(result)
+    return leaderboard.summary()
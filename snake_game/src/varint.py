@@ -0,0 +1,35 @@
+from typing import Tuple, Union
+import mmap
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    """
+    Appends a non-negative integer as a little-endian base-128 varint.
+
+    Args:
+        buffer (bytearray): The buffer to append to.
+        value (int): The value to write.
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def read_varint(data: Union[bytes, bytearray, memoryview, mmap.mmap], offset: int) -> Tuple[int, int]:
+    """
+    Reads a varint written by `write_varint`.
+
+    Args:
+        data (Union[bytes, bytearray, memoryview, mmap.mmap]): The data to read from.
+        offset (int): The offset of the varint.
+
+    Returns:
+        Tuple[int, int]: The value and the offset just past it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
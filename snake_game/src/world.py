@@ -0,0 +1,453 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import random
+
+from .game import GameState
+from .snake import Direction, Snake
+
+CHUNK_BITS = 4
+CHUNK_WIDTH = 1 << CHUNK_BITS
+CHUNK_CELLS = CHUNK_WIDTH * CHUNK_WIDTH
+
+COORD_BITS = 32
+SPAN = 1 << COORD_BITS
+ORIGIN = SPAN >> 1
+
+FOOD_PER_CHUNK = 3
+EVICT_MARGIN = 2
+
+class WorldChunk:
+    """
+    One square of the world, holding the occupancy and the food of its cells.
+
+    Attributes:
+        occupied (bytearray): One byte per cell, row by row, set where a body lies.
+        count (int): The number of occupied cells.
+        food (Set[int]): The packed cells of the chunk that hold food.
+    """
+
+    __slots__ = ("occupied", "count", "food")
+
+    def __init__(self) -> None:
+        self.occupied = bytearray(CHUNK_CELLS)
+        self.count = 0
+        self.food: Set[int] = set()
+
+class WorldGrid:
+    """
+    An unbounded board, made of square chunks that exist only near the snakes.
+
+    Cells are packed like on a `Grid` with 2**32 columns and rows, and the
+    world's edge is billions of cells away. A world offers the part of the
+    `Grid` interface that `Snake` uses (occupancy, `neighbor`, `cell_array` and
+    the conversions), so a snake lives on it unchanged. Coordinates are centred: `to_coordinates` and `to_position` put
+    cell (0, 0) in the middle of the world.
+
+    A chunk is created the first time one of its cells is occupied or when
+    `load_around` reaches it, and gets `food_per_chunk` pieces of food at places
+    drawn from the world seed and the chunk's coordinates. `evict` drops chunks
+    that are empty and far from every given cell, so memory depends on the
+    snakes' lengths and on the area around them, not on how far they travelled.
+    A chunk that is dropped and later recreated gets its food back.
+
+    Unlike a `Grid`, a world has no count of free cells and cannot pick a random
+    free cell: food is placed per chunk instead.
+
+    Attributes:
+        cols (int): The number of columns of the world.
+        rows (int): The number of rows of the world.
+        cell_size (int): The size of each cell in pixels.
+        size (int): The number of cells of the world.
+        seed (int): The seed from which food is placed.
+        food_per_chunk (int): The food placed in each new chunk.
+        chunks (Dict[int, WorldChunk]): The live chunks, keyed by `chunk_of`.
+    """
+
+    __slots__ = ("cols", "rows", "cell_size", "size", "seed", "food_per_chunk", "chunks")
+
+    def __init__(self, cell_size: int = 20, seed: int = 0, food_per_chunk: int = FOOD_PER_CHUNK) -> None:
+        self.cols = self.rows = SPAN
+        self.cell_size = cell_size
+        self.size = SPAN * SPAN
+        self.seed = seed
+        self.food_per_chunk = food_per_chunk
+        self.chunks: Dict[int, WorldChunk] = {}
+
+    def cell_array(self, length: int) -> array:
+        """
+        Creates a zeroed array able to hold cells of the world.
+
+        Args:
+            length (int): The length of the array.
+
+        Returns:
+            array: The array.
+        """
+        cells = array("Q")
+        cells.frombytes(bytes(length * cells.itemsize))
+        return cells
+
+    def is_free(self, cell: int) -> bool:
+        return not self.is_occupied(cell)
+
+    def is_occupied(self, cell: int) -> bool:
+        chunk = self.chunks.get(self.chunk_of(cell))
+        return chunk is not None and chunk.occupied[_local(cell)] == 1
+
+    def occupy(self, cell: int) -> Optional[int]:
+        """
+        Marks a cell as occupied, creating its chunk if needed. Cells that are not free are ignored.
+
+        Args:
+            cell (int): The cell to occupy.
+
+        Returns:
+            Optional[int]: Always None, as free cells are not listed.
+        """
+        chunk = self._chunk(self.chunk_of(cell))
+        local = _local(cell)
+        if not chunk.occupied[local]:
+            chunk.occupied[local] = 1
+            chunk.count += 1
+
+    def vacate(self, cell: int, slot: Optional[int] = None) -> None:
+        """
+        Marks a cell as free. Cells that are already free are ignored.
+
+        Args:
+            cell (int): The cell to free.
+            slot (Optional[int]): Ignored, as free cells are not listed.
+        """
+        chunk = self.chunks.get(self.chunk_of(cell))
+        local = _local(cell)
+        if chunk is not None and chunk.occupied[local]:
+            chunk.occupied[local] = 0
+            chunk.count -= 1
+
+    def neighbor(self, cell: int, direction: str) -> Optional[int]:
+        """
+        Returns the cell next to a cell in a direction.
+
+        Args:
+            cell (int): The starting cell.
+            direction (str): One of "UP", "DOWN", "LEFT" or "RIGHT".
+
+        Returns:
+            Optional[int]: The neighbouring cell, or None beyond the world's edge.
+        """
+        if direction == "RIGHT":
+            return cell + 1 if cell % SPAN != SPAN - 1 else None
+        if direction == "LEFT":
+            return cell - 1 if cell % SPAN != 0 else None
+        if direction == "UP":
+            return cell - SPAN if cell >= SPAN else None
+        return cell + SPAN if cell + SPAN < self.size else None
+
+    def has_food(self, cell: int) -> bool:
+        chunk = self.chunks.get(self.chunk_of(cell))
+        return chunk is not None and cell in chunk.food
+
+    def take_food(self, cell: int) -> bool:
+        """
+        Removes the food from a cell.
+
+        Args:
+            cell (int): The cell.
+
+        Returns:
+            bool: True if the cell held food.
+        """
+        chunk = self.chunks.get(self.chunk_of(cell))
+        if chunk is None or cell not in chunk.food:
+            return False
+        chunk.food.remove(cell)
+        return True
+
+    def chunk_of(self, cell: int) -> int:
+        """
+        Returns the key of the chunk holding a cell.
+
+        Args:
+            cell (int): The cell.
+
+        Returns:
+            int: The chunk's row and column, packed like cells.
+        """
+        return (cell >> (COORD_BITS + CHUNK_BITS)) << COORD_BITS | (cell & (SPAN - 1)) >> CHUNK_BITS
+
+    def load_around(self, cell: int, radius: int) -> None:
+        """
+        Creates every chunk within a number of chunks of a cell's chunk.
+
+        Args:
+            cell (int): The centre cell.
+            radius (int): The distance in chunks, along either axis.
+        """
+        row, column = divmod(self.chunk_of(cell), SPAN)
+        for chunk_row in range(row - radius, row + radius + 1):
+            for chunk_column in range(column - radius, column + radius + 1):
+                self._chunk(chunk_row << COORD_BITS | chunk_column)
+
+    def evict(self, cells: Iterable[int], radius: int) -> int:
+        """
+        Drops the empty chunks that are more than a number of chunks away from every given cell.
+
+        Args:
+            cells (Iterable[int]): The cells to keep the surroundings of, typically the heads.
+            radius (int): The distance in chunks, along either axis.
+
+        Returns:
+            int: The number of chunks dropped.
+        """
+        centres = [divmod(self.chunk_of(cell), SPAN) for cell in cells]
+        far = [
+            key for key, chunk in self.chunks.items()
+            if not chunk.count and all(
+                max(abs(key // SPAN - row), abs(key % SPAN - column)) > radius
+                for row, column in centres
+            )
+        ]
+        for key in far:
+            del self.chunks[key]
+        return len(far)
+
+    def visible(self, left: int, top: int, cols: int, rows: int) -> Tuple[List[int], List[int]]:
+        """
+        Finds the occupied cells and the food inside a rectangle, looking only at the chunks it overlaps.
+
+        Args:
+            left (int): The x coordinate of the rectangle's first column.
+            top (int): The y coordinate of the rectangle's first row.
+            cols (int): The width of the rectangle in cells.
+            rows (int): The height of the rectangle in cells.
+
+        Returns:
+            Tuple[List[int], List[int]]: The occupied cells and the cells holding food.
+        """
+        x_low, y_low = left + ORIGIN, top + ORIGIN
+        x_high, y_high = x_low + cols, y_low + rows
+        occupied: List[int] = []
+        food: List[int] = []
+        for chunk_row in range(y_low >> CHUNK_BITS, ((y_high - 1) >> CHUNK_BITS) + 1):
+            for chunk_column in range(x_low >> CHUNK_BITS, ((x_high - 1) >> CHUNK_BITS) + 1):
+                chunk = self.chunks.get(chunk_row << COORD_BITS | chunk_column)
+                if chunk is None:
+                    continue
+                first = (chunk_row << CHUNK_BITS) * SPAN + (chunk_column << CHUNK_BITS)
+                local = chunk.occupied.find(1) if chunk.count else -1
+                while local >= 0:
+                    occupied.append(first + (local >> CHUNK_BITS) * SPAN + (local & (CHUNK_WIDTH - 1)))
+                    local = chunk.occupied.find(1, local + 1)
+                food.extend(chunk.food)
+        return ([cell for cell in occupied if _inside(cell, x_low, y_low, x_high, y_high)],
+                [cell for cell in food if _inside(cell, x_low, y_low, x_high, y_high)])
+
+    def to_coordinates(self, cell: int) -> Tuple[int, int]:
+        """
+        Converts a cell to its x and y coordinates, counted from the centre of the world.
+
+        Args:
+            cell (int): The cell.
+
+        Returns:
+            Tuple[int, int]: The coordinates.
+        """
+        y, x = divmod(cell, SPAN)
+        return (x - ORIGIN, y - ORIGIN)
+
+    def from_coordinates(self, x: int, y: int) -> int:
+        """
+        Converts coordinates counted from the centre of the world to a cell.
+
+        Args:
+            x (int): The x coordinate.
+            y (int): The y coordinate.
+
+        Returns:
+            int: The cell.
+        """
+        return (y + ORIGIN) * SPAN + x + ORIGIN
+
+    def to_cell(self, position: Tuple[int, int]) -> Optional[int]:
+        """
+        Converts a pixel position, counted from the centre of the world, to a cell.
+
+        Args:
+            position (Tuple[int, int]): The top-left pixel of the cell.
+
+        Returns:
+            Optional[int]: The cell, or None if the position is beyond the world's edge.
+        """
+        x, y = position[0] // self.cell_size + ORIGIN, position[1] // self.cell_size + ORIGIN
+        if 0 <= x < SPAN and 0 <= y < SPAN:
+            return y * SPAN + x
+        return None
+
+    def to_position(self, cell: int) -> Tuple[int, int]:
+        """
+        Converts a cell to the pixel position of its top-left corner, counted from the centre of the world.
+
+        Args:
+            cell (int): The cell.
+
+        Returns:
+            Tuple[int, int]: The pixel position.
+        """
+        x, y = self.to_coordinates(cell)
+        return (x * self.cell_size, y * self.cell_size)
+
+    def _chunk(self, key: int) -> WorldChunk:
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = WorldChunk()
+            row, column = divmod(key, SPAN)
+            first = (row << CHUNK_BITS) * SPAN + (column << CHUNK_BITS)
+            rng = random.Random(self.seed << 64 | key)
+            for local in rng.sample(range(CHUNK_CELLS), self.food_per_chunk):
+                chunk.food.add(first + (local >> CHUNK_BITS) * SPAN + (local & (CHUNK_WIDTH - 1)))
+        return chunk
+
+def _local(cell: int) -> int:
+    return ((cell >> COORD_BITS) & (CHUNK_WIDTH - 1)) << CHUNK_BITS | cell & (CHUNK_WIDTH - 1)
+
+def _inside(cell: int, x_low: int, y_low: int, x_high: int, y_high: int) -> bool:
+    y, x = divmod(cell, SPAN)
+    return x_low <= x < x_high and y_low <= y < y_high
+
+class WorldGame:
+    """
+    A single-player game on an unbounded `WorldGrid`, seen through a viewport that follows the head.
+
+    There are no walls: the snake only dies by running into itself. Food lies in
+    every chunk, and eating one scores a point and grows the snake; the game is
+    won at `win_score`. `width` and `height` are the size of the viewport in
+    pixels. The chunks covering the viewport, plus a margin, are created as the
+    head reaches a new chunk, and empty chunks further away are dropped then, so
+    a tick costs the same however far the snake has travelled.
+
+    A world is not a `Game`: it has no dot, as food lives in the grid's chunks,
+    and it cannot be recorded, snapshotted or saved. It shares the controls
+    (`start`, `update`, `change_direction`, `toggle_pause`) and `snake`, `score`
+    and `state`, which is all the game windows and `FixedTimestepLoop` use.
+
+    Attributes:
+        width (int): The width of the viewport in pixels.
+        height (int): The height of the viewport in pixels.
+        cell_size (int): The size of each cell in pixels.
+        win_score (int): The score needed to win.
+        seed (Optional[int]): The seed the worlds are drawn from.
+        rng (random.Random): The random generator that seeds each new world.
+        food_per_chunk (int): The food placed in each new chunk.
+        load_radius (int): The distance in chunks around the head that is kept loaded.
+        snake (Snake): The snake.
+        score (int): The score.
+        state (GameState): The state of the game.
+        ticks (int): The number of ticks played.
+    """
+
+    __slots__ = ("width", "height", "cell_size", "win_score", "seed", "rng", "food_per_chunk", "load_radius",
+                 "snake", "score", "state", "ticks", "_head_chunk")
+
+    def __init__(self, width: int = 600, height: int = 400, cell_size: int = 20, win_score: int = 100,
+                 seed: Optional[int] = None, food_per_chunk: int = FOOD_PER_CHUNK) -> None:
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.win_score = win_score
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.food_per_chunk = food_per_chunk
+        cells = max(width, height) // cell_size
+        self.load_radius = -(-cells // (2 * CHUNK_WIDTH)) + 1
+        self.reset_game()
+
+    def reset_game(self) -> None:
+        """
+        Resets the game, with a new world and the snake at its centre, facing right.
+        """
+        grid = WorldGrid(self.cell_size, self.rng.getrandbits(64), self.food_per_chunk)
+        head = grid.from_coordinates(0, 0)
+        self.snake = Snake(self.width, self.height, self.cell_size, grid, (head, head - 1, head - 2))
+        for cell in self.snake.cells():
+            grid.take_food(cell)
+        grid.load_around(head, self.load_radius)
+        self._head_chunk = grid.chunk_of(head)
+        self.score = 0
+        self.ticks = 0
+        self.state: GameState = "PAUSED"
+
+    def start(self) -> None:
+        """
+        Starts the game in a new world.
+        """
+        self.reset_game()
+        self.state = "RUNNING"
+
+    def update(self) -> None:
+        """
+        Moves the snake, feeds it, and loads and drops chunks once the head enters a new one.
+        """
+        if self.state != "RUNNING":
+            return
+        self.ticks += 1
+        snake = self.snake
+        snake.move()
+        if snake.check_collision():
+            self.game_over()
+            return
+
+        grid = snake.grid
+        head = snake.head
+        if grid.take_food(head):
+            self.score += 1
+            snake.grow()
+            if self.score >= self.win_score:
+                self.win_game()
+        chunk = grid.chunk_of(head)
+        if chunk != self._head_chunk:
+            self._head_chunk = chunk
+            grid.load_around(head, self.load_radius)
+            grid.evict((head,), self.load_radius + EVICT_MARGIN)
+
+    def change_direction(self, direction: Direction) -> None:
+        """
+        Changes the direction of the snake, while the game is running.
+
+        Args:
+            direction (Direction): The new direction.
+        """
+        if self.state == "RUNNING":
+            self.snake.change_direction(direction)
+
+    def game_over(self) -> None:
+        """
+        Ends the game with a game over state.
+        """
+        self.state = "GAME_OVER"
+
+    def win_game(self) -> None:
+        """
+        Ends the game with a win state.
+        """
+        self.state = "WON"
+
+    def toggle_pause(self) -> None:
+        """
+        Toggles the pause state of the game.
+        """
+        if self.state == "RUNNING":
+            self.state = "PAUSED"
+        elif self.state == "PAUSED":
+            self.state = "RUNNING"
+
+    def viewport(self) -> Tuple[int, int, int, int]:
+        """
+        Returns the part of the world on screen, centred on the head.
+
+        Returns:
+            Tuple[int, int, int, int]: The x and y coordinates of the top-left cell,
+                and the width and height in cells.
+        """
+        cols, rows = self.width // self.cell_size, self.height // self.cell_size
+        x, y = self.snake.grid.to_coordinates(self.snake.head)
+        return (x - cols // 2, y - rows // 2, cols, rows)
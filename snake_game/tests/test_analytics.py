@@ -0,0 +1,113 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.analytics import ReplayStats, analyze_replays
+from src.game import Game
+from src.replay import ReplayReader, ReplayRecorder, TickChunk
+
+def chunk(heads, dots, scores, state, start=0):
+    ticks = np.arange(start, start + len(heads))
+    return TickChunk(ticks, np.array(heads), np.array(dots), np.array(scores), state)
+
+class TestReplayHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.snkr")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_history_matches_recorded_game(self):
+        history = record_games(self.path, seed=3, count=1)[0]
+
+        with ReplayReader(self.path) as reader:
+            chunks = list(reader.history(chunk_size=16))
+
+        self.assertTrue(all(len(part.ticks) == 16 for part in chunks[:-1]))
+        self.assertEqual(np.concatenate([part.ticks for part in chunks]).tolist(), list(range(len(history))))
+        self.assertEqual(np.concatenate([part.heads for part in chunks]).tolist(), [row[0] for row in history])
+        self.assertEqual(np.concatenate([part.dots for part in chunks]).tolist(), [row[1] for row in history])
+        self.assertEqual(np.concatenate([part.scores for part in chunks]).tolist(), [row[2] for row in history])
+        self.assertEqual(chunks[-1].state, "GAME_OVER")
+
+class TestReplayStats(unittest.TestCase):
+    def test_counts_visits_spawns_and_scores(self):
+        stats = ReplayStats()
+        stats.add_history([chunk([5, 6], [7, 7], [0, 0], "RUNNING"),
+                           chunk([7, 8], [1, 1], [1, 1], "WON", start=2)], cols=3, rows=3)
+
+        np.testing.assert_array_equal(stats.heatmap(), [[0, 0, 0], [0, 0, 1], [1, 1, 1]])
+        self.assertEqual(stats.dot_spawns.tolist(), [0, 1, 0, 0, 0, 0, 0, 1, 0])
+        self.assertEqual(stats.mean_scores().tolist(), [0, 0, 1, 1])
+        self.assertEqual(stats.outcomes, {"WON": 1})
+
+    def test_death_causes(self):
+        stats = ReplayStats()
+        stats.add_history([chunk([3, 4, 5], [0, 0, 0], [0, 0, 0], "RUNNING"),
+                           chunk([5], [0], [0], "GAME_OVER", start=3)], cols=3, rows=3)
+        stats.add_history([chunk([4, 5, 8, 7, 4], [0] * 5, [0] * 5, "GAME_OVER")], cols=3, rows=3)
+
+        self.assertEqual(stats.death_causes(), {"WALL": 1, "SELF": 1})
+        self.assertEqual(stats.deaths[0, 5], 1)
+        self.assertEqual(stats.deaths[1, 4], 1)
+
+    def test_merge_equals_single_pass(self):
+        parts = [chunk([1, 2, 3], [0, 0, 4], [0, 0, 1], "GAME_OVER"),
+                 chunk([4, 3, 2, 1, 0, 0], [2] * 6, [0, 0, 0, 0, 0, 0], "GAME_OVER")]
+        whole, first, second = ReplayStats(), ReplayStats(), ReplayStats()
+        for part in parts:
+            whole.add_history([part], cols=5, rows=1)
+        first.add_history([parts[0]], cols=5, rows=1)
+        second.add_history([parts[1]], cols=5, rows=1)
+
+        second.merge(first)
+
+        self.assertEqual(second.games, 2)
+        self.assertEqual(second.outcomes, whole.outcomes)
+        for name in ("visits", "dot_spawns", "deaths"):
+            np.testing.assert_array_equal(getattr(second, name), getattr(whole, name))
+        np.testing.assert_array_equal(second.mean_scores(), whole.mean_scores())
+
+    def test_rejects_mixed_boards(self):
+        stats = ReplayStats()
+        stats.add_history([chunk([0], [1], [0], "RUNNING")], cols=3, rows=3)
+
+        with self.assertRaises(ValueError):
+            stats.add_history([chunk([0], [1], [0], "RUNNING")], cols=4, rows=3)
+
+    def test_analyze_replays_across_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, f"{seed}.snkr") for seed in range(3)]
+            histories = [row for seed, path in enumerate(paths) for row in record_games(path, seed, 4)]
+
+            stats = analyze_replays(paths, workers=2, chunk_size=8)
+
+        self.assertEqual(stats.games, 12)
+        self.assertEqual(sum(stats.death_causes().values()), 12)
+        self.assertEqual(stats.visits.sum(), sum(len(history) for history in histories))
+        visits = np.bincount([row[0] for history in histories for row in history], minlength=100)
+        np.testing.assert_array_equal(stats.visits, visits)
+
+def record_games(path, seed, count):
+    rng = random.Random(seed)
+    game = Game(200, 200, 20, seed=seed)
+    histories = []
+    with ReplayRecorder(path, keyframe_interval=16) as recorder:
+        game.recorder = recorder
+        for _ in range(count):
+            game.start()
+            history = [(game.snake.head, game.dot.cell, game.score)]
+            while game.state == "RUNNING":
+                if rng.random() < 0.3:
+                    game.change_direction(rng.choice(("UP", "DOWN", "LEFT", "RIGHT")))
+                game.update()
+                history.append((game.snake.head, game.dot.cell, game.score))
+            histories.append(history)
+    return histories
+
+if __name__ == '__main__':
+    unittest.main()
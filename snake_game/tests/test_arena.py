@@ -0,0 +1,157 @@
+import random
+import unittest
+from src.arena import Arena
+
+def cell(x, y):
+    return y * 10 + x
+
+class TestArena(unittest.TestCase):
+    def setUp(self):
+        self.arena = Arena(10, 10, 1, snake_count=2, seed=1)
+        self.arena.start()
+
+    def place(self, *snakes):
+        for snake in self.arena.snakes:
+            snake.set_cells(())
+        for snake, (cells, direction) in zip(self.arena.snakes, snakes):
+            snake.set_cells(cells)
+            snake.direction = direction
+
+    def test_spawn(self):
+        arena = Arena(50, 50, 1, snake_count=100, seed=3)
+        arena.start()
+        cells = [cell for snake in arena.snakes for cell in snake.cells()]
+
+        self.assertEqual(len(cells), 300)
+        self.assertEqual(len(set(cells)), 300)
+        self.assertEqual(len(arena.snake.grid), 2500 - 300)
+
+    def test_segments_only_hold_own_cells(self):
+        first, second = self.arena.snakes
+
+        self.assertIn(first.segments[0], first.segments)
+        self.assertNotIn(second.segments[0], first.segments)
+        self.assertNotIn(first.segments[-1], second.segments)
+        self.assertTrue(first.shared_grid)
+
+    def test_head_to_head_kills_both(self):
+        self.place(([cell(4, 5), cell(3, 5), cell(2, 5)], "RIGHT"),
+                   ([cell(6, 5), cell(7, 5), cell(8, 5)], "LEFT"))
+        self.arena.update()
+
+        self.assertEqual(self.arena.alive, [False, False])
+        self.assertEqual(self.arena.state, "GAME_OVER")
+        self.assertEqual(len(self.arena.snake.grid), 100)
+
+    def test_head_into_body(self):
+        self.place(([cell(4, 5), cell(3, 5), cell(2, 5)], "RIGHT"),
+                   ([cell(5, 6), cell(5, 5), cell(5, 4)], "DOWN"))
+        self.arena.update()
+
+        self.assertEqual(self.arena.alive, [False, True])
+        self.assertEqual(self.arena.living(), [1])
+        self.assertEqual(self.arena.state, "RUNNING")
+        self.assertEqual(len(self.arena.snake.grid), 97)
+
+    def test_head_may_follow_a_tail(self):
+        self.place(([cell(4, 5), cell(3, 5), cell(2, 5)], "RIGHT"),
+                   ([cell(7, 5), cell(6, 5), cell(5, 5)], "RIGHT"))
+        self.arena.update()
+
+        self.assertEqual(self.arena.alive, [True, True])
+        self.assertEqual(self.arena.snakes[0].head, cell(5, 5))
+
+    def test_wall_kills(self):
+        self.place(([cell(9, 5), cell(8, 5), cell(7, 5)], "RIGHT"),
+                   ([cell(2, 2), cell(1, 2), cell(0, 2)], "RIGHT"))
+        self.arena.update()
+
+        self.assertEqual(self.arena.alive, [False, True])
+
+    def test_eating_grows_and_scores(self):
+        arena = Arena(10, 10, 1, snake_count=1, dot_count=3, seed=2)
+        arena.start()
+        dot = arena.dot.cell
+        y, x = divmod(dot, 10)
+        arena.snake.set_cells(())
+        if x >= 3:
+            arena.snake.set_cells([dot - 1, dot - 2, dot - 3])
+            arena.snake.direction = "RIGHT"
+        else:
+            arena.snake.set_cells([dot + 1, dot + 2, dot + 3])
+            arena.snake.direction = "LEFT"
+        arena.update()
+        arena.update()
+
+        self.assertEqual(arena.score, 1)
+        self.assertEqual(len(arena.snake), 4)
+        self.assertEqual(len({d.cell for d in arena.dots}), 3)
+
+    def test_dead_snakes_have_no_head(self):
+        self.place(([cell(9, 5), cell(8, 5), cell(7, 5)], "RIGHT"),
+                   ([cell(2, 2), cell(1, 2), cell(0, 2)], "RIGHT"))
+        self.arena.update()
+
+        with self.assertRaises(IndexError):
+            self.arena.snakes[0].head
+        with self.assertRaises(IndexError):
+            self.arena.snakes[0].snapshot().tail
+
+    def test_dot_leaves_a_full_board(self):
+        arena = Arena(3, 3, 1, snake_count=1, dot_count=1, seed=2)
+        arena.start()
+        arena.snake.set_cells([0, 1, 2, 5, 4, 3, 6, 7])
+
+        self.assertFalse(arena._place_dot(0))
+        self.assertIsNone(arena.dot.cell)
+        self.assertEqual(arena.snapshot().dots, (None,))
+
+    def test_restore_cells_passed_between_snakes(self):
+        self.place(([cell(7, 5), cell(6, 5), cell(5, 5)], "RIGHT"),
+                   ([cell(4, 5), cell(3, 5), cell(2, 5)], "RIGHT"))
+        saved = self.arena.snapshot()
+        self.arena.update()
+        self.assertEqual(self.arena.snakes[1].head, cell(5, 5))
+
+        self.arena.restore(saved)
+
+        self.assertTrue(self.arena.snake.grid.is_occupied(cell(5, 5)))
+        self.assertEqual(len(self.arena.snake.grid), 94)
+
+    def test_restore_replays_the_arena(self):
+        arena = Arena(12, 12, 1, snake_count=4, dot_count=6, seed=4)
+        arena.start()
+        saved = arena.snapshot()
+        rng = random.Random(1)
+        moves = [[rng.choice(("UP", "DOWN", "LEFT", "RIGHT")) for _ in range(4)] for _ in range(30)]
+
+        runs = []
+        for _ in range(2):
+            arena.restore(saved)
+            for directions in moves:
+                for index, direction in enumerate(directions):
+                    arena.change_direction(direction, index)
+                arena.update()
+            grid = arena.snake.grid
+            occupied = sorted(cell for cell in range(grid.size) if grid.is_occupied(cell))
+            self.assertEqual(occupied, sorted(cell for snake in arena.snakes for cell in snake.cells()))
+            runs.append(([list(snake.cells()) for snake in arena.snakes], [dot.cell for dot in arena.dots],
+                         arena.alive, arena.scores, arena.state))
+
+        self.assertEqual(runs[0], runs[1])
+        self.assertNotEqual(runs[0][2], [True] * 4)
+        arena.restore(saved)
+        self.assertEqual(arena.alive, [True] * 4)
+        self.assertEqual(len(arena.snake.grid), 144 - 12)
+
+    def test_winner(self):
+        arena = Arena(10, 10, 1, win_score=1, snake_count=1, seed=2)
+        arena.start()
+        arena.scores[0] = 0
+        arena._handle_dot_eaten(0, 0)
+
+        self.assertEqual(arena.state, "WON")
+        self.assertEqual(arena.winner, 0)
+
+if __name__ == '__main__':
+    unittest.main()
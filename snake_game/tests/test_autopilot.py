@@ -0,0 +1,72 @@
+import unittest
+from src.autopilot import Autopilot
+from src.game import Game
+from src.headless import run_episode
+
+class TestAutopilot(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(width=10, height=10, cell_size=1, win_score=100, seed=3)
+        self.game.start()
+        self.pilot = Autopilot()
+
+    def test_walks_shortest_path_to_dot(self):
+        self.game.dot.cell = 7 * 10 + 9
+        head_y, head_x = divmod(self.game.snake.head, 10)
+        distance = abs(head_y - 7) + abs(head_x - 9)
+
+        for _ in range(distance):
+            direction = self.pilot(self.game)
+            if direction:
+                self.game.change_direction(direction)
+            self.game.update()
+
+        self.assertEqual(self.game.score, 1)
+
+    def test_reuses_cached_path(self):
+        self.game.dot.cell = 9 * 10 + 9
+        for _ in range(3):
+            direction = self.pilot(self.game)
+            if direction:
+                self.game.change_direction(direction)
+            self.game.update()
+
+        self.assertEqual(self.pilot.searches, 2)
+
+    def test_replans_when_dot_moves(self):
+        self.game.dot.cell = 9 * 10 + 9
+        self.pilot(self.game)
+        searches = self.pilot.searches
+
+        self.game.dot.cell = 9 * 10
+        self.pilot(self.game)
+
+        self.assertGreater(self.pilot.searches, searches)
+        self.assertEqual(self.pilot._target, 9 * 10)
+
+    def test_does_not_trap_itself(self):
+        for seed in range(3):
+            stats = run_episode(Autopilot(), seed=seed, width=12, height=12, cell_size=1,
+                                win_score=144, max_steps=20_000)
+
+            self.assertNotEqual(stats.outcome, "GAME_OVER")
+            self.assertGreater(stats.score, 20)
+
+    def test_follows_tail_when_dot_is_unsafe(self):
+        # The dot sits in a pocket that the snake would seal itself into.
+        self.game.snake.set_cells([13, 12, 11, 21, 31, 32, 33, 34, 24, 14])
+        self.game.dot.cell = 22
+
+        self.pilot(self.game)
+
+        self.assertIsNone(self.pilot._target)
+        self.assertGreater(len(self.pilot._path), 1)
+
+    def test_searches_stay_rare(self):
+        pilot = Autopilot()
+        stats = run_episode(pilot, seed=1, width=30, height=30, cell_size=1, win_score=900,
+                            max_steps=5_000)
+
+        self.assertLess(pilot.searches, stats.steps // 5)
+
+if __name__ == '__main__':
+    unittest.main()
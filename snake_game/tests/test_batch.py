@@ -0,0 +1,84 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.batch import BatchGame, DIRECTIONS, KEEP_DIRECTION, GAME_OVER, RUNNING
+from src.game import Game
+from src.snake import STEPS
+
+class TestBatchGame(unittest.TestCase):
+    def setUp(self):
+        self.batch = BatchGame(range(4), width=100, height=100, cell_size=20)
+
+    def test_initial_state(self):
+        self.assertEqual(len(self.batch), 4)
+        self.assertTrue(np.all(self.batch.states == RUNNING))
+        self.assertEqual(self.batch.segments(0), [(40, 40), (20, 40), (0, 40)])
+        self.assertNotIn(self.batch.dot_position(0), self.batch.segments(0))
+
+    def test_reversal_is_ignored(self):
+        self.batch.step(np.full(4, DIRECTIONS.index("LEFT")))
+        self.assertEqual(self.batch.segments(0)[0], (60, 40))
+
+    def test_wall_collision(self):
+        for _ in range(3):
+            self.batch.step(np.full(4, KEEP_DIRECTION))
+        self.assertTrue(np.all(self.batch.states == GAME_OVER))
+
+    def test_narrow_boards(self):
+        for cols in (1, 2, 3):
+            with self.subTest(cols=cols):
+                batch = BatchGame(range(3), width=cols * 20, height=100, cell_size=20)
+                for seed in range(3):
+                    game = Game(cols * 20, 100, 20, seed=seed)
+                    game.start()
+                    self.assertEqual(batch.segments(seed), list(game.snake.segments))
+                    self.assertEqual(batch.dot_position(seed), game.dot.position)
+
+                batch.step(np.full(3, DIRECTIONS.index("DOWN")))
+                self.assertTrue(np.all(batch.states == RUNNING))
+
+        with self.assertRaises(ValueError):
+            BatchGame(range(1), width=10, height=100, cell_size=20)
+
+    def test_matches_independent_games(self):
+        width, height, cell_size, seeds = 160, 120, 20, range(50)
+        batch = BatchGame(seeds, width, height, cell_size, win_score=5)
+        games = [Game(width, height, cell_size, 5, seed) for seed in seeds]
+        for game in games:
+            game.start()
+        rng = random.Random(0)
+
+        for _ in range(500):
+            directions = np.array([self._safe_direction(game, rng) for game in games])
+            for game, direction in zip(games, directions):
+                if direction != KEEP_DIRECTION:
+                    game.change_direction(DIRECTIONS[direction])
+                game.update()
+            batch.step(directions)
+
+            for board, game in enumerate(games):
+                self.assertEqual(batch.state(board), game.state)
+                self.assertEqual(batch.scores[board], game.score)
+                if game.state == "RUNNING":
+                    self.assertEqual(batch.segments(board), list(game.snake.segments))
+                    self.assertEqual(batch.dot_position(board), game.dot.position)
+
+        self.assertIn("WON", [game.state for game in games])
+
+    def _safe_direction(self, game, rng):
+        if game.state != "RUNNING":
+            return KEEP_DIRECTION
+        head_x, head_y = game.snake.segments[0]
+        choices = []
+        for code, direction in enumerate(DIRECTIONS):
+            step_x, step_y = STEPS[direction]
+            position = (head_x + step_x * game.cell_size, head_y + step_y * game.cell_size)
+            if (0 <= position[0] < game.width and 0 <= position[1] < game.height
+                    and position not in game.snake.segments):
+                choices.append(code)
+        return rng.choice(choices) if choices else KEEP_DIRECTION
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from src.bitboard import BitboardGrid, BLOCK_SIZE
+from src.game import Game
+from src.snake import Snake
+
+class TestBitboardGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = BitboardGrid(width=700, height=700, cell_size=20)
+
+    def test_initial_cells(self):
+        self.assertEqual(self.grid.size, 35 * 35)
+        self.assertEqual(len(self.grid), 35 * 35)
+        self.assertTrue(self.grid.is_free(self.grid.size - 1))
+
+    def test_occupy_and_vacate(self):
+        self.grid.occupy(600)
+        self.grid.occupy(600)
+        self.assertTrue(self.grid.is_occupied(600))
+        self.assertEqual(len(self.grid), 35 * 35 - 1)
+
+        self.grid.vacate(600)
+        self.grid.vacate(600)
+        self.assertTrue(self.grid.is_free(600))
+        self.assertEqual(len(self.grid), 35 * 35)
+
+    def test_sample_only_returns_free_cells(self):
+        rng = random.Random(0)
+        for cell in range(self.grid.size):
+            if cell % 7:
+                self.grid.occupy(cell)
+        for _ in range(200):
+            cell = self.grid.sample(rng)
+            self.assertEqual(cell % 7, 0)
+            self.assertLess(cell, self.grid.size)
+
+    def test_sample_reaches_last_partial_block(self):
+        for cell in range(self.grid.size - 1):
+            self.grid.occupy(cell)
+        self.assertEqual(self.grid.sample(), self.grid.size - 1)
+        self.assertGreater(self.grid.size % BLOCK_SIZE, 0)
+
+    def test_sample_on_full_grid(self):
+        for cell in range(self.grid.size):
+            self.grid.occupy(cell)
+        self.assertEqual(len(self.grid), 0)
+        self.assertIsNone(self.grid.sample())
+
+    def test_large_board_memory(self):
+        grid = BitboardGrid(width=40000, height=40000, cell_size=20)
+        self.assertEqual(grid.size, 4_000_000)
+        self.assertLess(len(grid._bits) + grid._tree.itemsize * len(grid._tree), 1_000_000)
+
+class TestBitboardGame(unittest.TestCase):
+    def test_snake_on_bitboard(self):
+        snake = Snake(100, 100, 20, BitboardGrid(100, 100, 20))
+        tail = snake.cell_at(-1)
+        snake.move()
+
+        self.assertTrue(snake.grid.is_free(tail))
+        self.assertTrue(snake.grid.is_occupied(snake.head))
+        self.assertEqual(len(snake.grid), 25 - 3)
+
+    def test_same_moves_as_dense_backend(self):
+        dense = Game(200, 200, 20, seed=3)
+        bitboard = Game(200, 200, 20, seed=3, backend="bitboard")
+        for game in (dense, bitboard):
+            game.start()
+            game.dot.position = (0, 0)
+            for direction in ["UP", "LEFT", "LEFT", "DOWN", "DOWN", "RIGHT"]:
+                game.change_direction(direction)
+                game.update()
+
+        self.assertEqual(list(bitboard.snake.segments), list(dense.snake.segments))
+        self.assertEqual(bitboard.state, dense.state)
+
+    def test_large_board_game(self):
+        game = Game(width=40000, height=40000, cell_size=20, seed=1, backend="bitboard")
+        game.start()
+        for _ in range(100):
+            game.update()
+
+        self.assertEqual(game.state, "RUNNING")
+        self.assertNotIn(game.dot.position, game.snake.segments)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+
+from src.batch import DIRECTIONS
+from src.env import BODY, DOT, HEAD, SnakeEnv, VectorSnakeEnv
+
+UP = DIRECTIONS.index("UP")
+RIGHT = DIRECTIONS.index("RIGHT")
+
+class TestSnakeEnv(unittest.TestCase):
+    def test_grid_observation(self):
+        env = SnakeEnv(100, 100, 20, seed=1)
+        observation, info = env.reset()
+
+        self.assertEqual(observation.shape, (5, 5))
+        self.assertEqual(observation[2, 2], HEAD)
+        self.assertEqual(list(observation[2, :2]), [BODY, BODY])
+        self.assertEqual((observation == DOT).sum(), 1)
+        self.assertEqual(info["score"], 0)
+
+    def test_feature_observation(self):
+        env = SnakeEnv(100, 100, 20, observation="features", seed=1)
+        observation, _ = env.reset()
+
+        self.assertEqual(observation.shape, (12,))
+        self.assertEqual(observation.dtype, np.float32)
+        self.assertEqual(list(observation[:4]), [0, 0, 1, 0])
+        self.assertEqual(observation[8 + RIGHT], 1)
+
+    def test_losing_ends_the_episode(self):
+        env = SnakeEnv(100, 100, 20, seed=1)
+        env.reset()
+        for _ in range(2):
+            _, reward, terminated, _, _ = env.step(UP)
+            self.assertFalse(terminated)
+        _, reward, terminated, truncated, _ = env.step(UP)
+
+        self.assertTrue(terminated)
+        self.assertFalse(truncated)
+        self.assertEqual(reward, -1.0)
+
+    def test_eating_is_rewarded(self):
+        env = SnakeEnv(100, 100, 20, seed=1)
+        env.reset()
+        env.game.dot.cell = env.game.snake.head + 1
+        _, reward, _, _, info = env.step(RIGHT)
+
+        self.assertEqual(reward, 1.0)
+        self.assertEqual(info["score"], 1)
+
+    def test_truncation(self):
+        env = SnakeEnv(400, 400, 20, max_steps=2, seed=1)
+        env.reset()
+        env.step(UP)
+        _, _, terminated, truncated, _ = env.step(UP)
+
+        self.assertFalse(terminated)
+        self.assertTrue(truncated)
+
+    def test_reset_seed_is_reproducible(self):
+        env = SnakeEnv(100, 100, 20)
+        first, _ = env.reset(seed=5)
+        first = first.copy()
+        env.step(UP)
+        second, _ = env.reset(seed=5)
+        self.assertTrue((first == second).all())
+
+class TestVectorSnakeEnv(unittest.TestCase):
+    def test_matches_single_environments(self):
+        with VectorSnakeEnv(3, workers=2, width=100, height=100, cell_size=20) as vector:
+            observations, _ = vector.reset(seed=10)
+            envs = [SnakeEnv(100, 100, 20) for _ in range(3)]
+            expected = [env.reset(seed=10 + index)[0] for index, env in enumerate(envs)]
+            self.assertTrue((observations == np.stack(expected)).all())
+
+            actions = [UP, RIGHT, UP]
+            observations, rewards, terminated, _, _ = vector.step(actions)
+            for index, env in enumerate(envs):
+                observation, reward, done, _, _ = env.step(actions[index])
+                self.assertTrue((observations[index] == observation).all())
+                self.assertEqual(rewards[index], reward)
+                self.assertEqual(terminated[index], done)
+
+    def test_finished_environments_reset(self):
+        with VectorSnakeEnv(2, workers=1, width=100, height=100, cell_size=20) as vector:
+            vector.reset(seed=1)
+            for _ in range(3):
+                observations, rewards, terminated, _, info = vector.step([UP, UP])
+
+            self.assertTrue(terminated.all())
+            self.assertTrue((rewards <= 0).all())
+            self.assertTrue((observations[:, 2, 2] == HEAD).all())
+        for index in range(2):
+            env = SnakeEnv(100, 100, 20)
+            env.reset(seed=1 + index)
+            for _ in range(3):
+                _, _, _, _, single_info = env.step(UP)
+            self.assertEqual(info["final_score"][index], single_info["score"])
+
+    def test_final_score_only_for_environments_that_ended(self):
+        actions = [UP, RIGHT]
+        with VectorSnakeEnv(2, workers=2, width=200, height=100, cell_size=20) as vector:
+            vector.reset(seed=1)
+            envs = [SnakeEnv(200, 100, 20) for _ in range(2)]
+            for index, env in enumerate(envs):
+                env.reset(seed=1 + index)
+            ended = []
+            for _ in range(6):
+                _, _, terminated, truncated, info = vector.step(actions)
+                for index, env in enumerate(envs):
+                    _, _, done, _, single_info = env.step(actions[index])
+                    expected = single_info["score"] if done else -1
+                    self.assertEqual(info["final_score"][index], expected)
+                    if done:
+                        env.reset()
+                ended.append(tuple(terminated | truncated))
+
+        self.assertIn((True, False), ended)
+        self.assertIn((False, True), ended)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.frames import DOT, SNAKE, FrameExporter, FrameRasterizer
+from src.game import Game
+
+class TestFrameRasterizer(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(200, 100, 20, seed=1)
+        self.game.start()
+        self.rasterizer = FrameRasterizer(200, 100, 20)
+
+    def test_draws_snake_and_dot(self):
+        frame = self.rasterizer.render(self.game)
+        self.assertEqual(frame.shape, (100, 200, 4))
+
+        x, y = self.game.snake.segments[0]
+        self.assertEqual(tuple(frame[y, x]), (*SNAKE, 255))
+        self.assertEqual(tuple(frame[y + 18, x + 18]), (*SNAKE, 255))
+        self.assertEqual(tuple(frame[y + 19, x + 19]), (0, 0, 0, 255))
+        dot_x, dot_y = self.game.dot.position
+        self.assertEqual(tuple(frame[dot_y, dot_x]), (*DOT, 255))
+
+    def test_pixel_counts(self):
+        frame = self.rasterizer.render(self.game)
+        green = np.all(frame == (*SNAKE, 255), axis=2).sum()
+        self.assertEqual(green, len(self.game.snake) * 19 * 19)
+
+    def test_renders_into_out(self):
+        out = np.zeros((100, 200, 4), dtype=np.uint8)
+        self.assertIs(self.rasterizer.render(self.game, out), out)
+        self.assertTrue((out[..., 3] == 255).all())
+
+    def test_board_smaller_than_frame(self):
+        game = Game(210, 105, 20, seed=1)
+        game.start()
+        frame = FrameRasterizer(210, 105, 20).render(game)
+        self.assertTrue((frame[100:, :, :3] == 0).all())
+        self.assertTrue((frame[:, 200:, :3] == 0).all())
+
+class TestFrameExporter(unittest.TestCase):
+    def test_export_trims_to_frames_written(self):
+        game = Game(200, 100, 20, seed=1)
+        game.start()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frames.npy")
+            with FrameExporter(path, 200, 100, 20, max_frames=10) as exporter:
+                for _ in range(3):
+                    exporter.write(game)
+                    game.update()
+                exporter.append(np.zeros((100, 200, 4), dtype=np.uint8))
+
+            frames = np.load(path, mmap_mode="r")
+            self.assertEqual(frames.shape, (4, 100, 200, 4))
+            game = Game(200, 100, 20, seed=1)
+            game.start()
+            game.update()
+            self.assertTrue((frames[1] == FrameRasterizer(200, 100, 20).render(game)).all())
+            self.assertFalse(frames[3].any())
+            del frames
+
+    def test_full_exporter_raises(self):
+        game = Game(200, 100, 20, seed=1)
+        game.start()
+        with tempfile.TemporaryDirectory() as directory:
+            with FrameExporter(os.path.join(directory, "frames.npy"), 200, 100, 20, max_frames=1) as exporter:
+                exporter.write(game)
+                with self.assertRaises(ValueError):
+                    exporter.write(game)
+    def test_close_refuses_while_frames_are_referenced(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frames.npy")
+            exporter = FrameExporter(path, 200, 100, 20, max_frames=10)
+            frame = exporter.next_frame()
+            pixels = frame[:10]
+            frame[...] = 7
+            del frame
+            with self.assertRaises(ValueError):
+                exporter.close()
+            self.assertEqual(os.path.getsize(path), 128 + 10 * 100 * 200 * 4)
+            pixels[...] = 9
+            del pixels
+            exporter.write(Game(200, 100, 20, seed=1))
+            exporter.close()
+
+            frames = np.load(path, mmap_mode="r")
+            self.assertEqual(frames.shape, (2, 100, 200, 4))
+            self.assertTrue((frames[0, :10] == 9).all())
+            self.assertTrue((frames[0, 10:] == 7).all())
+            del frames
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+import sys
+import time
+import unittest
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QRegion
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+from src.game import Game
+from src.gui import SCORE_AREA, SnakeGameWindow, ThreadedSnakeGameWindow, WorldGameWindow
+from src.loop import FixedTimestepLoop
+from src.simulation import GameSnapshot
+from src.world import WorldGame
+
+class TestSnakeGameWindow(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.window = SnakeGameWindow()
+        self.window.timer.stop()
+        self.game = self.window.game
+
+    def tearDown(self):
+        self.window.close()
+
+    def test_window_properties(self):
+        self.assertEqual(self.window.windowTitle(), "Snake Game")
+        self.assertEqual(self.window.size().width(), self.game.width)
+        self.assertEqual(self.window.size().height(), self.game.height)
+
+    def test_dirty_region_covers_only_changed_cells(self):
+        tail = self.game.snake.segments[-1]
+        before = self.window._tracked_state()
+        self.game.update()
+        region = self.window._dirty_region(before)
+
+        head = self.game.snake.segments[0]
+        cell_size = self.game.cell_size
+        self.assertTrue(region.contains(QRect(head[0], head[1], cell_size, cell_size)))
+        self.assertTrue(region.contains(QRect(tail[0], tail[1], cell_size, cell_size)))
+        self.assertLessEqual(region.rectCount(), 4)
+        self.assertFalse(region.boundingRect().contains(self.window.rect()))
+
+    def test_dirty_region_includes_score(self):
+        head = self.game.snake.segments[0]
+        self.game.dot.position = (head[0] + self.game.cell_size, head[1])
+        before = self.window._tracked_state()
+        self.game.update()
+
+        self.assertTrue(self.window._dirty_region(before).contains(SCORE_AREA))
+
+    def test_state_change_repaints_everything(self):
+        before = self.window._tracked_state()
+        self.game.toggle_pause()
+        region = self.window._dirty_region(before)
+
+        self.assertTrue(region.boundingRect().contains(self.window.rect()))
+
+    def test_pause_repaints_window(self):
+        updates = []
+        self.window.update = lambda *region: updates.append(region)
+        QTest.keyClick(self.window, Qt.Key.Key_Space)
+
+        self.assertEqual(self.game.state, "PAUSED")
+        self.assertEqual(updates, [()])
+
+    def test_cells_in_region(self):
+        cell_size = self.game.cell_size
+        cells = self.window._cells_in(QRegion(self.window._cell_rect(5)) + QRegion(self.window._cell_rect(40)))
+        self.assertEqual(cells, {5, 40})
+        self.assertEqual(len(self.window._cells_in(QRegion(0, 0, 2 * cell_size, cell_size))), 2)
+
+    def test_render(self):
+        self.window.resize(self.game.width, self.game.height)
+        image = self.window.grab().toImage()
+        head = self.game.snake.segments[0]
+        self.assertEqual(image.pixelColor(head[0] + 1, head[1] + 1).green(), 255)
+
+    def test_render_interpolates_head(self):
+        now = [0.0]
+        self.window.loop = FixedTimestepLoop(self.game, clock=lambda: now[0])
+        now[0] = 0.15
+        self.window._update_game()
+        self.assertAlmostEqual(self.window.loop.alpha, 0.5)
+
+        self.window.resize(self.game.width, self.game.height)
+        image = self.window.grab().toImage()
+        head = self.game.snake.segments[0]
+        cell_size = self.game.cell_size
+        self.assertEqual(image.pixelColor(head[0] + 1, head[1] + 1).green(), 255)
+        self.assertNotEqual(image.pixelColor(head[0] + cell_size - 3, head[1] + 1).green(), 255)
+
+class TestThreadedSnakeGameWindow(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.window = ThreadedSnakeGameWindow(tick_rate=20.0)
+        self.window.timer.stop()
+
+    def tearDown(self):
+        self.window.close()
+
+    def test_frames_read_published_snapshots(self):
+        simulation = self.window.simulation
+        deadline = time.monotonic() + 5
+        while simulation.snapshot.ticks < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.window._update_game()
+
+        self.assertIs(self.window._snapshot, simulation.snapshot)
+        self.assertEqual(self.window._tracked_state()[2][0], simulation.snapshot.cells()[0])
+
+        image = self.window.grab().toImage()
+        x, y = self.window.game.snake.grid.to_position(self.window._snapshot.cells()[1])
+        self.assertEqual(image.pixelColor(x + 1, y + 1).green(), 255)
+
+    def test_occupancy_follows_snapshots_tick_by_tick(self):
+        self.window.simulation.stop()
+        game = Game(seed=3)
+        game.start()
+        reads = []
+        body_cells = self.window._body_cells
+        self.window._body_cells = lambda: reads.append(self.window._snapshot) or body_cells()
+
+        for tick, direction in enumerate(["DOWN"] * 8 + ["LEFT"] * 14 + ["UP"] * 12):
+            game.change_direction(direction)
+            if tick % 5 == 0:
+                game.dot.cell = game.snake.grid.neighbor(game.snake.head, game.snake.direction)
+            game.update()
+            self.window._snapshot = GameSnapshot.capture(game)
+            self.window._advance_occupied()
+
+            self.assertEqual(self.window._occupied, set(game.snake.cells()))
+        self.assertEqual(game.state, "RUNNING")
+        self.assertEqual(len(reads), 1)
+
+    def test_frames_do_not_read_the_game(self):
+        self.window.simulation.stop()
+        snapshot = self.window.simulation.snapshot
+        self.window._snapshot = snapshot
+        self.window.game = type("Board", (), {"width": self.window.game.width,
+                                              "height": self.window.game.height})()
+
+        image = self.window.grab().toImage()
+
+        x, y = snapshot.cells()[0] % snapshot.cols, snapshot.cells()[0] // snapshot.cols
+        self.assertEqual(image.pixelColor(x * snapshot.cell_size + 1, y * snapshot.cell_size + 1).green(), 255)
+        self.assertTrue(self.window._is_occupied(snapshot.snake.tail))
+
+    def test_keys_are_sent_to_simulation(self):
+        QTest.keyClick(self.window, Qt.Key.Key_Space)
+        deadline = time.monotonic() + 5
+        while self.window.simulation.snapshot.state != "PAUSED" and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.window.simulation.snapshot.state, "PAUSED")
+
+    def test_close_stops_simulation(self):
+        self.window.close()
+        self.assertFalse(self.window.simulation.is_alive())
+
+class TestWorldGameWindow(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.window = WorldGameWindow(game=WorldGame(width=200, height=100, cell_size=10, seed=4))
+        self.window.timer.stop()
+        self.game = self.window.game
+
+    def tearDown(self):
+        self.window.close()
+
+    def test_view_follows_head(self):
+        for _ in range(30):
+            self.game.update()
+        grid = self.game.snake.grid
+        ahead = grid.neighbor(self.game.snake.head, "RIGHT")
+        grid.chunks[grid.chunk_of(ahead)].food.add(ahead)
+
+        image = self.window.grab().toImage()
+
+        self.assertEqual(grid.to_coordinates(self.game.snake.head), (30, 0))
+        self.assertEqual(image.pixelColor(101, 51).green(), 255)
+        self.assertEqual(image.pixelColor(91, 51).green(), 255)
+        self.assertEqual(image.pixelColor(111, 51).red(), 255)
+
+    def test_ticks_repaint_window(self):
+        now = [0.0]
+        self.window.loop = FixedTimestepLoop(self.game, clock=lambda: now[0])
+        updates = []
+        self.window.update = lambda *region: updates.append(region)
+        now[0] = 0.15
+        self.window._update_game()
+        now[0] = 0.16
+        self.window._update_game()
+
+        self.assertEqual(updates, [()])
+
+if __name__ == '__main__':
+    unittest.main()
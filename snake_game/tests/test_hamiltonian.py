@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.hamiltonian import HamiltonianPlanner, build_cycle, load_cycle
+from src.headless import run_episode
+
+class TestBuildCycle(unittest.TestCase):
+    def assert_cycle(self, cols, rows):
+        table = build_cycle(cols, rows)
+        cycle = table[0]
+
+        self.assertEqual(sorted(cycle.tolist()), list(range(cols * rows)))
+        for cell, following in zip(cycle, np.roll(cycle, -1)):
+            y, x = divmod(int(cell), cols)
+            next_y, next_x = divmod(int(following), cols)
+            self.assertEqual(abs(y - next_y) + abs(x - next_x), 1)
+        np.testing.assert_array_equal(table[1][cycle], np.arange(cols * rows))
+
+    def test_even_rows(self):
+        self.assert_cycle(5, 4)
+
+    def test_odd_rows(self):
+        self.assert_cycle(4, 5)
+
+    def test_smallest_grid(self):
+        self.assert_cycle(2, 2)
+
+    def test_no_cycle(self):
+        for cols, rows in ((3, 3), (1, 4), (5, 1)):
+            with self.assertRaises(ValueError):
+                build_cycle(cols, rows)
+
+class TestLoadCycle(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_dir = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_caches_memmapped_table(self):
+        table = load_cycle(6, 4, self.cache_dir)
+
+        self.assertIsInstance(table, np.memmap)
+        self.assertEqual(os.listdir(self.cache_dir), ["cycle_6x4.npy"])
+        np.testing.assert_array_equal(table, build_cycle(6, 4))
+
+    def test_reuses_cached_file(self):
+        load_cycle(6, 4, self.cache_dir)
+        path = os.path.join(self.cache_dir, "cycle_6x4.npy")
+        modified = os.stat(path).st_mtime_ns
+
+        load_cycle(6, 4, self.cache_dir)
+
+        self.assertEqual(os.stat(path).st_mtime_ns, modified)
+
+    def test_rebuilds_bad_file(self):
+        path = os.path.join(self.cache_dir, "cycle_6x4.npy")
+        np.save(path, np.zeros((2, 3), dtype=np.int32))
+
+        table = load_cycle(6, 4, self.cache_dir)
+
+        np.testing.assert_array_equal(table, build_cycle(6, 4))
+
+class TestHamiltonianPlanner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fills_board(self):
+        for width, height in ((6, 6), (8, 5), (5, 8)):
+            for seed in range(3):
+                stats = run_episode(HamiltonianPlanner(self.directory.name), seed=seed, width=width,
+                                    height=height, cell_size=1, win_score=width * height)
+
+                self.assertEqual(stats.outcome, "WON")
+
+    def test_shortcuts_save_steps(self):
+        steps = {}
+        for shortcuts in (True, False):
+            stats = run_episode(HamiltonianPlanner(self.directory.name, shortcuts), seed=0, width=10,
+                                height=10, cell_size=1, win_score=100)
+            self.assertEqual(stats.outcome, "WON")
+            steps[shortcuts] = stats.steps
+
+        self.assertLess(steps[True], steps[False])
+
+    def test_planner_is_reusable(self):
+        planner = HamiltonianPlanner(self.directory.name)
+        for seed in range(2):
+            stats = run_episode(planner, seed=seed, width=6, height=6, cell_size=1, win_score=36)
+
+            self.assertEqual(stats.outcome, "WON")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from src.headless import run_episode, run_episodes, TIMEOUT
+
+class TestHeadless(unittest.TestCase):
+    def test_straight_snake_hits_wall(self):
+        stats = run_episode(seed=1, width=100, height=100, cell_size=20)
+
+        self.assertEqual(stats.outcome, "GAME_OVER")
+        self.assertEqual(stats.seed, 1)
+        self.assertGreater(stats.steps, 0)
+        self.assertGreaterEqual(stats.wall_time, 0)
+
+    def test_policy_controls_direction(self):
+        stats = run_episode(lambda game: "UP", seed=1, width=100, height=100, cell_size=20)
+
+        self.assertEqual(stats.outcome, "GAME_OVER")
+        self.assertEqual(stats.steps, 3)
+
+    def test_step_limit(self):
+        loop = iter(["DOWN", "LEFT", "UP", "RIGHT"] * 1000)
+        stats = run_episode(lambda game: next(loop), seed=1, max_steps=40)
+
+        self.assertEqual(stats.outcome, TIMEOUT)
+        self.assertEqual(stats.steps, 40)
+
+    def test_same_seed_same_result(self):
+        first = run_episode(seed=7, max_steps=500)
+        second = run_episode(seed=7, max_steps=500)
+
+        self.assertEqual(first[:4], second[:4])
+
+    def test_run_episodes(self):
+        results = list(run_episodes(None, range(3), width=100, height=100, cell_size=20))
+
+        self.assertEqual([stats.seed for stats in results], [0, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
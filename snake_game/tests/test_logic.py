@@ -1,6 +1,8 @@
+import random
 import unittest
 from src.dot import Dot
 from src.game import Game
+from src.grid import Grid
 from src.snake import Snake
 
 class TestSnake(unittest.TestCase):
@@ -29,7 +31,7 @@ class TestSnake(unittest.TestCase):
         self.assertEqual(len(self.snake.segments), initial_length + 1)
 
     def test_collision_detection(self):
-        self.snake.segments[0] = (0, 0)
+        self.snake.segments = [(0, 0), (20, 0), (40, 0)]
         self.snake.direction = "LEFT"
         self.snake.move()
 
@@ -48,6 +50,47 @@ class TestSnake(unittest.TestCase):
 
         self.assertTrue(self.snake.check_collision())
 
+    def test_segments_view_is_read_only(self):
+        with self.assertRaises(TypeError):
+            self.snake.segments[0] = (0, 0)
+
+    def test_segments_membership(self):
+        self.assertIn(self.snake.segments[-1], self.snake.segments)
+        self.snake.move()
+        self.assertIn(self.snake.segments[0], self.snake.segments)
+        self.assertNotIn((0, 0), self.snake.segments)
+
+    def test_body_buffer_grows(self):
+        snake = Snake(width=400, height=400, cell_size=20)
+        for _ in range(10):
+            snake.change_direction("DOWN" if snake.direction != "DOWN" else "LEFT")
+            snake.grow()
+            snake.move()
+
+        self.assertFalse(snake.check_collision())
+        self.assertEqual(len(snake.segments), 13)
+        self.assertEqual(len(set(snake.segments)), 13)
+        self.assertEqual(snake.segments[0], snake.grid.to_position(snake.head))
+
+    def test_segments_outside_grid_rejected(self):
+        with self.assertRaises(ValueError):
+            self.snake.segments = [(-20, 0)]
+
+    def test_move_into_vacated_tail(self):
+        self.snake.segments = [(20, 20), (40, 20), (40, 40), (20, 40)]
+        self.snake.direction = "DOWN"
+        self.snake.move()
+
+        self.assertFalse(self.snake.check_collision())
+
+    def test_move_into_tail_while_growing(self):
+        self.snake.segments = [(20, 20), (40, 20), (40, 40), (20, 40)]
+        self.snake.direction = "DOWN"
+        self.snake.grow()
+        self.snake.move()
+
+        self.assertTrue(self.snake.check_collision())
+
     def test_change_direction(self):
         self.snake.change_direction("UP")
         self.assertEqual(self.snake.direction, "UP")
@@ -82,6 +125,155 @@ class TestSnake(unittest.TestCase):
         self.snake.change_direction("LEFT")
         self.assertEqual(self.snake.direction, "RIGHT")
 
+    def test_make_and_unmake_move(self):
+        snake = Snake(width=100, height=100, cell_size=20, cells=[12, 11, 10])
+        snake.grow()
+        records = []
+        for direction in ("DOWN", "DOWN", "LEFT", "UP"):
+            records.append(snake.make_move(direction))
+        self.assertEqual(list(snake.cells()), [16, 21, 22, 17])
+
+        for record in reversed(records):
+            snake.unmake_move(record)
+
+        self.assertEqual(list(snake.cells()), [12, 11, 10])
+        self.assertEqual(snake.direction, "RIGHT")
+        self.assertTrue(snake.growing)
+        self.assertEqual([cell for cell in range(25) if snake.grid.is_occupied(cell)], [10, 11, 12])
+
+    def test_unmake_move_restores_free_cell_order(self):
+        snake = Snake(width=100, height=100, cell_size=20, cells=[12, 11, 10])
+        free = list(snake.grid._free)
+        records = [snake.make_move(direction) for direction in ("DOWN", "LEFT", "LEFT", "UP")]
+        snake.grow()
+        records.append(snake.make_move("UP"))
+
+        for record in reversed(records):
+            snake.unmake_move(record)
+
+        self.assertEqual(list(snake.grid._free), free)
+
+    def test_make_move_rejects_collisions(self):
+        snake = Snake(width=100, height=100, cell_size=20, cells=[6, 7, 12, 11, 10])
+        with self.assertRaises(ValueError):
+            snake.make_move("DOWN")
+
+        snake = Snake(width=100, height=100, cell_size=20, cells=[5, 6, 7])
+        with self.assertRaises(ValueError):
+            snake.make_move("LEFT")
+
+    def test_make_move_into_vacated_tail(self):
+        snake = Snake(width=100, height=100, cell_size=20, cells=[6, 7, 12, 11])
+        record = snake.make_move("DOWN")
+
+        self.assertEqual(list(snake.cells()), [11, 6, 7, 12])
+        snake.unmake_move(record)
+        self.assertEqual(list(snake.cells()), [6, 7, 12, 11])
+        self.assertEqual(sorted(snake.grid._free), [cell for cell in range(25) if cell not in (6, 7, 11, 12)])
+
+    def test_zobrist_follows_moves(self):
+        keys = [1 << cell for cell in range(25)]
+        snake = Snake(width=100, height=100, cell_size=20, cells=[12, 11, 10])
+        snake.track_zobrist(keys)
+
+        snake.grow()
+        snake.move()
+        snake.change_direction("DOWN")
+        snake.move()
+        record = snake.make_move("LEFT")
+
+        self.assertEqual(snake.zobrist, sum(keys[cell] for cell in snake.cells()))
+        snake.unmake_move(record)
+        self.assertEqual(snake.zobrist, sum(keys[cell] for cell in snake.cells()))
+        snake.set_cells([0, 1])
+        self.assertEqual(snake.zobrist, keys[0] | keys[1])
+
+    def occupied(self, snake):
+        return [cell for cell in range(snake.grid.size) if snake.grid.is_occupied(cell)]
+
+    def test_snapshot_and_restore(self):
+        keys = [1 << cell for cell in range(25)]
+        snake = Snake(width=100, height=100, cell_size=20, cells=[12, 11, 10])
+        snake.track_zobrist(keys)
+        snapshot = snake.snapshot()
+
+        snake.grow()
+        for direction in ("DOWN", "LEFT", "LEFT", "UP"):
+            snake.change_direction(direction)
+            snake.move()
+        snake.restore(snapshot)
+
+        self.assertEqual(list(snake.cells()), [12, 11, 10])
+        self.assertEqual(self.occupied(snake), [10, 11, 12])
+        self.assertEqual(snake.zobrist, keys[10] | keys[11] | keys[12])
+        self.assertEqual(snake.direction, "RIGHT")
+        self.assertFalse(snake.growing)
+        self.assertEqual(list(snapshot.cells()), [12, 11, 10])
+
+    def test_snapshot_shares_body(self):
+        snake = Snake(width=100, height=100, cell_size=20, cells=[12, 11, 10])
+        first = snake.snapshot()
+        snake.move()
+        second = snake.snapshot()
+
+        self.assertIs(first.chunks[0], second.chunks[0])
+        self.assertEqual(list(first.cells()), [12, 11, 10])
+        self.assertEqual(list(second.cells()), [13, 12, 11])
+
+    def test_snapshots_survive_diverging_moves(self):
+        snake = Snake(width=100, height=100, cell_size=20, cells=[12, 11, 10])
+        start = snake.snapshot()
+        snake.move()
+        later = snake.snapshot()
+
+        snake.restore(start)
+        snake.change_direction("DOWN")
+        snake.move()
+        record = snake.make_move("LEFT")
+        snake.unmake_move(record)
+
+        self.assertEqual(list(snake.cells()), [17, 12, 11])
+        self.assertEqual(list(later.cells()), [13, 12, 11])
+        snake.restore(later)
+        self.assertEqual(list(snake.cells()), [13, 12, 11])
+        self.assertEqual(self.occupied(snake), [11, 12, 13])
+        snake.restore(start)
+        self.assertEqual(self.occupied(snake), [10, 11, 12])
+
+    def test_snapshots_across_chunks(self):
+        # Circling a 4x4 square writes several chunks of the log.
+        loop = ["RIGHT"] * 3 + ["DOWN"] * 3 + ["LEFT"] * 3 + ["UP"] * 3
+        snake = Snake(width=200, height=200, cell_size=20, cells=[2, 1, 0])
+        snapshots = []
+        for step in range(700):
+            if step % 100 == 0:
+                snapshots.append((snake.snapshot(), list(snake.cells())))
+            snake.change_direction(loop[(step + 2) % 12])
+            snake.move()
+            if step % 150 == 0:
+                snake.grow()
+
+        self.assertFalse(snake.check_collision())
+        for snapshot, cells in reversed(snapshots):
+            self.assertEqual(list(snapshot.cells()), cells)
+            snake.restore(snapshot)
+            self.assertEqual(list(snake.cells()), cells)
+            self.assertEqual(self.occupied(snake), sorted(cells))
+
+    def test_long_body_spans_chunks(self):
+        cells = [row * 20 + (col if row % 2 == 0 else 19 - col) for row in range(15) for col in range(20)]
+        snake = Snake(width=400, height=400, cell_size=20, cells=cells[::-1])
+        snapshot = snake.snapshot()
+        snake.change_direction("DOWN")
+        for _ in range(5):
+            snake.move()
+
+        self.assertEqual(len(snake), 300)
+        self.assertEqual(snake.cell_at(-1), cells[5])
+        snake.restore(snapshot)
+        self.assertEqual(list(snake.cells()), cells[::-1])
+        self.assertEqual(len(snake.grid), 100)
+
 class TestDot(unittest.TestCase):
     def setUp(self):
         self.dot = Dot(width=100, height=100, cell_size=20)
@@ -113,6 +305,115 @@ class TestDot(unittest.TestCase):
 
         self.assertNotIn(new_pos, snake_positions)
 
+    def test_reposition_with_grid(self):
+        grid = Grid.excluding(100, 100, 20, [(0, 0), (20, 0), (40, 0)])
+
+        self.assertTrue(self.dot.reposition([], grid))
+        self.assertTrue(grid.is_free(self.dot.cell))
+        self.assertEqual(self.dot.position, grid.to_position(self.dot.cell))
+
+    def test_reposition_on_full_board(self):
+        dot = Dot(width=40, height=20, cell_size=20)
+        initial_pos = dot.position
+
+        self.assertFalse(dot.reposition([(0, 0), (20, 0)]))
+        self.assertEqual(dot.position, initial_pos)
+
+    def test_position_is_derived_from_cell(self):
+        self.dot.position = (60, 40)
+        self.assertEqual(self.dot.cell, 2 * 5 + 3)
+        self.assertEqual(self.dot.position, (60, 40))
+
+class TestGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(width=100, height=100, cell_size=20)
+
+    def test_initial_cells(self):
+        self.assertEqual(len(self.grid), 25)
+        self.assertEqual(self.grid.size, 25)
+        self.assertTrue(self.grid.is_free(24))
+
+    def test_position_conversion(self):
+        self.assertEqual(self.grid.to_cell((80, 40)), 14)
+        self.assertEqual(self.grid.to_position(14), (80, 40))
+        self.assertIsNone(self.grid.to_cell((100, 0)))
+        self.assertIsNone(self.grid.to_cell((-20, 0)))
+
+    def test_occupy_and_vacate(self):
+        self.grid.occupy(12)
+        self.assertTrue(self.grid.is_occupied(12))
+        self.assertEqual(len(self.grid), 24)
+
+        self.grid.vacate(12)
+        self.assertTrue(self.grid.is_free(12))
+        self.assertEqual(len(self.grid), 25)
+
+    def test_ignores_duplicates(self):
+        self.grid.vacate(0)
+        self.grid.occupy(3)
+        self.grid.occupy(3)
+        self.assertEqual(len(self.grid), 24)
+
+    def test_neighbor(self):
+        self.assertEqual(self.grid.neighbor(12, "UP"), 7)
+        self.assertEqual(self.grid.neighbor(12, "DOWN"), 17)
+        self.assertEqual(self.grid.neighbor(12, "LEFT"), 11)
+        self.assertEqual(self.grid.neighbor(12, "RIGHT"), 13)
+        self.assertIsNone(self.grid.neighbor(4, "RIGHT"))
+        self.assertIsNone(self.grid.neighbor(5, "LEFT"))
+        self.assertIsNone(self.grid.neighbor(2, "UP"))
+        self.assertIsNone(self.grid.neighbor(22, "DOWN"))
+
+    def test_sample_only_returns_free_cells(self):
+        for cell in range(20):
+            self.grid.occupy(cell)
+        for _ in range(20):
+            self.assertGreaterEqual(self.grid.sample(), 20)
+
+    def test_reorder_makes_samples_independent_of_order(self):
+        other = Grid(width=100, height=100, cell_size=20)
+        for cell in range(20):
+            self.grid.occupy(cell)
+            other.occupy(19 - cell)
+        self.assertNotEqual(list(self.grid._free), list(other._free))
+
+        for grid in (self.grid, other):
+            grid.reorder()
+            grid.occupy(22)
+            grid.vacate(5)
+        for seed in range(10):
+            self.assertEqual(self.grid.sample(random.Random(seed)), other.sample(random.Random(seed)))
+        self.assertEqual(list(self.grid._free), list(other._free))
+        self.assertTrue(all(self.grid._free_index[cell] == slot for slot, cell in enumerate(self.grid._free)))
+
+    def test_vacate_into_slot_undoes_occupy(self):
+        for cell in (3, 24):
+            free = list(self.grid._free)
+            slot = self.grid.occupy(cell)
+
+            self.grid.vacate(cell, slot)
+
+            self.assertEqual(list(self.grid._free), free)
+            self.assertEqual([self.grid._free_index[free_cell] for free_cell in free], list(range(len(free))))
+
+    def test_occupy_returns_none_when_occupied(self):
+        self.assertEqual(self.grid.occupy(5), 5)
+        self.assertIsNone(self.grid.occupy(5))
+
+    def test_sample_on_full_grid(self):
+        for cell in range(25):
+            self.grid.occupy(cell)
+        self.assertIsNone(self.grid.sample())
+
+    def test_tracks_snake_movement(self):
+        snake = Snake(width=100, height=100, cell_size=20)
+        tail = snake.cell_at(-1)
+        snake.move()
+
+        self.assertEqual(len(snake.grid), 25 - len(snake.segments))
+        self.assertTrue(snake.grid.is_free(tail))
+        self.assertTrue(snake.grid.is_occupied(snake.head))
+
 class TestGame(unittest.TestCase):
     def setUp(self):
         self.game = Game(width=100, height=100, cell_size=20)
@@ -142,17 +443,44 @@ class TestGame(unittest.TestCase):
         self.assertEqual(self.game.score, initial_score + 1)
         self.assertEqual(len(self.game.snake.segments), initial_length + 1)
 
+    def test_tiny_boards(self):
+        game = Game(width=60, height=60, cell_size=20)
+        game.start()
+        self.assertEqual(list(game.snake.cells()), [4, 3])
+        self.assertTrue(game.snake.grid.is_free(game.dot.cell))
+
+        game.update()
+        self.assertEqual((game.snake.head, game.state), (5, "RUNNING"))
+        game.update()
+        self.assertEqual(game.state, "GAME_OVER")
+
+        self.assertEqual(list(Snake(width=20, height=20, cell_size=20).cells()), [0])
+        with self.assertRaises(ValueError):
+            Snake(width=10, height=40, cell_size=20)
+
     def test_game_over(self):
         self.game.start()
 
         # Move the snake's head to the outer boundary of the game area
-        self.game.snake.segments[0] = (-20, 0)
+        self.game.snake.segments = [(0, 0), (20, 0), (40, 0)]
         self.game.snake.direction = "LEFT"
 
         self.game.update()
 
         self.assertEqual(self.game.state, "GAME_OVER")
 
+    def test_win_when_board_is_full(self):
+        game = Game(width=80, height=20, cell_size=20, win_score=100)
+        game.start()
+        game.snake.segments = [(40, 0), (20, 0), (0, 0)]
+        game.snake.grow()
+        game.dot.position = (60, 0)
+
+        game.update()
+
+        self.assertEqual(game.state, "WON")
+        self.assertEqual(game.score, 1)
+
     def test_pause_game(self):
         self.game.start()
         self.game.toggle_pause()
@@ -173,5 +501,57 @@ class TestGame(unittest.TestCase):
         self.assertEqual(self.game.state, "PAUSED")
         self.assertEqual(len(self.game.snake.segments), 3)
 
+    def test_snapshot_and_restore(self):
+        for backend in ("dense", "bitboard"):
+            game = Game(width=100, height=100, cell_size=20, seed=3, backend=backend)
+            game.start()
+            game.update()
+            saved = game.snapshot()
+            cells, dot = list(game.snake.cells()), game.dot.cell
+
+            game.dot.cell = game.snake.grid.neighbor(game.snake.head, game.snake.direction)
+            game.update()
+            self.assertEqual(game.score, 1)
+            game.restore(saved)
+
+            self.assertEqual(list(game.snake.cells()), cells)
+            self.assertEqual((game.dot.cell, game.score, game.ticks, game.state), (dot, 0, 1, "RUNNING"))
+            self.assertEqual(game.rng.getstate(), saved.rng_state)
+
+    def test_restore_replays_dots(self):
+        for backend in ("dense", "bitboard"):
+            game = Game(width=100, height=100, cell_size=20, seed=5, backend=backend)
+            game.start()
+            saved = game.snapshot()
+            runs = []
+            for _ in range(2):
+                game.restore(saved)
+                for direction in ("DOWN", "DOWN", "LEFT", "LEFT"):
+                    game.change_direction(direction)
+                    game.dot.cell = game.snake.grid.neighbor(game.snake.head, game.snake.direction)
+                    game.update()
+                runs.append((game.dot.cell, game.score))
+
+            self.assertEqual(runs[0], runs[1])
+            self.assertEqual(runs[0][1], 4)
+
+    def test_restore_after_self_collision(self):
+        game = Game(width=100, height=100, cell_size=20, seed=5)
+        game.start()
+        saved = game.snapshot()
+        for _ in range(2):
+            game.restore(saved)
+            for direction in ("DOWN", "LEFT", "UP"):
+                game.change_direction(direction)
+                game.dot.cell = game.snake.grid.neighbor(game.snake.head, game.snake.direction)
+                game.update()
+
+            self.assertEqual(game.state, "GAME_OVER")
+        game.restore(saved)
+        self.assertEqual(self.occupied_cells(game), sorted(game.snake.cells()))
+
+    def occupied_cells(self, game):
+        return [cell for cell in range(game.snake.grid.size) if game.snake.grid.is_occupied(cell)]
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import unittest
+from src.game import Game
+from src.headless import run_episode
+from src.lookahead import LookaheadAgent, TranspositionTable, zobrist_keys
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(8)
+
+    def test_store_and_probe(self):
+        self.table.store(42, 3, 0.5)
+
+        self.assertEqual(self.table.probe(42, 3), 0.5)
+        self.assertIsNone(self.table.probe(42, 2))
+        self.assertIsNone(self.table.probe(43, 3))
+        self.assertEqual((self.table.hits, self.table.misses), (1, 2))
+
+    def test_size_is_bounded(self):
+        for key in range(100):
+            self.table.store(key, 1, 0.0)
+
+        self.assertEqual(len(self.table), 8)
+        self.assertEqual(self.table.evictions, 92)
+
+    def test_keeps_deeper_entry_within_search(self):
+        self.table.store(1, 5, 1.0)
+        self.table.store(9, 2, 2.0)
+
+        self.assertEqual(self.table.probe(1, 5), 1.0)
+        self.assertIsNone(self.table.probe(9, 2))
+
+    def test_replaces_entries_of_earlier_searches(self):
+        self.table.store(1, 5, 1.0)
+        self.table.new_search()
+        self.table.store(9, 2, 2.0)
+
+        self.assertEqual(self.table.probe(9, 2), 2.0)
+        self.assertIsNone(self.table.probe(1, 5))
+
+    def test_size_must_be_power_of_two(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(100)
+
+class TestLookaheadAgent(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(width=10, height=10, cell_size=1, win_score=100, seed=2)
+        self.game.start()
+        self.agent = LookaheadAgent(depth=4)
+
+    def test_zobrist_keys_are_reproducible(self):
+        self.assertEqual(zobrist_keys(5, seed=1), zobrist_keys(5, seed=1))
+        self.assertNotEqual(zobrist_keys(5, seed=1), zobrist_keys(5, seed=2))
+
+    def test_search_leaves_snake_untouched(self):
+        snake = self.game.snake
+        self.agent(self.game)
+        cells, zobrist, free = list(snake.cells()), snake.zobrist, list(snake.grid._free)
+
+        self.agent(self.game)
+
+        self.assertEqual(list(snake.cells()), cells)
+        self.assertEqual(snake.zobrist, zobrist)
+        self.assertEqual(list(snake.grid._free), free)
+        self.assertEqual(snake.direction, "RIGHT")
+        self.assertFalse(snake.growing)
+
+    def test_eats_nearby_dot(self):
+        self.game.dot.cell = self.game.snake.head + 10
+
+        self.assertEqual(self.agent(self.game), "DOWN")
+
+    def test_avoids_wall(self):
+        self.game.snake.set_cells([9, 8, 7])
+        self.game.dot.cell = 0
+
+        self.assertEqual(self.agent(self.game), "DOWN")
+
+    def test_avoids_dead_end(self):
+        # Turning left leads to the dot, inside a pocket of two cells.
+        self.game.snake.set_cells([22, 12, 2, 1, 0, 10, 20, 30, 31, 32, 33])
+        self.game.dot.cell = 11
+
+        self.assertEqual(self.agent(self.game), "RIGHT")
+
+    def test_does_not_reverse_into_neck(self):
+        # A snake of two could follow its tail into the dot, but the game ignores reversals.
+        snake = self.game.snake
+        snake.set_cells([12, 13])
+        snake.direction = "LEFT"
+        self.game.dot.cell = 14
+
+        self.assertNotEqual(self.agent(self.game), "RIGHT")
+
+    def test_search_does_not_change_dots(self):
+        moves, dots = [], []
+        while self.game.state == "RUNNING" and len(moves) < 200:
+            moves.append(self.agent(self.game))
+            self.game.change_direction(moves[-1])
+            self.game.update()
+            dots.append(self.game.dot.cell)
+
+        replayed = Game(width=10, height=10, cell_size=1, win_score=100, seed=2)
+        replayed.start()
+        for move in moves:
+            replayed.change_direction(move)
+            replayed.update()
+            self.assertEqual(replayed.dot.cell, dots[replayed.ticks - 1])
+
+        self.assertEqual(replayed.score, self.game.score)
+        self.assertGreater(self.game.score, 5)
+
+    def test_plays_well(self):
+        stats = run_episode(LookaheadAgent(depth=4), seed=0, width=12, height=12, cell_size=1,
+                            win_score=144, max_steps=5_000)
+
+        self.assertGreater(stats.score, 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from src.game import Game
+from src.loop import FixedTimestepLoop
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestFixedTimestepLoop(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.game = Game(400, 400, 20, seed=1)
+        self.game.start()
+        self.loop = FixedTimestepLoop(self.game, tick_rate=10.0, clock=self.clock)
+
+    def test_ticks_follow_elapsed_time(self):
+        self.clock.now = 0.05
+        self.assertEqual(self.loop.advance(), 0)
+        self.assertAlmostEqual(self.loop.alpha, 0.5)
+
+        self.clock.now = 0.25
+        self.assertEqual(self.loop.advance(), 2)
+        self.assertEqual(self.game.ticks, 2)
+        self.assertAlmostEqual(self.loop.alpha, 0.5)
+
+    def test_one_queued_direction_per_tick(self):
+        self.loop.queue_direction("UP")
+        self.loop.queue_direction("LEFT")
+
+        self.clock.now = 0.1
+        self.loop.advance()
+        self.assertEqual(self.game.snake.direction, "UP")
+
+        self.clock.now = 0.2
+        self.loop.advance()
+        self.assertEqual(self.game.snake.direction, "LEFT")
+
+    def test_repeats_and_reversals_are_dropped(self):
+        self.loop.queue_direction("RIGHT")
+        self.loop.queue_direction("LEFT")
+        self.loop.queue_direction("UP")
+        self.loop.queue_direction("UP")
+        self.loop.queue_direction("DOWN")
+
+        self.assertEqual(list(self.loop._queue), ["UP"])
+
+    def test_catch_up_is_capped(self):
+        self.clock.now = 10.05
+        self.assertEqual(self.loop.advance(), self.loop.max_ticks_per_advance)
+        self.assertAlmostEqual(self.loop.alpha, 0.5)
+
+        self.clock.now = 10.06
+        self.assertEqual(self.loop.advance(), 0)
+
+    def test_paused_game_does_not_accumulate(self):
+        self.game.toggle_pause()
+        self.clock.now = 5.0
+        self.assertEqual(self.loop.advance(), 0)
+
+        self.game.toggle_pause()
+        self.clock.now = 5.05
+        self.assertEqual(self.loop.advance(), 0)
+        self.assertEqual(self.game.ticks, 0)
+
+    def test_previous_cells(self):
+        head, tail = self.game.snake.head, self.game.snake.cell_at(-1)
+        self.clock.now = 0.1
+        self.loop.advance()
+
+        self.assertEqual(self.loop.previous_cells, (head, tail))
+
+if __name__ == '__main__':
+    unittest.main()
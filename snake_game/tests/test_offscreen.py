@@ -0,0 +1,44 @@
+import sys
+import unittest
+
+from PySide6.QtWidgets import QApplication
+
+from src.frames import FrameRasterizer
+from src.game import Game
+from src.offscreen import OffscreenRenderer
+
+class TestOffscreenRenderer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.game = Game(seed=3)
+        self.game.start()
+
+    def test_frame_is_a_view_of_the_image(self):
+        renderer = OffscreenRenderer(self.game)
+        frame = renderer.render()
+        x, y = self.game.snake.segments[0]
+
+        self.assertEqual(frame.shape, (self.game.height, self.game.width, 4))
+        self.assertEqual(renderer.image.pixelColor(x, y).green(), 255)
+        frame[y, x] = (1, 2, 3, 255)
+        self.assertEqual(renderer.image.pixelColor(x, y).blue(), 3)
+
+    def test_matches_numpy_rasterizer(self):
+        renderer = OffscreenRenderer(self.game)
+        rasterizer = FrameRasterizer(self.game.width, self.game.height, self.game.cell_size)
+        for step in range(40):
+            self.game.change_direction(["UP", "LEFT", "DOWN", "RIGHT"][step // 5 % 4])
+            self.game.update()
+            self.assertTrue((renderer.render() == rasterizer.render(self.game)).all())
+
+    def test_text(self):
+        plain = OffscreenRenderer(self.game).render().copy()
+        with_text = OffscreenRenderer(self.game, text=True).render()
+        self.assertFalse((plain[:30, :160] == with_text[:30, :160]).all())
+
+if __name__ == '__main__':
+    unittest.main()
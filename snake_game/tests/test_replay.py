@@ -0,0 +1,156 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from src.game import Game
+from src.replay import ReplayReader, ReplayRecorder
+from src.snake import STEPS
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".snkr")
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_seek_matches_recorded_game(self):
+        history = self._record_game(seed=5, keyframe_interval=16)
+
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(len(reader.games), 1)
+            self.assertEqual(reader.games[0].seed, 5)
+            for tick in [0, 1, 15, 16, 17, 40, len(history) - 1]:
+                game = reader.seek(tick)
+                self.assertEqual((game.ticks, list(game.snake.segments), game.dot.position,
+                                  game.score, game.state), history[tick])
+
+    def test_seek_restores_from_nearest_keyframe(self):
+        history = self._record_game(seed=2, keyframe_interval=8)
+
+        with ReplayReader(self.path) as reader:
+            recorded = reader.games[0]
+            self.assertEqual(recorded.keyframe_ticks[:3], [0, 8, 16])
+            self.assertEqual(recorded.keyframe_ticks[-1], recorded.last_tick)
+            self.assertEqual(recorded.last_tick, len(history) - 1)
+            self.assertEqual(reader.seek(10_000).state, history[-1][4])
+
+    def test_multiple_games(self):
+        game = Game(200, 200, 20, seed=1)
+        with ReplayRecorder(self.path) as recorder:
+            game.recorder = recorder
+            for _ in range(2):
+                game.start()
+                while game.state == "RUNNING":
+                    game.update()
+
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(len(reader.games), 2)
+            self.assertEqual(reader.seek(10_000, game=1).state, "GAME_OVER")
+
+    def test_body_is_stored_compactly(self):
+        buffer = io.BytesIO()
+        game = Game(2000, 2000, 20, seed=1)
+        recorder = ReplayRecorder(buffer)
+        game.recorder = recorder
+        game.start()
+        body = [(x * 20, 1000) for x in range(60, 0, -1)]
+        game.snake.segments = body
+        length = len(buffer.getvalue()) + len(recorder._buffer)
+        recorder.record_tick(game)
+        recorder.flush()
+
+        self.assertLess(len(buffer.getvalue()) - length, 40)
+
+    def test_unfinished_game_is_readable(self):
+        game = Game(400, 400, 20, seed=3)
+        recorder = ReplayRecorder(self.path, keyframe_interval=8)
+        self.addCleanup(recorder.close)
+        game.recorder = recorder
+        game.start()
+        history = [self._state(game)]
+        for _ in range(9):
+            game.update()
+            history.append(self._state(game))
+        self.assertEqual(game.state, "RUNNING")
+
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(reader.games[0].keyframe_ticks, [0, 8])
+            game = reader.seek(8)
+            self.assertEqual(self._state(game), history[8])
+
+        buffer = io.BytesIO()
+        game = Game(400, 400, 20, seed=3)
+        game.recorder = recorder = ReplayRecorder(buffer, buffer_size=0)
+        game.start()
+        game.change_direction("DOWN")
+        game.update()
+        self.assertFalse(recorder._buffer)
+
+    def test_truncated_files_end_at_the_last_complete_record(self):
+        history = self._record_game(seed=4, keyframe_interval=8)
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with ReplayReader(self.path) as reader:
+            second_keyframe = reader.games[0].keyframe_offsets[1]
+
+        lengths = [*range(second_keyframe, second_keyframe + 40), *range(second_keyframe, len(data), 61)]
+        for length in lengths:
+            with self.subTest(length=length):
+                with open(self.path, "wb") as file:
+                    file.write(data[:length])
+                with ReplayReader(self.path) as reader:
+                    recorded = reader.games[0]
+                    self.assertLessEqual(recorded.end_offset, length)
+                    game = reader.seek(recorded.last_tick)
+                    self.assertEqual(self._state(game), history[recorded.last_tick])
+                    self.assertEqual(sum(len(chunk.ticks) for chunk in reader.history()),
+                                     recorded.last_tick + 1)
+
+        for length in (5, 7):
+            with open(self.path, "wb") as file:
+                file.write(data[:length])
+            with ReplayReader(self.path) as reader:
+                self.assertEqual(reader.games, [])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a replay")
+        with self.assertRaises(ValueError):
+            ReplayReader(self.path)
+
+    def _record_game(self, seed, keyframe_interval):
+        rng = random.Random(seed)
+        game = Game(400, 400, 20, seed=seed)
+        history = []
+        with ReplayRecorder(self.path, keyframe_interval) as recorder:
+            game.recorder = recorder
+            game.start()
+            history.append(self._state(game))
+            while game.state == "RUNNING":
+                game.change_direction(self._safe_direction(game, rng))
+                game.update()
+                history.append(self._state(game))
+        return history
+
+    def _state(self, game):
+        return (game.ticks, list(game.snake.segments), game.dot.position, game.score, game.state)
+
+    def _safe_direction(self, game, rng):
+        head_x, head_y = game.snake.segments[0]
+        choices = []
+        for direction, (step_x, step_y) in STEPS.items():
+            position = (head_x + step_x * game.cell_size, head_y + step_y * game.cell_size)
+            if (0 <= position[0] < game.width and 0 <= position[1] < game.height
+                    and position not in game.snake.segments):
+                choices.append(direction)
+        if game.snake.direction in choices and rng.random() < 0.7:
+            return game.snake.direction
+        return rng.choice(choices) if choices else game.snake.direction
+
+if __name__ == '__main__':
+    unittest.main()
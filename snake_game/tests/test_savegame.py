@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from src.game import Game
+from src.savegame import dump_game, load_game, resume_game, save_game
+
+class TestSaveGame(unittest.TestCase):
+    def play(self, game, ticks):
+        for tick in range(ticks):
+            game.change_direction(("DOWN", "LEFT", "UP", "RIGHT")[tick // 3 % 4])
+            game.update()
+
+    def assert_same_game(self, game, loaded):
+        self.assertEqual(list(loaded.snake.cells()), list(game.snake.cells()))
+        self.assertEqual((loaded.dot.cell, loaded.score, loaded.ticks, loaded.state),
+                         (game.dot.cell, game.score, game.ticks, game.state))
+        self.assertEqual((loaded.snake.direction, loaded.snake.growing),
+                         (game.snake.direction, game.snake.growing))
+        self.assertEqual((loaded.seed, loaded.backend), (game.seed, game.backend))
+        self.assertEqual(loaded.rng.getstate(), game.rng.getstate())
+
+    def test_round_trip(self):
+        for backend in ("dense", "bitboard"):
+            game = Game(width=200, height=200, cell_size=20, seed=4, backend=backend)
+            game.start()
+            self.play(game, 7)
+            game.toggle_pause()
+
+            loaded = load_game(dump_game(game))
+
+            self.assert_same_game(game, loaded)
+            self.assertEqual(len(loaded.snake.grid), len(game.snake.grid))
+
+    def test_resumed_game_places_same_dots(self):
+        for backend in ("dense", "bitboard"):
+            game = Game(width=200, height=200, cell_size=20, seed=9, backend=backend)
+            game.start()
+            self.play(game, 5)
+            loaded = load_game(dump_game(game))
+            for current in (game, loaded):
+                for _ in range(3):
+                    current.dot.cell = current.snake.grid.neighbor(current.snake.head, current.snake.direction)
+                    current.update()
+
+            self.assertEqual(loaded.score, 3)
+            self.assertEqual(loaded.dot.cell, game.dot.cell)
+
+    def test_seeds(self):
+        for seed in (None, 0, -7, 2 ** 40):
+            game = Game(width=100, height=100, cell_size=20, seed=seed)
+
+            self.assertEqual(load_game(dump_game(game)).seed, seed)
+
+    def test_rejects_other_data(self):
+        data = dump_game(Game(width=100, height=100, cell_size=20))
+
+        with self.assertRaises(ValueError):
+            load_game(b"SNKR" + data[4:])
+        with self.assertRaises(ValueError):
+            load_game(data[:4] + bytes([99]) + data[5:])
+
+    def test_save_and_resume(self):
+        game = Game(width=100, height=100, cell_size=20, seed=1)
+        game.start()
+        self.play(game, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.snks")
+            save_game(game, path)
+
+            self.assertEqual(os.listdir(directory), ["game.snks"])
+            self.assert_same_game(game, resume_game(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from src.server import DIRECTIONS, ArenaMirror, SnakeServer, read_message
+
+class TestSnakeServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = SnakeServer(tick_rate=0, restart_delay=2, width=30, height=30, cell_size=1,
+                                  snake_count=4, dot_count=20, seed=1)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        mirror = ArenaMirror()
+        mirror.apply(await read_message(reader))
+        mirror.apply(await read_message(reader))
+        return reader, writer, mirror
+
+    def assertMirrors(self, mirror):
+        arena = self.server.arena
+        self.assertEqual(mirror.tick, arena.ticks)
+        self.assertEqual(mirror.state, arena.state)
+        self.assertEqual([list(cells) for cells in mirror.snakes], [list(snake.cells()) for snake in arena.snakes])
+        self.assertEqual(mirror.alive, arena.alive)
+        self.assertEqual(mirror.scores, arena.scores)
+        self.assertEqual(mirror.dots, [dot.cell for dot in arena.dots])
+
+    async def test_welcome_and_snapshot(self):
+        reader, writer, mirror = await self.connect()
+        self.assertEqual(mirror.snake, 0)
+        self.assertEqual((mirror.cols, mirror.rows), (30, 30))
+        self.assertMirrors(mirror)
+        writer.close()
+
+    async def test_deltas_rebuild_the_arena(self):
+        reader, writer, mirror = await self.connect()
+        for step in range(60):
+            writer.write(bytes([DIRECTIONS.index(["UP", "LEFT", "DOWN", "RIGHT"][step // 3 % 4])]))
+            await writer.drain()
+            await asyncio.sleep(0)
+            self.server.tick()
+            if self.server.arena.state != "RUNNING" and mirror.state != "RUNNING":
+                break
+            mirror.apply(await read_message(reader))
+            self.assertMirrors(mirror)
+        writer.close()
+
+    async def test_tick_size_does_not_grow_with_length(self):
+        arena = self.server.arena
+        self.server.tick()
+        short = self.server.last_tick_bytes
+        for snake in arena.snakes:
+            for _ in range(10):
+                snake.grow()
+                snake.move()
+        self.server.tick()
+        self.assertLessEqual(self.server.last_tick_bytes, short + 8)
+
+    async def test_spectators_and_freed_snakes(self):
+        clients = [await self.connect() for _ in range(5)]
+        self.assertEqual([mirror.snake for _, _, mirror in clients], [0, 1, 2, 3, None])
+        clients[1][1].close()
+        for _ in range(50):
+            if self.server.client_count == 4:
+                break
+            await asyncio.sleep(0.01)
+        _, writer, mirror = await self.connect()
+        self.assertEqual(mirror.snake, 1)
+        writer.close()
+        for _, client_writer, _ in clients:
+            client_writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
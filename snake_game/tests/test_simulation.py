@@ -0,0 +1,80 @@
+import time
+import unittest
+from src.game import Game
+from src.simulation import PAUSE, RESTART, GameSnapshot, SimulationThread
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestSimulationThread(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.game = Game(400, 400, 20, seed=1)
+        self.game.start()
+        self.simulation = SimulationThread(self.game, clock=self.clock)
+
+    def test_snapshot_is_a_copy(self):
+        snapshot = GameSnapshot.capture(self.game)
+        cells = snapshot.cells()
+        for _ in range(3):
+            self.game.update()
+
+        self.assertEqual(snapshot.cells(), cells)
+        self.assertEqual((snapshot.snake.head, snapshot.snake.tail), (cells[0], cells[-1]))
+        self.assertNotEqual(GameSnapshot.capture(self.game).cells(), cells)
+
+    def test_capture_shares_the_body(self):
+        self.game.snake.set_cells(range(300, 0, -1))
+        first, second = GameSnapshot.capture(self.game), GameSnapshot.capture(self.game)
+
+        self.assertTrue(all(mine is theirs for mine, theirs in zip(first.snake.chunks, second.snake.chunks)))
+        self.assertEqual(first.cells(), list(range(300, 0, -1)))
+
+    def test_step_publishes_after_a_tick(self):
+        first = self.simulation.snapshot
+        self.assertFalse(self.simulation.step())
+        self.assertIs(self.simulation.snapshot, first)
+
+        self.clock.now = 0.1
+        self.assertTrue(self.simulation.step())
+        self.assertEqual(self.simulation.snapshot.ticks, 1)
+        self.assertEqual(first.ticks, 0)
+
+    def test_commands_are_applied_on_the_simulation(self):
+        self.simulation.send("UP")
+        self.clock.now = 0.1
+        self.simulation.step()
+        self.assertEqual(self.game.snake.direction, "UP")
+
+        self.simulation.send(PAUSE)
+        self.assertTrue(self.simulation.step())
+        self.assertEqual(self.simulation.snapshot.state, "PAUSED")
+
+    def test_restart_only_after_game_ends(self):
+        self.simulation.send(RESTART)
+        self.assertFalse(self.simulation.step())
+
+        self.game.game_over()
+        self.simulation.send(RESTART)
+        self.assertTrue(self.simulation.step())
+        self.assertEqual(self.simulation.snapshot.state, "RUNNING")
+
+    def test_thread_runs_and_stops(self):
+        game = Game(400, 400, 20, seed=1)
+        game.start()
+        simulation = SimulationThread(game, tick_rate=200.0)
+        simulation.start()
+        deadline = time.monotonic() + 5
+        while simulation.snapshot.ticks < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        simulation.stop(timeout=5)
+
+        self.assertGreaterEqual(simulation.snapshot.ticks, 3)
+        self.assertFalse(simulation.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import time
+import unittest
+
+from src.headless import OVER_BUDGET, EpisodeStats, run_episode
+from src.tournament import Leaderboard, TournamentResult, run_tournament, summarize
+
+def go_straight(game):
+    return None
+
+def go_up(game):
+    return "UP"
+
+def slow(game):
+    time.sleep(0.02)
+    return None
+
+def hang(game):
+    while True:
+        pass
+
+def hang_catching_errors(game):
+    while True:
+        try:
+            time.sleep(1)
+        except Exception:
+            pass
+
+class TestTournament(unittest.TestCase):
+    def test_every_agent_plays_every_seed(self):
+        results = list(run_tournament({"straight": go_straight, "up": go_up}, range(20),
+                                      workers=2, chunksize=4, width=100, height=100, cell_size=20))
+
+        self.assertEqual(len(results), 40)
+        for agent in ("straight", "up"):
+            seeds = sorted(result.stats.seed for result in results if result.agent == agent)
+            self.assertEqual(seeds, list(range(20)))
+
+    def test_move_budget(self):
+        stats = run_episode(slow, seed=1, move_budget=0.001)
+        self.assertEqual(stats.outcome, OVER_BUDGET)
+        self.assertEqual(stats.steps, 0)
+
+    def test_hanging_policy_is_interrupted(self):
+        start = time.perf_counter()
+        for policy in (hang, hang_catching_errors):
+            stats = run_episode(policy, seed=1, move_budget=0.05)
+
+            self.assertEqual(stats.outcome, OVER_BUDGET)
+        self.assertLess(time.perf_counter() - start, 5)
+
+    def test_move_budget_per_agent(self):
+        results = list(run_tournament({"hang": hang, "slow": slow}, range(4), workers=2, chunksize=1,
+                                      move_budget={"hang": 0.05, "slow": 1.0},
+                                      width=100, height=100, cell_size=20))
+        summary = summarize(results)
+
+        self.assertEqual(summary["hang"].outcomes, {OVER_BUDGET: 4})
+        self.assertEqual(summary["slow"].outcomes, {"GAME_OVER": 4})
+
+    def test_summary(self):
+        results = list(run_tournament({"up": go_up}, range(10), workers=2,
+                                      width=100, height=100, cell_size=20))
+        summary = summarize(results)["up"]
+
+        self.assertEqual(summary.episodes, 10)
+        self.assertEqual(summary.outcomes, {"GAME_OVER": 10})
+        self.assertEqual(summary.win_rate, 0)
+        self.assertEqual(sum(summary.scores.values()), 10)
+
+    def test_leaderboard_percentiles(self):
+        leaderboard = Leaderboard()
+        for score, outcome in [(1, "GAME_OVER"), (2, "GAME_OVER"), (20, "WON"), (20, "WON")]:
+            leaderboard.add(TournamentResult("agent", EpisodeStats(None, score, 0, outcome, 0.0)))
+        summary = leaderboard.summary()["agent"]
+
+        self.assertEqual(summary.wins, 2)
+        self.assertEqual(summary.win_rate, 0.5)
+        self.assertEqual(summary.mean_score, 10.75)
+        self.assertEqual(summary.score_percentile(0), 1)
+        self.assertEqual(summary.score_percentile(50), 2)
+        self.assertEqual(summary.score_percentile(100), 20)
+
+if __name__ == '__main__':
+    unittest.main()
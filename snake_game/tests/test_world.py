@@ -0,0 +1,122 @@
+import unittest
+
+from src.game import Game
+from src.grid import Grid
+from src.snake import Snake
+from src.world import CHUNK_WIDTH, EVICT_MARGIN, WorldGame, WorldGrid
+
+class TestWorldGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = WorldGrid(cell_size=10, seed=3)
+
+    def test_coordinates(self):
+        cell = self.grid.from_coordinates(-5, 7)
+
+        self.assertEqual(self.grid.to_coordinates(cell), (-5, 7))
+        self.assertEqual(self.grid.to_position(cell), (-50, 70))
+        self.assertEqual(self.grid.to_cell((-50, 70)), cell)
+        self.assertEqual(self.grid.neighbor(cell, "UP"), self.grid.from_coordinates(-5, 6))
+        self.assertEqual(self.grid.neighbor(cell, "LEFT"), self.grid.from_coordinates(-6, 7))
+
+    def test_chunks_are_created_lazily(self):
+        cell = self.grid.from_coordinates(1000, -1000)
+
+        self.assertFalse(self.grid.is_occupied(cell))
+        self.assertEqual(len(self.grid.chunks), 0)
+        self.grid.occupy(cell)
+        self.assertTrue(self.grid.is_occupied(cell))
+        self.assertEqual(len(self.grid.chunks), 1)
+        self.grid.vacate(cell)
+        self.assertTrue(self.grid.is_free(cell))
+
+    def test_food_is_reproducible(self):
+        origin = self.grid.from_coordinates(0, 0)
+        self.grid.load_around(origin, 1)
+        food = self.grid.visible(-CHUNK_WIDTH, -CHUNK_WIDTH, 3 * CHUNK_WIDTH, 3 * CHUNK_WIDTH)[1]
+        self.assertEqual(len(food), 9 * self.grid.food_per_chunk)
+
+        other = WorldGrid(cell_size=10, seed=3)
+        other.load_around(origin, 1)
+        self.assertEqual(sorted(other.visible(-CHUNK_WIDTH, -CHUNK_WIDTH, 3 * CHUNK_WIDTH,
+                                              3 * CHUNK_WIDTH)[1]), sorted(food))
+        self.assertTrue(self.grid.take_food(food[0]))
+        self.assertFalse(self.grid.has_food(food[0]))
+        self.assertFalse(self.grid.take_food(food[0]))
+
+    def test_evicts_only_empty_far_chunks(self):
+        near, far, body = (self.grid.from_coordinates(x, 0) for x in (0, 10 * CHUNK_WIDTH, 20 * CHUNK_WIDTH))
+        self.grid.load_around(near, 0)
+        self.grid.load_around(far, 0)
+        self.grid.occupy(body)
+
+        self.assertEqual(self.grid.evict([near], 2), 1)
+        self.assertEqual(set(self.grid.chunks), {self.grid.chunk_of(near), self.grid.chunk_of(body)})
+
+    def test_visible_cells(self):
+        snake = Snake(grid=self.grid, cells=[self.grid.from_coordinates(x, 3) for x in (2, 1, 0, -1)])
+
+        occupied = self.grid.visible(0, 0, 2, 5)[0]
+
+        self.assertEqual(sorted(occupied), sorted(self.grid.from_coordinates(x, 3) for x in (0, 1)))
+        self.assertEqual(len(snake), 4)
+
+    def test_is_not_a_grid(self):
+        self.assertNotIsInstance(self.grid, Grid)
+        self.assertFalse(hasattr(self.grid, "sample"))
+        self.assertIsNone(self.grid.neighbor(self.grid.from_coordinates(-2 ** 31, 0), "LEFT"))
+
+class TestWorldGame(unittest.TestCase):
+    def setUp(self):
+        self.game = WorldGame(width=200, height=100, cell_size=10, seed=1)
+        self.game.start()
+
+    def test_starts_at_origin(self):
+        grid = self.game.snake.grid
+
+        self.assertEqual([grid.to_coordinates(cell) for cell in self.game.snake.cells()],
+                         [(0, 0), (-1, 0), (-2, 0)])
+        self.assertEqual(self.game.viewport(), (-10, -5, 20, 10))
+
+    def test_eats_food(self):
+        grid = self.game.snake.grid
+        ahead = grid.neighbor(self.game.snake.head, "RIGHT")
+        grid.chunks[grid.chunk_of(ahead)].food.add(ahead)
+
+        self.game.update()
+
+        self.assertEqual(self.game.score, 1)
+        self.assertTrue(self.game.snake.growing)
+        self.assertFalse(grid.has_food(ahead))
+
+    def test_self_collision_ends_game(self):
+        self.game.snake.grow()
+        self.game.update()
+        self.game.snake.grow()
+        self.game.update()
+        for direction in ("DOWN", "LEFT", "UP"):
+            self.game.change_direction(direction)
+            self.game.update()
+
+        self.assertEqual(self.game.state, "GAME_OVER")
+
+    def test_memory_does_not_grow_with_distance(self):
+        grid = self.game.snake.grid
+        loaded = []
+        for distance in range(5000):
+            self.game.update()
+            self.game.snake.grid.take_food(grid.neighbor(self.game.snake.head, "RIGHT"))
+            if distance % 1000 == 999:
+                loaded.append(len(grid.chunks))
+
+        self.assertEqual(self.game.state, "RUNNING")
+        self.assertEqual(grid.to_coordinates(self.game.snake.head), (5000, 0))
+        self.assertLessEqual(max(loaded), (2 * (self.game.load_radius + EVICT_MARGIN) + 1) ** 2)
+        self.assertEqual(len(set(loaded)), 1)
+
+    def test_is_not_a_game(self):
+        self.assertNotIsInstance(self.game, Game)
+        self.assertFalse(hasattr(self.game, "dot"))
+        self.assertFalse(hasattr(self.game, "snapshot"))
+
+if __name__ == '__main__':
+    unittest.main()